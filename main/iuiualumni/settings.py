@@ -50,6 +50,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'iuiuapp.access.AccessSnapshotMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -70,6 +71,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'iuiuapp.context_processors.access',
             ],
         },
     },
@@ -96,6 +98,30 @@ DATABASES = {
 # ---------------------------
 AUTH_USER_MODEL = 'iuiuapp.User'
 
+# Logins look the user up by normalized email in one query (iuiuapp.backends)
+AUTHENTICATION_BACKENDS = ['iuiuapp.backends.EmailBackend']
+
+# The first hasher is used for new passwords; hashes made with the others,
+# or with another iteration count, are upgraded on the next login
+PASSWORD_HASHERS = [
+    'iuiuapp.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# OWASP's recommendation for PBKDF2-HMAC-SHA256, cheaper to verify than
+# Django's default on shared hosting
+PASSWORD_PBKDF2_ITERATIONS = 600000
+
+# Emails without an account are remembered this long (seconds)
+LOGIN_NEGATIVE_CACHE_TIMEOUT = 60
+
+# Failed logins are counted in this cache, shared by all Passenger workers
+# (None keeps them per process). Limits are in iuiuapp/throttling.py
+LOGIN_THROTTLE_CACHE = 'throttle'
+
 # ---------------------------
 # Password validation
 # ---------------------------
@@ -131,6 +157,34 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 
 
+# ---------------------------
+# Cache
+# ---------------------------
+# File-based so every Passenger worker sees the same leadership generation
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache'),
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+    # Login failure counters, kept apart so an attack can't cull the page caches
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache', 'throttle'),
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {
+            'MAX_ENTRIES': 20000,
+        },
+    },
+}
+
+# Leadership pages are invalidated by generation, this only expires stale entries
+LEADERSHIP_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+
 # ---------------------------
 # Default primary key field
 # ---------------------------
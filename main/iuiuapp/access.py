@@ -0,0 +1,182 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import CharField, DateField, F, IntegerField, Value
+
+
+ACCESS_GENERATION_KEY = 'access:generation'
+ACCESS_SESSION_KEY = '_access_snapshot'
+ACCESS_CACHE_TIMEOUT = getattr(settings, 'ACCESS_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+class AccessSnapshot:
+    """Roles and active committee memberships of one user, loaded together"""
+
+    def __init__(self, roles=(), memberships=()):
+        self.roles = list(roles)
+        self.memberships = list(memberships)
+        self.role_names = frozenset(role.name for role in self.roles)
+
+    def has_role(self, role_name):
+        return role_name in self.role_names
+
+    @property
+    def default_role(self):
+        for role in self.roles:
+            if role.is_default:
+                return role
+        return self.roles[0] if self.roles else None
+
+    # ---------------------------
+    # Session storage
+    # ---------------------------
+    def to_session(self, version):
+        return {
+            'version': version,
+            'roles': [[role.pk, role.name, role.is_default] for role in self.roles],
+            'memberships': [
+                [m.pk, m.committee_id, m.committee.name, m.committee.slug, m.committee.order, m.role,
+                 m.start_date.isoformat() if m.start_date else None]
+                for m in self.memberships
+            ],
+        }
+
+    @classmethod
+    def from_rows(cls, role_rows, membership_rows):
+        from .models import Committee, CommitteeMembership, Role
+
+        roles = [Role(pk=pk, name=name, is_default=is_default) for pk, name, is_default in role_rows]
+        memberships = []
+        for pk, committee_id, name, slug, order, role, start_date in membership_rows:
+            committee = Committee(pk=committee_id, name=name, slug=slug, order=order)
+            membership = CommitteeMembership(
+                pk=pk, committee=committee, role=role, start_date=start_date, is_active=True
+            )
+            memberships.append(membership)
+        return cls(roles, memberships)
+
+
+def load_access_snapshot(user):
+    """Roles and active committees of a user in a single UNION query"""
+    from .models import CommitteeMembership, Role
+
+    roles = Role.objects.filter(users=user).annotate(
+        kind=Value('role', output_field=CharField()),
+        row_id=F('id'),
+        row_name=F('name'),
+        row_flag=F('is_default'),
+        committee_slug=Value('', output_field=CharField()),
+        committee_order=Value(0, output_field=IntegerField()),
+        committee_role=Value('', output_field=CharField()),
+        row_date=Value(None, output_field=DateField()),
+        committee_pk=Value(0, output_field=IntegerField()),
+    )
+    memberships = CommitteeMembership.objects.filter(user=user, is_active=True).annotate(
+        kind=Value('committee', output_field=CharField()),
+        row_id=F('id'),
+        row_name=F('committee__name'),
+        row_flag=F('committee__is_active'),
+        committee_slug=F('committee__slug'),
+        committee_order=F('committee__order'),
+        committee_role=F('role'),
+        row_date=F('start_date'),
+        committee_pk=F('committee_id'),
+    )
+    columns = ('kind', 'row_id', 'row_name', 'row_flag', 'committee_slug',
+               'committee_order', 'committee_role', 'row_date', 'committee_pk')
+    rows = roles.order_by().values_list(*columns).union(
+        memberships.order_by().values_list(*columns), all=True
+    )
+
+    role_rows, membership_rows = [], []
+    for kind, pk, name, flag, slug, order, role, start_date, committee_id in rows:
+        if kind == 'role':
+            role_rows.append((pk, name, bool(flag)))
+        else:
+            membership_rows.append((pk, committee_id, name, slug, order, role, start_date))
+    role_rows.sort(key=lambda row: row[1])
+    membership_rows.sort(key=lambda row: (row[4], row[5]))
+    return AccessSnapshot.from_rows(role_rows, membership_rows)
+
+
+# ---------------------------
+# Invalidation
+# ---------------------------
+def new_access_version():
+    # A clock reading, not a counter: a key culled or expired from the cache
+    # comes back with a new value, so it can only invalidate snapshots and
+    # never make an older one match again
+    return time.time_ns()
+
+
+def access_version_timeout(key):
+    return None if key == ACCESS_GENERATION_KEY else ACCESS_CACHE_TIMEOUT
+
+
+def access_version(user_id):
+    """Global and per-user generation the session snapshot must match"""
+    keys = [ACCESS_GENERATION_KEY, f'{ACCESS_GENERATION_KEY}:{user_id}']
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            version = new_access_version()
+            cache.add(key, version, access_version_timeout(key))
+            # Another worker may have added its own first
+            versions[key] = cache.get(key, version)
+    return [versions[key] for key in keys]
+
+
+def bump_access_generation(user_id=None):
+    """Invalidate the stored snapshot of one user, or of everyone"""
+    key = ACCESS_GENERATION_KEY if user_id is None else f'{ACCESS_GENERATION_KEY}:{user_id}'
+    cache.set(key, new_access_version(), access_version_timeout(key))
+
+
+def get_access_snapshot(user):
+    """
+    Snapshot for a user, loaded at most once per instance. When
+    AccessSnapshotMiddleware has attached the session, it is reused across
+    requests until the user's roles or committees change.
+    """
+    snapshot = getattr(user, '_access_snapshot', None)
+    if snapshot is not None:
+        return snapshot
+
+    session = getattr(user, '_access_session', None)
+    if session is not None:
+        version = access_version(user.pk)
+        stored = session.get(ACCESS_SESSION_KEY)
+        if stored and stored.get('version') == version:
+            snapshot = AccessSnapshot.from_rows(stored['roles'], [
+                row[:6] + [DateField().to_python(row[6])] for row in stored['memberships']
+            ])
+        else:
+            snapshot = load_access_snapshot(user)
+            session[ACCESS_SESSION_KEY] = snapshot.to_session(version)
+    else:
+        snapshot = load_access_snapshot(user)
+
+    user._access_snapshot = snapshot
+    return snapshot
+
+
+def reset_access_snapshot(user):
+    """Drop the snapshot held by this instance and its session"""
+    user.__dict__.pop('_access_snapshot', None)
+    session = getattr(user, '_access_session', None)
+    if session is not None:
+        session.pop(ACCESS_SESSION_KEY, None)
+
+
+class AccessSnapshotMiddleware:
+    """Lets the current user's role/committee snapshot live in the session"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # Only requests that can be authenticated pay for loading the user
+        if settings.SESSION_COOKIE_NAME in request.COOKIES and request.user.is_authenticated:
+            request.user._access_session = request.session
+        return self.get_response(request)
@@ -1,11 +1,22 @@
 from django.contrib import admin
 from django.db import models
+from django.db.models import Count, Exists, OuterRef, Q, Subquery
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+import json
+import os
+from datetime import date
+from django.core.exceptions import PermissionDenied
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import FileResponse, Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
 from django.utils.html import format_html
 from django.utils import timezone
 from django import forms
 from django_ckeditor_5.widgets import CKEditor5Widget
 from .models import *
+from .changelists import AnnotatedChangeListMixin, ApproximateCountMixin, annotated_column, count_related
+from .exports import choice_label, streaming_export
 
 
 class UserCreationForm(forms.ModelForm):
@@ -37,6 +48,32 @@ class UserCreationForm(forms.ModelForm):
         pass
 
 
+# ---------------------------
+# Streaming exports
+# ---------------------------
+# Admins using these set export_columns = [(header, lookup[, converter]), ...]
+# and export_basename.
+@admin.action(description='Export selected as CSV', permissions=['view'])
+def export_csv(modeladmin, request, queryset):
+    return streaming_export(queryset, modeladmin.export_columns, modeladmin.export_basename)
+
+
+@admin.action(description='Export selected as Excel (XLSX)', permissions=['view'])
+def export_xlsx(modeladmin, request, queryset):
+    return streaming_export(queryset, modeladmin.export_columns, modeladmin.export_basename, file_format='xlsx')
+
+
+class MemberImportForm(forms.Form):
+    file = forms.FileField(help_text="CSV or XLSX with a header row: full_name, email, batch, and optionally student_id, course, graduation_year, phone, gender, campus, current_job, current_company")
+    dry_run = forms.BooleanField(required=False, label="Only validate, don't save")
+
+    def clean_file(self):
+        upload = self.cleaned_data['file']
+        if not upload.name.lower().endswith(('.csv', '.xlsx')):
+            raise forms.ValidationError("Upload a .csv or .xlsx file")
+        return upload
+
+
 class ProfileInline(admin.StackedInline):
     model = Profile
     can_delete = False
@@ -75,7 +112,7 @@ class AssociationLeadershipInline(admin.TabularInline):
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(AnnotatedChangeListMixin, BaseUserAdmin):
     model = User
     add_form = UserCreationForm
     
@@ -83,6 +120,10 @@ class UserAdmin(BaseUserAdmin):
     list_filter = ('is_active', 'is_staff', 'is_superuser', 'date_joined', 'roles')
     search_fields = ('member__member_id', 'email', 'full_name', 'member__student_id')
     ordering = ('-date_joined',)
+    list_select_related = ('member',)
+    list_annotations = {
+        'is_leader': Exists(AssociationLeadership.objects.filter(member_id=OuterRef('member_id'), is_active=True)),
+    }
     
     fieldsets = (
         ('Authentication', {
@@ -118,15 +159,10 @@ class UserAdmin(BaseUserAdmin):
             return []
         return super().get_inline_instances(request, obj)
     
-    def is_association_leader_display(self, obj):
-        if hasattr(obj, 'member'):
-            return obj.member.is_association_leader
-        return False
-    is_association_leader_display.short_description = 'Association Leader'
-    is_association_leader_display.boolean = True
+    is_association_leader_display = annotated_column('is_leader', 'Association Leader', boolean=True)
     
     def member_id_display(self, obj):
-        return obj.member.member_id if hasattr(obj, 'member') else 'N/A'
+        return obj.member.member_id if obj.member else 'N/A'
     member_id_display.short_description = 'Member ID'
     member_id_display.admin_order_field = 'member__member_id'
     
@@ -142,12 +178,14 @@ class UserAdmin(BaseUserAdmin):
 
 
 @admin.register(Member)
-class MemberAdmin(admin.ModelAdmin):
+class MemberAdmin(ApproximateCountMixin, AnnotatedChangeListMixin, admin.ModelAdmin):
     list_display = ('member_id', 'student_id', 'full_name', 'email', 'batch', 'course', 'is_active_member', 'has_user_account')
     list_filter = ('is_active_member', 'batch', 'graduation_year', 'joined_date')
-    search_fields = ('member_id', 'student_id', 'full_name', 'email', 'course', 'batch')
+    # Names, courses, batches and work are matched through the member search index
+    search_fields = ('=member_id', '=student_id', '=email')
     list_editable = ('is_active_member',)
     ordering = ('-created_at',)
+    list_select_related = ('user_account',)
     
     fieldsets = (
         ('Identification', {
@@ -176,6 +214,14 @@ class MemberAdmin(admin.ModelAdmin):
     
     readonly_fields = ('member_id', 'student_id', 'created_at', 'updated_at')
     
+    def get_search_results(self, request, queryset, search_term):
+        from .search import search_members
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            indexed = search_members(search_term, public_only=False).values('pk')
+            results = results | queryset.filter(pk__in=indexed)
+        return results, may_have_duplicates
+    
     def has_user_account(self, obj):
         return hasattr(obj, 'user_account')
     has_user_account.short_description = 'Has User Account'
@@ -188,28 +234,103 @@ class MemberAdmin(admin.ModelAdmin):
             return []
         return super().get_inline_instances(request, obj)
     
-    actions = ['create_user_account']
+    actions = ['create_user_account', export_csv, export_xlsx]
+    export_basename = 'members'
+    export_columns = [
+        ('Member ID', 'member_id'),
+        ('Student ID', 'student_id'),
+        ('Full Name', 'full_name'),
+        ('Email', 'email'),
+        ('Phone', 'phone'),
+        ('Course', 'course'),
+        ('Batch', 'batch'),
+        ('Graduation Year', 'graduation_year'),
+        ('Gender', 'profile__gender', choice_label(Profile.GENDER_CHOICES)),
+        ('Campus', 'profile__campus__name'),
+        ('Current Job', 'current_job'),
+        ('Current Company', 'current_company'),
+        ('Active Member', 'is_active_member'),
+        ('Member Since', 'joined_date'),
+        ('Has User Account', 'user_account', lambda user_id: user_id is not None),
+    ]
+    
+    def get_urls(self):
+        urls = [
+            path(
+                'import/',
+                self.admin_site.admin_view(self.import_view),
+                name='iuiuapp_member_import'
+            ),
+        ]
+        return urls + super().get_urls()
+    
+    def import_view(self, request):
+        from django.template.response import TemplateResponse
+        from .audit import log_event
+        from .imports import import_members
+        
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        
+        result = None
+        form = MemberImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['file']
+            result = import_members(upload, upload.name, dry_run=form.cleaned_data['dry_run'])
+            if result.created:
+                log_event('MEMBER_CREATE', user=request.user, details={
+                    'import': upload.name, 'created': result.created, 'rejected': len(result.errors),
+                }, request=request)
+            if result.dry_run:
+                self.message_user(request, f"{result.valid} of {result.rows} rows are valid (nothing saved).")
+            else:
+                self.message_user(request, f"Imported {result.created} of {result.rows} rows.")
+            if result.errors:
+                self.message_user(request, f"{len(result.errors)} rows were rejected, see the report below.", level='warning')
+        
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Import members',
+            'form': form,
+            'result': result,
+            'errors': result.errors[:500] if result else [],
+        }
+        return TemplateResponse(request, 'admin/iuiuapp/member/import.html', context)
     
     @admin.action(description='Create user account for selected members')
     def create_user_account(self, request, queryset):
-        created = 0
-        for member in queryset:
-            if not hasattr(member, 'user_account'):
-                try:
-                    member.create_user_account()
-                    created += 1
-                except Exception as e:
-                    self.message_user(request, f"Error creating account for {member.email}: {str(e)}", level='error')
-        self.message_user(request, f"Created user accounts for {created} members.")
+        from .audit import log_event
+        from .provisioning import provision_accounts
+        
+        result = provision_accounts(queryset, base_url=request.build_absolute_uri('/'))
+        for email, message in result.errors:
+            self.message_user(request, f"Error creating account for {email}: {message}", level='error')
+        self.message_user(request, f"Created user accounts for {result.created} members.")
+        if not result.created:
+            return None
+        
+        log_event('USER_CREATE', user=request.user, details={
+            'provisioned': result.created, 'skipped': len(result.errors),
+        }, request=request)
+        # The new accounts can only be used through their activation links
+        response = HttpResponse(content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="activation-links-{timezone.now():%Y%m%d-%H%M}.csv"'
+        result.write_csv(response)
+        return response
 
 
 @admin.register(Profile)
-class ProfileAdmin(admin.ModelAdmin):
+class ProfileAdmin(AnnotatedChangeListMixin, admin.ModelAdmin):
     list_display = ('member_full_name', 'member_id_display', 'gender_display', 'campus_name', 'is_public', 'is_association_leader_display')
     list_filter = ('gender', 'campus', 'is_public', 'created_at')
     search_fields = ('member__full_name', 'member__member_id', 'member__email', 'member__student_id')
     list_editable = ('is_public',)
     ordering = ('-created_at',)
+    list_select_related = ('member', 'campus')
+    list_annotations = {
+        'is_leader': Exists(AssociationLeadership.objects.filter(member_id=OuterRef('member_id'), is_active=True)),
+    }
     
     fieldsets = (
         ('Member Information', {
@@ -230,6 +351,7 @@ class ProfileAdmin(admin.ModelAdmin):
     def member_id_display(self, obj):
         return obj.member.member_id
     member_id_display.short_description = 'Member ID'
+    member_id_display.admin_order_field = 'member__member_id'
     
     def gender_display(self, obj):
         return obj.gender_display
@@ -243,11 +365,9 @@ class ProfileAdmin(admin.ModelAdmin):
     def campus_name(self, obj):
         return obj.campus.name if obj.campus else "N/A"
     campus_name.short_description = 'Campus'
+    campus_name.admin_order_field = 'campus__name'
     
-    def is_association_leader_display(self, obj):
-        return obj.is_association_leader
-    is_association_leader_display.short_description = 'Association Leader'
-    is_association_leader_display.boolean = True
+    is_association_leader_display = annotated_column('is_leader', 'Association Leader', boolean=True)
     
     def is_association_leader_field(self, obj):
         if obj.is_association_leader:
@@ -260,56 +380,108 @@ class ProfileAdmin(admin.ModelAdmin):
     
     def photo_preview(self, obj):
         if obj.photo:
-            return format_html('<img src="{}" width="100" height="100" style="object-fit: cover;" />', obj.photo.url)
+            return format_html('<img src="{}" width="100" height="100" style="object-fit: cover;" />', obj.get_photo_url('thumbnail'))
         return "No photo"
     photo_preview.short_description = 'Photo Preview'
     
-    actions = ['export_gender_stats']
+    actions = ['export_gender_stats', export_csv, export_xlsx]
+    export_basename = 'profiles'
+    export_columns = [
+        ('Member ID', 'member__member_id'),
+        ('Full Name', 'member__full_name'),
+        ('Email', 'member__email'),
+        ('Gender', 'gender', choice_label(Profile.GENDER_CHOICES)),
+        ('Campus', 'campus__name'),
+        ('Course', 'member__course'),
+        ('Batch', 'member__batch'),
+        ('Graduation Year', 'member__graduation_year'),
+        ('Public Profile', 'is_public'),
+        ('Created', 'created_at'),
+    ]
     
     def export_gender_stats(self, request, queryset):
-        from django.http import HttpResponse
-        import csv
+        from django.db.models import Count
+        from .demographics import crosstab_csv_response
         
-        gender_counts = {}
-        for profile in queryset:
-            gender_counts[profile.gender] = gender_counts.get(profile.gender, 0) + 1
-        
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="gender_statistics.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Gender', 'Count', 'Percentage'])
-        
-        total = queryset.count()
+        # One grouped query for the selection instead of walking every profile
+        counts = queryset.order_by().values('gender').annotate(count=Count('pk')).order_by('-count')
+        total = sum(row['count'] for row in counts)
         gender_map = dict(Profile.GENDER_CHOICES)
-        
-        for gender_code, count in gender_counts.items():
-            percentage = (count / total * 100) if total > 0 else 0
-            writer.writerow([
-                gender_map.get(gender_code, 'Unknown'),
-                count,
-                f"{percentage:.2f}%"
-            ])
-        
-        writer.writerow(['TOTAL', total, '100%'])
+        rows = [
+            {
+                'labels': [gender_map.get(row['gender'], 'Unknown')],
+                'count': row['count'],
+                'percentage': (row['count'] / total * 100) if total > 0 else 0,
+            }
+            for row in counts
+        ]
         
         self.message_user(request, f"Exported gender statistics for {total} profiles.")
-        return response
+        return crosstab_csv_response(rows, ['gender'], filename='gender_statistics.csv')
     
     export_gender_stats.short_description = "Export gender statistics"
+    
+    def get_urls(self):
+        urls = [
+            path(
+                'demographics/',
+                self.admin_site.admin_view(self.demographics_view),
+                name='iuiuapp_profile_demographics'
+            ),
+        ]
+        return urls + super().get_urls()
+    
+    def demographics_view(self, request):
+        """Cross-tab report over the demographic rollups, with CSV/JSON export"""
+        from django.template.response import TemplateResponse
+        from .demographics import (
+            DIMENSIONS, crosstab, crosstab_csv_response, crosstab_json_response
+        )
+        from .forms import DemographicsFilterForm
+        
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        
+        dimensions = [name for name in request.GET.getlist('dimension') if name in DIMENSIONS][:4] or ['gender']
+        # Invalid filter values are reported on the form and left out
+        form = DemographicsFilterForm(request.GET)
+        form.is_valid()
+        filters = form.filters()
+        rows = crosstab(dimensions, **filters)
+        
+        export = request.GET.get('format')
+        if export == 'csv':
+            return crosstab_csv_response(rows, dimensions)
+        if export == 'json':
+            return crosstab_json_response(rows, dimensions, filters)
+        
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Demographics',
+            'dimensions': DIMENSIONS,
+            'selected_dimensions': dimensions,
+            'selected_labels': [DIMENSIONS[name] for name in dimensions],
+            'form': form,
+            'filters': filters,
+            'rows': rows,
+            'total': sum(row['count'] for row in rows),
+        }
+        return TemplateResponse(request, 'admin/iuiuapp/profile/demographics.html', context)
 
 
 @admin.register(Role)
-class RoleAdmin(admin.ModelAdmin):
+class RoleAdmin(AnnotatedChangeListMixin, admin.ModelAdmin):
     list_display = ('name', 'is_default', 'user_count')
     list_filter = ('is_default',)
     search_fields = ('name', 'description')
     ordering = ('name',)
     actions = ['set_as_default']
+    list_annotations = {
+        'user_count': count_related(User, 'roles'),
+    }
     
-    def user_count(self, obj):
-        return obj.users.count()
-    user_count.short_description = 'Number of Users'
+    user_count = annotated_column('user_count', 'Number of Users')
     
     @admin.action(description='Set as default role')
     def set_as_default(self, request, queryset):
@@ -326,20 +498,22 @@ class RoleAdmin(admin.ModelAdmin):
 
 
 @admin.register(Campus)
-class CampusAdmin(admin.ModelAdmin):
+class CampusAdmin(AnnotatedChangeListMixin, admin.ModelAdmin):
     list_display = ('name', 'profile_count', 'is_active')
     list_filter = ('is_active',)
     search_fields = ('name', 'address')
     list_editable = ('is_active',)
     ordering = ('name',)
     
-    def profile_count(self, obj):
-        return obj.profiles.count()
-    profile_count.short_description = 'Number of Profiles'
+    list_annotations = {
+        'profile_count': count_related(Profile, 'campus'),
+    }
+    
+    profile_count = annotated_column('profile_count', 'Number of Profiles')
 
 
 @admin.register(Committee)
-class CommitteeAdmin(admin.ModelAdmin):
+class CommitteeAdmin(AnnotatedChangeListMixin, admin.ModelAdmin):
     list_display = ('name', 'slug', 'member_count', 'is_active', 'order')
     list_filter = ('is_active',)
     search_fields = ('name', 'slug', 'description')
@@ -347,48 +521,51 @@ class CommitteeAdmin(admin.ModelAdmin):
     ordering = ('order', 'name')
     prepopulated_fields = {'slug': ('name',)}
     
-    def member_count(self, obj):
-        return obj.members.filter(is_active=True).count()
-    member_count.short_description = 'Active Members'
+    list_annotations = {
+        'member_count': count_related(CommitteeMembership, 'committee', is_active=True),
+    }
+    
+    member_count = annotated_column('member_count', 'Active Members')
 
 
 @admin.register(CommitteeMembership)
-class CommitteeMembershipAdmin(admin.ModelAdmin):
+class CommitteeMembershipAdmin(AnnotatedChangeListMixin, admin.ModelAdmin):
     list_display = ('user', 'committee', 'role', 'start_date', 'end_date', 'is_active')
     list_filter = ('is_active', 'committee', 'role', 'start_date')
     search_fields = ('user__full_name', 'user__member__member_id', 'committee__name', 'role')
     list_editable = ('is_active', 'role')
     ordering = ('-start_date',)
+    list_select_related = ('user', 'committee')
     autocomplete_fields = ['user', 'committee']
 
 
 @admin.register(LeadershipPosition)
-class LeadershipPositionAdmin(admin.ModelAdmin):
+class LeadershipPositionAdmin(AnnotatedChangeListMixin, admin.ModelAdmin):
     list_display = ('display_title', 'code', 'order', 'is_active', 'current_leader', 'assignment_count')
     list_filter = ('is_active',)
     search_fields = ('code', 'description')
     list_editable = ('order', 'is_active')
     ordering = ('order', 'code')
     
-    def current_leader(self, obj):
-        assignment = obj.assignments.filter(is_active=True).first()
-        if assignment:
-            return assignment.member.full_name
-        return "Vacant"
-    current_leader.short_description = 'Current Leader'
+    list_annotations = {
+        'current_leader_name': Subquery(
+            AssociationLeadership.objects.filter(position=OuterRef('pk'), is_active=True).values('member__full_name')[:1]
+        ),
+        'assignment_count': count_related(AssociationLeadership, 'position'),
+    }
     
-    def assignment_count(self, obj):
-        return obj.assignments.count()
-    assignment_count.short_description = 'Total Assignments'
+    current_leader = annotated_column('current_leader_name', 'Current Leader', empty="Vacant")
+    assignment_count = annotated_column('assignment_count', 'Total Assignments')
 
 
 @admin.register(AssociationLeadership)
-class AssociationLeadershipAdmin(admin.ModelAdmin):
+class AssociationLeadershipAdmin(AnnotatedChangeListMixin, admin.ModelAdmin):
     list_display = ('member', 'position_display', 'start_date', 'end_date', 'is_active', 'is_current')
     list_filter = ('is_active', 'position', 'start_date')
     search_fields = ('member__full_name', 'member__member_id', 'position__code', 'notes')
     readonly_fields = ('created_at', 'updated_at')
     ordering = ('position__order', '-start_date')
+    list_select_related = ('member', 'position')
     autocomplete_fields = ['member', 'position']
     
     def position_display(self, obj):
@@ -415,13 +592,97 @@ class AssociationLeadershipAdmin(admin.ModelAdmin):
     )
 
 
+class AuditPeriodFilter(admin.SimpleListFilter):
+    """Month filter that defaults to the latest period, so the changelist reads one period's index range"""
+    title = 'period'
+    parameter_name = 'period'
+    
+    def lookups(self, request, model_admin):
+        periods = AuditLog.objects.order_by('-period').values_list('period', flat=True).distinct()
+        return [(f'{period:%Y-%m}', f'{period:%B %Y}') for period in periods] + [('all', 'All periods')]
+    
+    def value(self):
+        value = super().value()
+        if value is None:
+            # The lookups are newest first and end with 'all', so no query is needed
+            return self.lookup_choices[0][0]
+        return value
+    
+    def choices(self, changelist):
+        for lookup, title in self.lookup_choices:
+            yield {
+                'selected': self.value() == lookup,
+                'query_string': changelist.get_query_string({self.parameter_name: lookup}),
+                'display': title,
+            }
+    
+    def queryset(self, request, queryset):
+        value = self.value()
+        if value == 'all':
+            return queryset
+        try:
+            year, month = (int(part) for part in value.split('-'))
+            return queryset.filter(period=date(year, month, 1))
+        except ValueError:
+            return queryset.none()
+
+
+class ClientBrowserFilter(admin.SimpleListFilter):
+    """Browser families come from the small ClientAgent table, not a scan of the log"""
+    title = 'browser'
+    parameter_name = 'browser'
+    
+    def lookups(self, request, model_admin):
+        browsers = ClientAgent.objects.order_by('browser').values_list('browser', flat=True).distinct()
+        return [(browser, browser) for browser in browsers]
+    
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(agent__browser=self.value())
+        return queryset
+
+
+class ClientDeviceFilter(admin.SimpleListFilter):
+    title = 'device'
+    parameter_name = 'device'
+    
+    def lookups(self, request, model_admin):
+        return ClientAgent.DEVICE_CHOICES
+    
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(agent__device=self.value())
+        return queryset
+
+
 @admin.register(AuditLog)
-class AuditLogAdmin(admin.ModelAdmin):
+class AuditLogAdmin(ApproximateCountMixin, AnnotatedChangeListMixin, admin.ModelAdmin):
     list_display = ('user_display', 'member_display', 'action', 'timestamp', 'ip_address')
-    list_filter = ('action', 'timestamp')
+    list_filter = (AuditPeriodFilter, 'action', ClientBrowserFilter, ClientDeviceFilter)
     search_fields = ('user__full_name', 'user__member__member_id', 'member__full_name', 'member__member_id', 'ip_address')
-    readonly_fields = ('user_display', 'member_display', 'action', 'details', 'ip_address', 'user_agent', 'timestamp')
+    readonly_fields = ('user_display', 'member_display', 'action', 'details', 'ip_address', 'client_display', 'timestamp', 'period')
+    exclude = ('user_agent', 'agent')
     ordering = ('-timestamp',)
+    # Months past retention live in AuditLogArchive files, not this table
+    show_full_result_count = False
+    show_estimated_full_count = False
+    list_select_related = ('user__member', 'member')
+    
+    actions = [export_csv, export_xlsx]
+    export_basename = 'audit-log'
+    export_columns = [
+        ('Timestamp', 'timestamp'),
+        ('Action', 'action', choice_label(AuditLog.ACTION_CHOICES)),
+        ('User', 'user__full_name'),
+        ('User Member ID', 'user__member__member_id'),
+        ('Member', 'member__full_name'),
+        ('Member ID', 'member__member_id'),
+        ('IP Address', 'ip_address'),
+        ('Browser', 'agent__browser'),
+        ('OS', 'agent__os'),
+        ('Device', 'agent__device'),
+        ('Details', 'details', lambda details: json.dumps(details, cls=DjangoJSONEncoder) if details else ''),
+    ]
     
     def user_display(self, obj):
         if obj.user:
@@ -437,15 +698,106 @@ class AuditLogAdmin(admin.ModelAdmin):
         return "Unknown Member"
     member_display.short_description = 'Member'
     
+    def client_display(self, obj):
+        if obj.agent_id:
+            return f"{obj.agent} - {obj.agent.user_agent}"
+        return obj.user_agent
+    client_display.short_description = 'User Agent'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ClientAgent)
+class ClientAgentAdmin(AnnotatedChangeListMixin, admin.ModelAdmin):
+    list_display = ('browser', 'os', 'device', 'user_agent', 'created_at')
+    list_filter = ('device', 'browser', 'os')
+    search_fields = ('user_agent',)
+    readonly_fields = ('hash', 'user_agent', 'browser', 'os', 'device', 'created_at')
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(AuditLogArchive)
+class AuditLogArchiveAdmin(AnnotatedChangeListMixin, admin.ModelAdmin):
+    list_display = ('period_display', 'file_name', 'row_count', 'size_display', 'first_timestamp', 'last_timestamp', 'download_link')
+    readonly_fields = ('period', 'file_name', 'row_count', 'size_bytes', 'first_timestamp', 'last_timestamp', 'created_at')
+    
+    def period_display(self, obj):
+        return f"{obj.period:%B %Y}"
+    period_display.short_description = 'Period'
+    period_display.admin_order_field = 'period'
+    
+    def size_display(self, obj):
+        return f"{obj.size_bytes / 1024:.1f} KB"
+    size_display.short_description = 'Size'
+    size_display.admin_order_field = 'size_bytes'
+    
+    def download_link(self, obj):
+        url = reverse('admin:iuiuapp_auditlogarchive_download', args=[obj.pk])
+        return format_html('<a href="{}">Download</a>', url)
+    download_link.short_description = 'Archive'
+    
+    def get_urls(self):
+        urls = [
+            path(
+                '<int:pk>/download/',
+                self.admin_site.admin_view(self.download_view),
+                name='iuiuapp_auditlogarchive_download'
+            ),
+        ]
+        return urls + super().get_urls()
+    
+    def download_view(self, request, pk):
+        from .audit import AUDIT_LOG_ARCHIVE_DIR
+        archive = get_object_or_404(AuditLogArchive, pk=pk)
+        if not self.has_view_permission(request, archive):
+            raise PermissionDenied
+        file_path = os.path.join(AUDIT_LOG_ARCHIVE_DIR, archive.file_name)
+        if not os.path.exists(file_path):
+            raise Http404("Archive file is missing")
+        return FileResponse(open(file_path, 'rb'), as_attachment=True, filename=archive.file_name)
+    
     def has_add_permission(self, request):
         return False
     
     def has_change_permission(self, request, obj=None):
         return False
+    
+    def has_delete_permission(self, request, obj=None):
+        # The row is the only index of its archive file
+        return False
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(AnnotatedChangeListMixin, admin.ModelAdmin):
+    list_display = ('kind', 'object_id', 'source_name', 'status', 'attempts', 'updated_at')
+    list_filter = ('kind', 'status')
+    search_fields = ('source_name', 'last_error')
+    readonly_fields = ('kind', 'object_id', 'source_name', 'status', 'attempts', 'last_error', 'created_at', 'updated_at')
+    ordering = ('-created_at',)
+    actions = ['retry_jobs']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    @admin.action(description='Retry selected jobs')
+    def retry_jobs(self, request, queryset):
+        from .images import start_background_worker
+        updated = queryset.exclude(status='PROCESSING').update(status='PENDING', attempts=0, last_error='')
+        start_background_worker()
+        self.message_user(request, f'{updated} job(s) queued for retry.')
 
 
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
+class EventAdmin(AnnotatedChangeListMixin, admin.ModelAdmin):
     list_display = ('title', 'event_date', 'location', 'event_type', 'is_active', 'is_featured')
     list_filter = ('event_type', 'is_active', 'is_featured', 'event_date')
     search_fields = ('title', 'description', 'location')
@@ -475,11 +827,12 @@ class EventAdmin(admin.ModelAdmin):
 
 
 @admin.register(EventRegistration)
-class EventRegistrationAdmin(admin.ModelAdmin):
+class EventRegistrationAdmin(ApproximateCountMixin, AnnotatedChangeListMixin, admin.ModelAdmin):
     list_display = ('event', 'member', 'status', 'registered_at')
     list_filter = ('status', 'registered_at', 'event')
     search_fields = ('event__title', 'member__full_name', 'member__email')
     date_hierarchy = 'registered_at'
+    list_select_related = ('event', 'member')
     
     fieldsets = (
         ('Registration Details', {
@@ -492,15 +845,35 @@ class EventRegistrationAdmin(admin.ModelAdmin):
     )
     
     readonly_fields = ('registered_at', 'updated_at')
+    
+    actions = [export_csv, export_xlsx]
+    export_basename = 'event-registrations'
+    export_columns = [
+        ('Event', 'event__title'),
+        ('Event Date', 'event__event_date'),
+        ('Member ID', 'member__member_id'),
+        ('Full Name', 'member__full_name'),
+        ('Email', 'member__email'),
+        ('Phone', 'member__phone'),
+        ('Status', 'status', choice_label(EventRegistration.STATUS_CHOICES)),
+        ('Registered At', 'registered_at'),
+    ]
 
 
 @admin.register(GalleryAlbum)
-class GalleryAlbumAdmin(admin.ModelAdmin):
+class GalleryAlbumAdmin(AnnotatedChangeListMixin, admin.ModelAdmin):
     list_display = ('title', 'album_date', 'is_active', 'is_featured', 'total_images', 'total_videos')
     list_filter = ('is_active', 'is_featured', 'album_date')
     search_fields = ('title', 'description')
     prepopulated_fields = {'slug': ('title',)}
     date_hierarchy = 'album_date'
+    list_annotations = {
+        'image_count': count_related(GalleryImage, 'album'),
+        'video_count': count_related(GalleryVideo, 'album'),
+    }
+    
+    total_images = annotated_column('image_count', 'Total Images')
+    total_videos = annotated_column('video_count', 'Total Videos')
     
     fieldsets = (
         ('Basic Information', {
@@ -519,11 +892,12 @@ class GalleryAlbumAdmin(admin.ModelAdmin):
 
 
 @admin.register(GalleryImage)
-class GalleryImageAdmin(admin.ModelAdmin):
+class GalleryImageAdmin(AnnotatedChangeListMixin, admin.ModelAdmin):
     list_display = ('title', 'album', 'taken_date', 'is_featured', 'order')
     list_filter = ('album', 'is_featured', 'taken_date')
     search_fields = ('title', 'caption', 'album__title')
     date_hierarchy = 'taken_date'
+    list_select_related = ('album',)
     
     fieldsets = (
         ('Image Details', {
@@ -542,11 +916,12 @@ class GalleryImageAdmin(admin.ModelAdmin):
 
 
 @admin.register(GalleryVideo)
-class GalleryVideoAdmin(admin.ModelAdmin):
+class GalleryVideoAdmin(AnnotatedChangeListMixin, admin.ModelAdmin):
     list_display = ('title', 'album', 'captured_date', 'is_featured', 'order')
     list_filter = ('album', 'is_featured', 'captured_date')
     search_fields = ('title', 'caption', 'album__title')
     date_hierarchy = 'captured_date'
+    list_select_related = ('album',)
     
     fieldsets = (
         ('Video Details', {
@@ -565,7 +940,7 @@ class GalleryVideoAdmin(admin.ModelAdmin):
 
 
 @admin.register(JobAdvertisement)
-class JobAdvertisementAdmin(admin.ModelAdmin):
+class JobAdvertisementAdmin(AnnotatedChangeListMixin, admin.ModelAdmin):
     list_display = (
         'id',
         'company_logo_thumbnail',
@@ -664,15 +1039,17 @@ class JobAdvertisementAdmin(admin.ModelAdmin):
     
     def changelist_view(self, request, extra_context=None):
         extra_context = extra_context or {}
-        extra_context['total_jobs'] = JobAdvertisement.objects.count()
-        extra_context['active_jobs'] = JobAdvertisement.objects.filter(is_active=True).count()
-        extra_context['expired_jobs'] = JobAdvertisement.objects.filter(is_expired=True).count()
+        extra_context.update(JobAdvertisement.objects.aggregate(
+            total_jobs=Count('pk'),
+            active_jobs=Count('pk', filter=Q(is_active=True)),
+            expired_jobs=Count('pk', filter=Q(is_expired=True)),
+        ))
         return super().changelist_view(request, extra_context=extra_context)
 
 
 # Blog Category Admin
 @admin.register(BlogCategory)
-class BlogCategoryAdmin(admin.ModelAdmin):
+class BlogCategoryAdmin(AnnotatedChangeListMixin, admin.ModelAdmin):
     list_display = ('name', 'slug', 'is_active', 'post_count', 'created_at')
     list_filter = ('is_active',)
     search_fields = ('name', 'description')
@@ -680,21 +1057,24 @@ class BlogCategoryAdmin(admin.ModelAdmin):
     list_editable = ('is_active',)
     ordering = ('name',)
     
-    def post_count(self, obj):
-        from .models import BlogPost
-        return BlogPost.objects.filter(category=obj).count()
-    post_count.short_description = 'Posts'
+    list_annotations = {
+        'post_count': count_related(BlogPost, 'category'),
+    }
+    
+    post_count = annotated_column('post_count', 'Posts')
 
 
 # Simple Blog Admin with CKEditor
 @admin.register(BlogPost)
-class BlogPostAdmin(admin.ModelAdmin):
+class BlogPostAdmin(AnnotatedChangeListMixin, admin.ModelAdmin):
     list_display = ('title', 'author', 'status', 'published_date', 'views_count', 'created_at')
     list_filter = ('status', 'created_at', 'published_date')
-    search_fields = ('title', 'content', 'excerpt', 'author__full_name')
+    # Body text is matched through the blog search index instead of an icontains scan
+    search_fields = ('title', 'excerpt', 'author__full_name')
     prepopulated_fields = {'slug': ('title',)}
     date_hierarchy = 'published_date'
     ordering = ('-published_date', '-created_at')
+    list_select_related = ('author',)
     
     fieldsets = (
         ('Basic Information', {
@@ -723,6 +1103,14 @@ class BlogPostAdmin(admin.ModelAdmin):
     
     actions = ['publish_posts', 'draft_posts']
     
+    def get_search_results(self, request, queryset, search_term):
+        from .search import search_blog_posts
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            indexed = search_blog_posts(search_term, published_only=False).values('post')
+            results = results | queryset.filter(pk__in=indexed)
+        return results, may_have_duplicates
+    
     def publish_posts(self, request, queryset):
         updated = queryset.update(status='PUBLISHED', published_date=timezone.now())
         self.message_user(request, f'{updated} post(s) published.')
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class IuiuappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'iuiuapp'
+
+    def ready(self):
+        from . import signals  # noqa: F401
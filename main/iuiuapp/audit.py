@@ -0,0 +1,377 @@
+import atexit
+import glob
+import gzip
+import json
+import logging
+import os
+import secrets
+import threading
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .clients import intern_user_agent
+
+logger = logging.getLogger(__name__)
+
+AUDIT_LOG_BATCH_SIZE = getattr(settings, 'AUDIT_LOG_BATCH_SIZE', 100)
+AUDIT_LOG_FLUSH_INTERVAL = getattr(settings, 'AUDIT_LOG_FLUSH_INTERVAL', 5)
+AUDIT_LOG_SPOOL_DIR = getattr(settings, 'AUDIT_LOG_SPOOL_DIR', os.path.join(settings.BASE_DIR, 'audit_spool'))
+
+
+def pid_is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class AuditLogWriter:
+    """
+    Write-behind buffer for AuditLog rows.
+
+    Entries are kept in process memory and appended to a per-process
+    JSON-lines spool file, then written with one bulk_create when the batch
+    fills up or every flush interval. The spool file always mirrors the
+    unflushed entries, so a worker that dies before flushing leaves them on
+    disk for recover_spooled() to insert (at least once: a crash between
+    the insert and the spool truncation replays that batch).
+    """
+
+    def __init__(self, spool_dir, batch_size=100, interval=5):
+        self.spool_dir = spool_dir
+        self.batch_size = batch_size
+        self.interval = interval
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._stopped = threading.Event()
+        self._spool = None
+        self._spool_pid = None
+        self.spool_path = None
+
+    def add(self, entry):
+        with self._lock:
+            self._pending.append(entry)
+            self._write_spool([entry])
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+        else:
+            self._ensure_flusher()
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """Insert buffered entries, returns the number written"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+
+            try:
+                write_entries(batch)
+            except Exception:
+                # Keep them (and the spool) for the next flush
+                logger.exception("Writing %d audit log entries failed", len(batch))
+                with self._lock:
+                    self._pending = batch + self._pending
+                return 0
+
+            with self._lock:
+                # Entries added while the batch was being written stay spooled
+                self._rewrite_spool(self._pending)
+            return len(batch)
+
+    def _open_spool(self):
+        # A forked worker must not share its parent's spool file
+        if self._spool is None or self._spool_pid != os.getpid():
+            os.makedirs(self.spool_dir, exist_ok=True)
+            # The token keeps a worker that gets a dead worker's pid off
+            # that worker's spool, which is left for recover_spooled()
+            self.spool_path = os.path.join(self.spool_dir, f'audit-{os.getpid()}-{secrets.token_hex(4)}.jsonl')
+            self._spool = open(self.spool_path, 'x', encoding='utf-8')
+            self._spool_pid = os.getpid()
+        return self._spool
+
+    def _write_spool(self, entries):
+        try:
+            spool = self._open_spool()
+            for entry in entries:
+                spool.write(json.dumps(entry, cls=DjangoJSONEncoder) + '\n')
+            spool.flush()
+        except OSError:
+            logger.exception("Could not spool audit log entries to %s", self.spool_dir)
+
+    def _rewrite_spool(self, entries):
+        try:
+            spool = self._open_spool()
+            spool.seek(0)
+            spool.truncate()
+        except OSError:
+            logger.exception("Could not truncate audit log spool %s", self.spool_path)
+            return
+        if entries:
+            self._write_spool(entries)
+
+    def _ensure_flusher(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        # Pick up entries spooled by workers that died since the last start
+        try:
+            recover_spooled(self.spool_dir)
+        except Exception:
+            logger.exception("Recovering spooled audit log entries failed")
+        while not self._stopped.wait(self.interval):
+            self.flush()
+            connection.close()
+
+
+def build_entry(action, user=None, member=None, details=None, request=None):
+    entry = {
+        'action': action,
+        'user_id': getattr(user, 'pk', None),
+        'member_id': getattr(member, 'pk', None),
+        'details': details or {},
+        'ip_address': None,
+        'user_agent': '',
+        'timestamp': timezone.now(),
+    }
+    if request is not None:
+        entry['ip_address'] = request.META.get('REMOTE_ADDR')
+        entry['user_agent'] = request.META.get('HTTP_USER_AGENT', '')
+    return entry
+
+
+def entry_to_log(entry):
+    from .models import AuditLog
+
+    timestamp = entry['timestamp']
+    if isinstance(timestamp, str):
+        timestamp = parse_datetime(timestamp)
+    # bulk_create skips save(), so the period is set here
+    return AuditLog(
+        user_id=entry.get('user_id'),
+        member_id=entry.get('member_id'),
+        action=entry['action'],
+        details=entry.get('details') or {},
+        ip_address=entry.get('ip_address'),
+        agent_id=intern_user_agent(entry.get('user_agent') or ''),
+        timestamp=timestamp,
+        period=AuditLog.period_for(timestamp),
+    )
+
+
+def write_entries(entries):
+    from .models import AuditLog, Member, User
+
+    logs = [entry_to_log(entry) for entry in entries]
+    try:
+        with transaction.atomic():
+            AuditLog.objects.bulk_create(logs, batch_size=500)
+    except IntegrityError:
+        # A user or member was deleted between logging and flushing; keep
+        # the entries and drop only the dangling references
+        users = set(User.objects.filter(pk__in={log.user_id for log in logs}).values_list('pk', flat=True))
+        members = set(Member.objects.filter(pk__in={log.member_id for log in logs}).values_list('pk', flat=True))
+        # A cached agent id can outlive a rolled back transaction
+        intern_user_agent.cache_clear()
+        for log, entry in zip(logs, entries):
+            log.pk = None
+            log.user_id = log.user_id if log.user_id in users else None
+            log.member_id = log.member_id if log.member_id in members else None
+            log.agent_id = intern_user_agent(entry.get('user_agent') or '')
+        with transaction.atomic():
+            AuditLog.objects.bulk_create(logs, batch_size=500)
+    return len(logs)
+
+
+def recover_spooled(spool_dir=None):
+    """
+    Insert entries left in spool files by workers that are no longer
+    running. Files are claimed by renaming, so concurrent recoveries
+    never insert the same file twice.
+    """
+    spool_dir = spool_dir or AUDIT_LOG_SPOOL_DIR
+    recovered = 0
+    for path in glob.glob(os.path.join(spool_dir, 'audit-*.jsonl')):
+        try:
+            # audit-<pid>-<token>.jsonl
+            pid = int(os.path.basename(path)[len('audit-'):-len('.jsonl')].split('-')[0])
+        except ValueError:
+            continue
+        if pid == os.getpid():
+            # Our own spool, or one left by a dead worker with the same pid
+            if path == audit_log_writer.spool_path:
+                continue
+        elif pid_is_alive(pid):
+            continue
+
+        claimed = f'{path}.{os.getpid()}.recovering'
+        try:
+            os.rename(path, claimed)
+        except OSError:
+            continue
+
+        entries = []
+        with open(claimed, encoding='utf-8') as spool:
+            for line in spool:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # A torn last line from a killed worker
+                    logger.warning("Skipping unreadable audit spool line in %s", path)
+        try:
+            recovered += write_entries(entries) if entries else 0
+        except Exception:
+            logger.exception("Recovering audit log spool %s failed", path)
+            os.rename(claimed, path)
+            continue
+        os.remove(claimed)
+    return recovered
+
+
+audit_log_writer = AuditLogWriter(
+    AUDIT_LOG_SPOOL_DIR,
+    batch_size=AUDIT_LOG_BATCH_SIZE,
+    interval=AUDIT_LOG_FLUSH_INTERVAL,
+)
+
+# Flush whatever is left when the worker exits cleanly
+atexit.register(audit_log_writer.flush)
+
+
+def log_event(action, user=None, member=None, details=None, request=None):
+    """
+    Queue an audit log entry. Inside a transaction the entry is only queued
+    once it commits, so rolled back actions are not logged.
+    """
+    entry = build_entry(action, user=user, member=member, details=details, request=request)
+    transaction.on_commit(lambda: audit_log_writer.add(entry))
+
+
+# ---------------------------
+# Retention and archival
+# ---------------------------
+AUDIT_LOG_HOT_MONTHS = getattr(settings, 'AUDIT_LOG_HOT_MONTHS', 3)
+AUDIT_LOG_ARCHIVE_DIR = getattr(settings, 'AUDIT_LOG_ARCHIVE_DIR', os.path.join(settings.BASE_DIR, 'audit_archive'))
+
+
+def retention_cutoff(hot_months=None):
+    """First period that stays in the hot table"""
+    hot_months = AUDIT_LOG_HOT_MONTHS if hot_months is None else hot_months
+    today = timezone.now().date()
+    month_index = today.year * 12 + today.month - 1 - max(hot_months - 1, 0)
+    return today.replace(year=month_index // 12, month=month_index % 12 + 1, day=1)
+
+
+def log_to_record(log):
+    return {
+        'id': log.pk,
+        'user_id': log.user_id,
+        'member_id': log.member_id,
+        'action': log.action,
+        'details': log.details,
+        'ip_address': log.ip_address,
+        'user_agent': log.user_agent_string,
+        'timestamp': log.timestamp,
+    }
+
+
+def archive_period(period, archive_dir=None, chunk_size=2000):
+    """
+    Move one period out of AuditLog into a gzipped JSON-lines file.
+
+    The file is fully written and renamed into place before any row is
+    deleted, and only the rows that were written are deleted, so entries
+    flushed late into an already archived period end up in a later part.
+    """
+    from .models import AuditLog, AuditLogArchive
+
+    archive_dir = archive_dir or AUDIT_LOG_ARCHIVE_DIR
+    os.makedirs(archive_dir, exist_ok=True)
+
+    part = AuditLogArchive.objects.filter(period=period).count() + 1
+    file_name = f'audit-{period:%Y-%m}.jsonl.gz' if part == 1 else f'audit-{period:%Y-%m}.part{part}.jsonl.gz'
+    path = os.path.join(archive_dir, file_name)
+    partial = path + '.partial'
+
+    archived_ids = []
+    first = last = None
+    rows = AuditLog.objects.filter(period=period).select_related('agent').order_by('timestamp', 'pk')
+    with gzip.open(partial, 'wt', encoding='utf-8') as archive:
+        for log in rows.iterator(chunk_size=chunk_size):
+            archive.write(json.dumps(log_to_record(log), cls=DjangoJSONEncoder) + '\n')
+            archived_ids.append(log.pk)
+            first = first or log.timestamp
+            last = log.timestamp
+
+    if not archived_ids:
+        os.remove(partial)
+        return None
+    os.replace(partial, path)
+
+    with transaction.atomic():
+        archive = AuditLogArchive.objects.create(
+            period=period,
+            file_name=file_name,
+            row_count=len(archived_ids),
+            size_bytes=os.path.getsize(path),
+            first_timestamp=first,
+            last_timestamp=last,
+        )
+        for start in range(0, len(archived_ids), chunk_size):
+            AuditLog.objects.filter(pk__in=archived_ids[start:start + chunk_size]).delete()
+    return archive
+
+
+def archive_expired(hot_months=None, archive_dir=None):
+    """Archive every period older than the retention window, oldest first"""
+    from .models import AuditLog
+
+    periods = (
+        AuditLog.objects.filter(period__lt=retention_cutoff(hot_months))
+        .order_by('period')
+        .values_list('period', flat=True)
+        .distinct()
+    )
+    return [archive for archive in (archive_period(period, archive_dir) for period in list(periods)) if archive]
+
+
+def read_archive(archive, archive_dir=None):
+    """Yield the records stored in an AuditLogArchive file"""
+    path = os.path.join(archive_dir or AUDIT_LOG_ARCHIVE_DIR, archive.file_name)
+    with gzip.open(path, 'rt', encoding='utf-8') as lines:
+        for line in lines:
+            yield json.loads(line)
+
+
+def restore_period(period, archive_dir=None):
+    """Load the archives of a period back into AuditLog and drop the files"""
+    from .models import AuditLogArchive
+
+    restored = 0
+    for archive in AuditLogArchive.objects.filter(period=period).order_by('created_at'):
+        records = list(read_archive(archive, archive_dir))
+        with transaction.atomic():
+            restored += write_entries(records)
+            archive.delete()
+        os.remove(os.path.join(archive_dir or AUDIT_LOG_ARCHIVE_DIR, archive.file_name))
+    return restored
@@ -0,0 +1,69 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+# How long an email with no account is remembered, so repeated attempts skip the database
+LOGIN_NEGATIVE_CACHE_TIMEOUT = getattr(settings, 'LOGIN_NEGATIVE_CACHE_TIMEOUT', 60)
+
+
+def normalize_login_email(email):
+    """Same normalization as User.email_key"""
+    return (email or '').strip().lower()
+
+
+def missing_login_key(email):
+    return 'auth:missing:' + hashlib.md5(normalize_login_email(email).encode()).hexdigest()
+
+
+def forget_missing_logins(*emails):
+    """Called when accounts are created, so they can log in right away"""
+    cache.delete_many([missing_login_key(email) for email in emails])
+
+
+class EmailBackend(ModelBackend):
+    """
+    Authenticates on the normalized email: one indexed query that loads the
+    user with its member. Emails without an account are remembered for
+    LOGIN_NEGATIVE_CACHE_TIMEOUT seconds. Outdated password hashes are
+    rehashed with the configured hasher by check_password on success.
+    Failures are counted by the login throttle; while an email or address
+    is delayed or locked out, attempts are refused before any query or hash.
+    """
+
+    def authenticate(self, request, email=None, password=None, username=None, **kwargs):
+        from .throttling import login_retry_after, record_login_failure, record_login_success
+
+        UserModel = get_user_model()
+        email = normalize_login_email(email or username or kwargs.get(UserModel.USERNAME_FIELD))
+        if not email or password is None:
+            return None
+        if request is not None and login_retry_after(request, email):
+            return None
+
+        key = missing_login_key(email)
+        user = None
+        if not cache.get(key):
+            user = UserModel._default_manager.select_related('member').filter(email_key=email).first()
+            if user is None:
+                cache.set(key, True, LOGIN_NEGATIVE_CACHE_TIMEOUT)
+
+        if user is None:
+            # Hash anyway, so unknown emails take as long as wrong passwords
+            UserModel().set_password(password)
+        elif user.check_password(password) and self.user_can_authenticate(user):
+            record_login_success(request, email)
+            return user
+        if request is not None:
+            record_login_failure(request, email)
+        return None
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related('member').get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
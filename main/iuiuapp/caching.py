@@ -0,0 +1,84 @@
+import hashlib
+import time
+from functools import wraps
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+
+LEADERSHIP_GENERATION_KEY = 'leadership:generation'
+
+# Entries are invalidated by the generation number, the timeout only bounds
+# how long superseded generations linger in the cache.
+LEADERSHIP_CACHE_TIMEOUT = getattr(settings, 'LEADERSHIP_CACHE_TIMEOUT', 60 * 60 * 24 * 7)
+
+
+def new_leadership_generation():
+    # A clock reading, not a counter: if the key is culled from the cache
+    # the next generation still differs from every one used before
+    return time.time_ns()
+
+
+def get_leadership_generation():
+    generation = cache.get(LEADERSHIP_GENERATION_KEY)
+    if generation is None:
+        generation = new_leadership_generation()
+        cache.add(LEADERSHIP_GENERATION_KEY, generation, timeout=None)
+        # Another worker may have added its own first
+        generation = cache.get(LEADERSHIP_GENERATION_KEY, generation)
+    return generation
+
+
+def bump_leadership_generation():
+    """Invalidate every cached leadership page and fragment at once"""
+    generation = new_leadership_generation()
+    cache.set(LEADERSHIP_GENERATION_KEY, generation, timeout=None)
+    return generation
+
+
+def leadership_cache_key(name, *parts):
+    parts = ':'.join(str(part) for part in parts)
+    return f"leadership:{get_leadership_generation()}:{name}:{parts}"
+
+
+def get_or_build_leadership_data(name, builder, *parts):
+    """Return cached leadership data for the current generation, building it on a miss"""
+    key = leadership_cache_key(name, *parts)
+    data = cache.get(key)
+    if data is None:
+        data = builder()
+        cache.set(key, data, LEADERSHIP_CACHE_TIMEOUT)
+    return data
+
+
+def is_anonymous_request(request):
+    # Without a session cookie the visitor cannot be logged in, so the
+    # check costs no session lookup.
+    if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+        return True
+    return not request.user.is_authenticated
+
+
+def cache_leadership_page(view_func):
+    """
+    Serve anonymous GET requests for a leadership page from the cache.
+    The key includes the leadership generation, so a bump makes every
+    previously cached page unreachable.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or not is_anonymous_request(request):
+            return view_func(request, *args, **kwargs)
+
+        path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        key = leadership_cache_key('page', view_func.__name__, path_hash)
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = view_func(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming and not response.cookies:
+            cache.set(key, (response.content, response['Content-Type']), LEADERSHIP_CACHE_TIMEOUT)
+        return response
+    return wrapper
@@ -0,0 +1,149 @@
+import logging
+
+from django.conf import settings
+from django.contrib.admin.views.main import PAGE_VAR, ChangeList
+from django.db import connection
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.template.response import TemplateResponse
+
+from .pagination import ApproximateCountPaginator, approximate_count
+
+logger = logging.getLogger(__name__)
+
+# Queries one changelist page may run, whatever the number of rows on it
+ADMIN_CHANGELIST_QUERY_BUDGET = getattr(settings, 'ADMIN_CHANGELIST_QUERY_BUDGET', 12)
+
+# Query string flag asking a changelist for an exact count
+EXACT_COUNT_VAR = 'exact_count'
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCounter:
+    """connection.execute_wrapper that counts the queries run through it"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def count_related(model, field, **filters):
+    """Correlated COUNT of model rows whose `field` points at the outer row, 0 when none"""
+    rows = model._default_manager.filter(**{field: OuterRef('pk')}, **filters)
+    return Coalesce(Subquery(rows.order_by().values(field).annotate(total=Count('pk')).values('total')), 0)
+
+
+def annotated_column(name, description, boolean=False, empty=None):
+    """list_display column showing (and sorting on) the annotation `name`"""
+    def column(self, obj):
+        value = getattr(obj, name)
+        return empty if value is None and empty is not None else value
+    column.short_description = description
+    column.admin_order_field = name
+    column.boolean = boolean
+    return column
+
+
+class AnnotatedChangeListMixin:
+    """
+    ModelAdmin mixin for changelists whose cost doesn't grow with the page.
+
+    Computed columns are declared as list_annotations ({name: expression},
+    added to get_queryset) and shown with annotated_column, related objects
+    come from list_select_related.
+
+    With ADMIN_QUERY_BUDGET_STRICT (the test suite) every GET of the
+    changelist, rendering included, is counted against
+    changelist_query_budget and going over raises QueryBudgetExceeded;
+    with ADMIN_QUERY_BUDGET_LOG it is only logged. Otherwise nothing is
+    counted.
+    """
+    list_annotations = {}
+    changelist_query_budget = ADMIN_CHANGELIST_QUERY_BUDGET
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if self.list_annotations:
+            queryset = queryset.annotate(**self.list_annotations)
+        return queryset
+
+    def changelist_view(self, request, extra_context=None):
+        # Settings are read per call, so tests can override_settings them
+        strict = getattr(settings, 'ADMIN_QUERY_BUDGET_STRICT', False)
+        if request.method != 'GET' or not (strict or getattr(settings, 'ADMIN_QUERY_BUDGET_LOG', False)):
+            return super().changelist_view(request, extra_context=extra_context)
+
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = super().changelist_view(request, extra_context=extra_context)
+            if isinstance(response, TemplateResponse) and not response.is_rendered:
+                response.render()
+        if isinstance(response, TemplateResponse):
+            self.check_query_budget(request, counter.count, strict)
+        return response
+
+    def check_query_budget(self, request, count, strict=False):
+        if count <= self.changelist_query_budget:
+            return
+        message = (
+            f"{self.model._meta.label} changelist ran {count} queries, "
+            f"budget is {self.changelist_query_budget} ({request.get_full_path()})"
+        )
+        if strict:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+# ---------------------------
+# Approximate counts
+# ---------------------------
+class ApproximateCountChangeList(ChangeList):
+    """
+    ChangeList whose filtered and full counts both come from
+    approximate_count, with a link (exact_count_url) to count exactly.
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        super().__init__(request, *args, **kwargs)
+        # Links to other filters, orderings and pages go back to estimates
+        self.params.pop(EXACT_COUNT_VAR, None)
+        self.filter_params.pop(EXACT_COUNT_VAR, None)
+        self.exact_count_url = self.get_query_string({EXACT_COUNT_VAR: 1, PAGE_VAR: self.page_num})
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(EXACT_COUNT_VAR, None)
+        return lookup_params
+
+    def get_results(self, request):
+        super().get_results(request)
+        self.is_approximate = self.paginator.is_approximate
+        if self.model_admin.show_estimated_full_count:
+            self.full_result_count, _ = approximate_count(self.root_queryset, exact=EXACT_COUNT_VAR in request.GET)
+            self.show_full_result_count = True
+            self.show_admin_actions = bool(self.full_result_count)
+
+
+class ApproximateCountMixin:
+    """
+    ModelAdmin mixin for very large tables: counts are exact up to
+    APPROXIMATE_COUNT_THRESHOLD rows and estimated above it, unless the
+    "count exactly" link is followed.
+    """
+    paginator = ApproximateCountPaginator
+    # Django's "N total" is an exact COUNT(*) of the whole table, the
+    # changelist shows an estimated one instead
+    show_full_result_count = False
+    show_estimated_full_count = True
+
+    def get_changelist(self, request, **kwargs):
+        return ApproximateCountChangeList
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        return self.paginator(queryset, per_page, orphans, allow_empty_first_page, exact=EXACT_COUNT_VAR in request.GET)
@@ -0,0 +1,82 @@
+import hashlib
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+AGENT_CACHE_SIZE = getattr(settings, 'CLIENT_AGENT_CACHE_SIZE', 512)
+MAX_USER_AGENT_LENGTH = 2000
+
+# First match wins, so more specific tokens come before the ones they contain
+# (Edge and Opera send "Chrome", Chrome sends "Safari")
+BROWSER_PATTERNS = [
+    ('Edge', re.compile(r'Edg(e|A|iOS)?/')),
+    ('Opera', re.compile(r'OPR/|Opera')),
+    ('Samsung Internet', re.compile(r'SamsungBrowser/')),
+    ('Firefox', re.compile(r'Firefox/|FxiOS/')),
+    ('Chrome', re.compile(r'Chrome/|CriOS/')),
+    ('Safari', re.compile(r'Safari/')),
+    ('Internet Explorer', re.compile(r'MSIE |Trident/')),
+]
+OS_PATTERNS = [
+    ('Android', re.compile(r'Android')),
+    ('iOS', re.compile(r'iPhone|iPad|iPod')),
+    ('Windows', re.compile(r'Windows')),
+    ('macOS', re.compile(r'Mac OS X|Macintosh')),
+    ('Linux', re.compile(r'Linux|X11')),
+]
+BOT_RE = re.compile(r'bot|crawl|spider|slurp|curl|wget|python-requests|httpclient', re.I)
+MOBILE_RE = re.compile(r'Mobile|Android|iPhone|iPod')
+TABLET_RE = re.compile(r'iPad|Tablet')
+
+
+def parse_user_agent(user_agent):
+    """(browser, os, device) families of a User-Agent header"""
+    if not user_agent:
+        return 'Unknown', 'Unknown', 'UNKNOWN'
+    if BOT_RE.search(user_agent):
+        return 'Bot', 'Unknown', 'BOT'
+
+    browser = next((name for name, pattern in BROWSER_PATTERNS if pattern.search(user_agent)), 'Other')
+    os_family = next((name for name, pattern in OS_PATTERNS if pattern.search(user_agent)), 'Other')
+    if TABLET_RE.search(user_agent):
+        device = 'TABLET'
+    elif MOBILE_RE.search(user_agent):
+        device = 'MOBILE'
+    else:
+        device = 'DESKTOP'
+    return browser, os_family, device
+
+
+def user_agent_hash(user_agent):
+    return hashlib.sha1(user_agent.encode('utf-8', 'replace')).hexdigest()
+
+
+@lru_cache(maxsize=AGENT_CACHE_SIZE)
+def intern_user_agent(user_agent):
+    """ClientAgent id for a User-Agent string, created on first sight"""
+    from .models import ClientAgent
+
+    if not user_agent:
+        return None
+    user_agent = user_agent[:MAX_USER_AGENT_LENGTH]
+    digest = user_agent_hash(user_agent)
+
+    agent_id = ClientAgent.objects.filter(hash=digest).values_list('id', flat=True).first()
+    if agent_id:
+        return agent_id
+
+    browser, os_family, device = parse_user_agent(user_agent)
+    try:
+        with transaction.atomic():
+            return ClientAgent.objects.create(
+                hash=digest,
+                user_agent=user_agent,
+                browser=browser,
+                os=os_family,
+                device=device,
+            ).id
+    except IntegrityError:
+        # Another worker interned it first
+        return ClientAgent.objects.get(hash=digest).id
@@ -0,0 +1,21 @@
+from django.utils.functional import SimpleLazyObject
+
+from .access import AccessSnapshot
+
+
+def access(request):
+    """
+    `access` (roles and active committee memberships of the current user)
+    and `user_roles`, read from the snapshot behind user.is_admin and friends.
+    """
+    def snapshot():
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return AccessSnapshot()
+        return user.access
+
+    access = SimpleLazyObject(snapshot)
+    return {
+        'access': access,
+        'user_roles': SimpleLazyObject(lambda: access.role_names),
+    }
@@ -0,0 +1,194 @@
+import csv
+import hashlib
+import json
+from collections import Counter
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.http import HttpResponse, JsonResponse
+
+from .exports import csv_safe
+from .search import normalize_course
+
+
+# Dimension name -> verbose name, in cell order
+DIMENSIONS = {
+    'gender': 'Gender',
+    'campus': 'Campus',
+    'batch': 'Batch',
+    'graduation_year': 'Graduation Year',
+    'course': 'Course',
+    'is_active': 'Active Member',
+}
+
+# Profile lookups that make up a cell, in DIMENSIONS order
+CELL_LOOKUPS = (
+    'gender',
+    'campus_id',
+    'member__batch',
+    'member__graduation_year',
+    'member__course',
+    'member__is_active_member',
+)
+
+
+def make_cell(gender, campus_id, batch, graduation_year, course, is_active):
+    return (gender or '', campus_id, batch or '', graduation_year, normalize_course(course), bool(is_active))
+
+
+def cell_fields(cell):
+    gender, campus_id, batch, graduation_year, course, is_active = cell
+    return {
+        'gender': gender,
+        'campus_id': campus_id,
+        'batch': batch,
+        'graduation_year': graduation_year,
+        'course': course,
+        'is_active': is_active,
+    }
+
+
+def cell_key(cell):
+    return hashlib.sha1(json.dumps(cell).encode()).hexdigest()
+
+
+def current_cell(**lookup):
+    """Cell the matching profile is counted in, read from the database (None without a profile)"""
+    from .models import Profile
+
+    row = Profile.objects.filter(**lookup).values_list(*CELL_LOOKUPS).first()
+    return make_cell(*row) if row else None
+
+
+def adjust_cell(cell, delta):
+    from .models import DemographicRollup
+
+    key = cell_key(cell)
+    if DemographicRollup.objects.filter(key=key).update(count=F('count') + delta):
+        return
+    if delta < 0:
+        # Not counted yet (e.g. before the first rebuild), nothing to take away
+        return
+    try:
+        with transaction.atomic():
+            DemographicRollup.objects.create(key=key, count=delta, **cell_fields(cell))
+    except IntegrityError:
+        DemographicRollup.objects.filter(key=key).update(count=F('count') + delta)
+
+
+def move_profile(previous_cell, cell):
+    """Move one profile between cells in the current transaction"""
+    if previous_cell == cell:
+        return
+    if previous_cell is not None:
+        adjust_cell(previous_cell, -1)
+    if cell is not None:
+        adjust_cell(cell, 1)
+
+
+def rebuild_demographics():
+    """
+    Recount the whole cube with one grouped query over Profile. Run after
+    bulk updates that bypass signals; returns the number of cells.
+    """
+    from .models import DemographicRollup, Profile
+
+    counts = Counter()
+    rows = Profile.objects.order_by().values(*CELL_LOOKUPS).annotate(total=Count('pk'))
+    for row in rows:
+        # Spellings of the same course fold into one cell here
+        counts[make_cell(*[row[lookup] for lookup in CELL_LOOKUPS])] += row['total']
+
+    with transaction.atomic():
+        DemographicRollup.objects.all().delete()
+        DemographicRollup.objects.bulk_create([
+            DemographicRollup(key=cell_key(cell), count=count, **cell_fields(cell))
+            for cell, count in counts.items()
+        ], batch_size=1000)
+    return len(counts)
+
+
+# ---------------------------
+# Queries
+# ---------------------------
+def crosstab(dimensions, **filters):
+    """
+    Profile counts grouped by the given dimensions (e.g. ['gender', 'campus',
+    'batch']), optionally restricted by dimension values. Reads only the
+    rollup table; every row carries the count, its share of the total and
+    display labels.
+    """
+    from .models import DemographicRollup, Profile
+
+    dimensions = [name for name in dict.fromkeys(dimensions) if name in DIMENSIONS]
+    filters = {name: value for name, value in filters.items() if name in DIMENSIONS}
+    columns = dimensions + (['campus__name'] if 'campus' in dimensions else [])
+
+    rows = list(
+        DemographicRollup.objects.filter(count__gt=0, **filters)
+        .values(*columns)
+        .annotate(count=Sum('count'))
+        .order_by(*dimensions)
+    )
+    total = sum(row['count'] for row in rows)
+    genders = dict(Profile.GENDER_CHOICES)
+    for row in rows:
+        labels = {
+            'gender': genders.get(row.get('gender'), 'Unknown'),
+            'campus': row.pop('campus__name', None) or 'No campus',
+            'batch': row.get('batch') or 'Unknown',
+            'graduation_year': row.get('graduation_year') or 'Unknown',
+            'course': row.get('course') or 'Unknown',
+            'is_active': 'Yes' if row.get('is_active') else 'No',
+        }
+        row['labels'] = [labels[name] for name in dimensions]
+        row['percentage'] = round(row['count'] / total * 100, 2) if total else 0
+    return rows
+
+
+def dimension_rollup(dimension, **filters):
+    return crosstab([dimension], **filters)
+
+
+def gender_statistics(**filters):
+    """Gender distribution in the shape utils.get_gender_statistics() returned"""
+    rows = sorted(dimension_rollup('gender', **filters), key=lambda row: -row['count'])
+    return {
+        'total': sum(row['count'] for row in rows),
+        'breakdown': [
+            {
+                'gender_code': row['gender'],
+                'gender_name': row['labels'][0],
+                'count': row['count'],
+                'percentage': row['percentage'],
+            }
+            for row in rows
+        ],
+    }
+
+
+# ---------------------------
+# Export
+# ---------------------------
+def crosstab_csv_response(rows, dimensions, filename='demographics.csv'):
+    response = HttpResponse(content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+
+    writer = csv.writer(response)
+    writer.writerow([DIMENSIONS[name] for name in dimensions] + ['Count', 'Percentage'])
+    total = 0
+    for row in rows:
+        writer.writerow([csv_safe(label) for label in row['labels']] + [row['count'], f"{row['percentage']:.2f}%"])
+        total += row['count']
+    writer.writerow(['TOTAL'] + [''] * (len(dimensions) - 1) + [total, '100%'])
+    return response
+
+
+def crosstab_json_response(rows, dimensions, filters=None):
+    return JsonResponse({
+        'dimensions': dimensions,
+        'filters': filters or {},
+        'total': sum(row['count'] for row in rows),
+        'rows': rows,
+    }, encoder=DjangoJSONEncoder)
@@ -0,0 +1,115 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import ExtractYear
+
+from .pagination import CursorPaginator
+
+EVENT_FACETS_KEY = 'events:facets'
+EVENT_FACETS_TIMEOUT = getattr(settings, 'EVENT_FACETS_CACHE_TIMEOUT', 60 * 60)
+EVENTS_PER_PAGE = 3
+
+# Filter labels used in the query string -> Event.event_type values
+EVENT_TYPE_FILTERS = {
+    'Meetup': 'MEETUP',
+    'Seminar': 'SEMINAR',
+    'Get Together': 'GET_TOGETHER',
+    'Workshop': 'WORKSHOP',
+    'Conference': 'CONFERENCE',
+    'Other': 'OTHER',
+}
+
+
+def build_event_facets():
+    """Year, location, type and status counts from one grouped query"""
+    from .models import Event
+
+    rows = (
+        Event.objects.order_by()
+        .annotate(year=ExtractYear('event_date'))
+        .values('year', 'location', 'event_type', 'is_active')
+        .annotate(count=Count('id'))
+    )
+
+    years, locations, types = {}, {}, {}
+    status = {'active': 0, 'inactive': 0}
+    for row in rows:
+        years[row['year']] = years.get(row['year'], 0) + row['count']
+        if row['location']:
+            locations[row['location']] = locations.get(row['location'], 0) + row['count']
+        types[row['event_type']] = types.get(row['event_type'], 0) + row['count']
+        status['active' if row['is_active'] else 'inactive'] += row['count']
+
+    return {
+        'years': sorted(years.items(), reverse=True),
+        'locations': sorted(locations.items()),
+        'types': types,
+        'status': status,
+    }
+
+
+def get_event_facets():
+    facets = cache.get(EVENT_FACETS_KEY)
+    if facets is None:
+        facets = build_event_facets()
+        cache.set(EVENT_FACETS_KEY, facets, EVENT_FACETS_TIMEOUT)
+    return facets
+
+
+def invalidate_event_facets():
+    cache.delete(EVENT_FACETS_KEY)
+
+
+def parse_event_filters(params):
+    """Filter values from the query string, ignoring the select placeholders"""
+    year = params.get('year')
+    place = params.get('place')
+    event_type = params.get('type')
+    status = params.get('status')
+    return {
+        'year': year if year and year != 'Year' else None,
+        'place': place if place and place != 'Place' else None,
+        'type': event_type if event_type and event_type != 'Type' else None,
+        'status': status if status and status != 'Status' else None,
+    }
+
+
+def filter_events(queryset, filters):
+    if filters['year']:
+        try:
+            queryset = queryset.filter(event_date__year=int(filters['year']))
+        except ValueError:
+            pass
+    if filters['place']:
+        queryset = queryset.filter(location__icontains=filters['place'])
+    if filters['type']:
+        db_event_type = EVENT_TYPE_FILTERS.get(filters['type'])
+        if db_event_type:
+            queryset = queryset.filter(event_type=db_event_type)
+    # Only if not "All"
+    if filters['status'] == 'Active':
+        queryset = queryset.filter(is_active=True)
+    elif filters['status'] == 'Inactive':
+        queryset = queryset.filter(is_active=False)
+    return queryset
+
+
+def event_listing(params, active_tab='active'):
+    """
+    First page of each tab (the selected tab follows the cursor in params)
+    plus the cached facets. Only the pages are evaluated, never the full lists.
+    """
+    from .models import Event
+
+    filters = parse_event_filters(params)
+    pages = {}
+    for tab, is_active in (('active', True), ('inactive', False)):
+        events = filter_events(Event.objects.filter(is_active=is_active), filters)
+        paginator = CursorPaginator(events, EVENTS_PER_PAGE, ordering=('-event_date', '-id'))
+        pages[tab] = paginator.get_page(params.get('cursor') if tab == active_tab else None)
+
+    return {
+        'filters': filters,
+        'pages': pages,
+        'facets': get_event_facets(),
+    }
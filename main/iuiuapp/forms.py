@@ -148,4 +148,33 @@ class UserUpdateForm(forms.ModelForm):
         widgets = {
             'is_active': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
             'is_verified': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
-        }
\ No newline at end of file
+        }
+
+
+class DemographicsFilterForm(forms.Form):
+    """Filters of the admin demographics report; every field is optional"""
+    gender = forms.ChoiceField(choices=[('', 'Any')] + Profile.GENDER_CHOICES, required=False)
+    campus = forms.ModelChoiceField(queryset=Campus.objects.order_by('name'), required=False, empty_label='Any')
+    batch = forms.CharField(max_length=10, required=False)
+    graduation_year = forms.IntegerField(min_value=1900, max_value=2100, required=False)
+    course = forms.CharField(max_length=100, required=False)
+    is_active = forms.NullBooleanField(
+        required=False,
+        label="Active member",
+        widget=forms.Select(choices=[('', 'Any'), ('true', 'Yes'), ('false', 'No')]),
+    )
+
+    def clean_course(self):
+        from .search import normalize_course
+        # Rollups hold the normalized course name
+        course = self.cleaned_data.get('course')
+        return normalize_course(course) if course else ''
+
+    def filters(self):
+        """crosstab() filters from the fields that are set and valid"""
+        filters = {}
+        for name, value in getattr(self, 'cleaned_data', {}).items():
+            if value is None or value == '':
+                continue
+            filters[name] = value.pk if isinstance(value, Campus) else value
+        return filters
@@ -0,0 +1,10 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with PASSWORD_PBKDF2_ITERATIONS rounds. Hashes stored
+    with any other count are rehashed with it on the next successful login.
+    """
+    iterations = getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', 600000)
@@ -0,0 +1,161 @@
+import hashlib
+import itertools
+import os
+import threading
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+
+# Numbers reserved from the database at a time by each process
+IDENTIFIER_BLOCK_SIZE = getattr(settings, 'IDENTIFIER_BLOCK_SIZE', 20)
+
+# Key of the permutation that makes consecutive numbers look unrelated.
+# Never change it once IDs have been issued: new IDs could then repeat old ones.
+IDENTIFIER_KEY = getattr(settings, 'IDENTIFIER_KEY', 'iuiuaa-identifiers')
+
+IDENTIFIER_PREFIXES = {
+    'member_id': 'MEM-',
+    'student_id': 'IUAA-',
+}
+
+ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+# Six base36 characters plus a check character. The legacy random IDs
+# have six characters in total, so the two can never coincide.
+BODY_LENGTH = 6
+ID_SPACE = len(ALPHABET) ** BODY_LENGTH
+
+
+# ---------------------------
+# Encoding
+# ---------------------------
+def scramble(number, name):
+    """
+    Keyed permutation of [0, ID_SPACE): a 4-round Feistel network on 32
+    bits, cycle-walked back into range. Distinct numbers always give
+    distinct results.
+    """
+    if not 0 <= number < ID_SPACE:
+        raise ValueError(f"{name} sequence exhausted")
+    value = number
+    while True:
+        left, right = value >> 16, value & 0xFFFF
+        for round_number in range(4):
+            digest = hashlib.blake2s(
+                f'{IDENTIFIER_KEY}:{name}:{round_number}:{right}'.encode(), digest_size=2
+            ).digest()
+            left, right = right, left ^ int.from_bytes(digest, 'big')
+        value = (left << 16) | right
+        if value < ID_SPACE:
+            return value
+
+
+def to_base36(value, length):
+    digits = []
+    for _ in range(length):
+        value, digit = divmod(value, len(ALPHABET))
+        digits.append(ALPHABET[digit])
+    return ''.join(reversed(digits))
+
+
+def check_character(body):
+    """Luhn mod 36 check character, catches single typos and most swaps"""
+    total = 0
+    for position, ch in enumerate(reversed(body)):
+        addend = ALPHABET.index(ch) * (2 if position % 2 == 0 else 1)
+        total += addend // len(ALPHABET) + addend % len(ALPHABET)
+    return ALPHABET[-total % len(ALPHABET)]
+
+
+def format_identifier(name, number):
+    body = to_base36(scramble(number, name), BODY_LENGTH)
+    return f'{IDENTIFIER_PREFIXES[name]}{body}{check_character(body)}'
+
+
+def is_valid_identifier(value):
+    """True for a well-formed sequence-issued ID (legacy random IDs have no check character)"""
+    for prefix in IDENTIFIER_PREFIXES.values():
+        if value.startswith(prefix):
+            code = value[len(prefix):]
+            return (
+                len(code) == BODY_LENGTH + 1
+                and all(ch in ALPHABET for ch in code)
+                and check_character(code[:-1]) == code[-1]
+            )
+    return False
+
+
+# ---------------------------
+# Allocation
+# ---------------------------
+def reserve_block(name, size):
+    """Reserve `size` consecutive numbers of a sequence, returns them as a range"""
+    from .models import IdentifierSequence
+
+    with transaction.atomic():
+        if not IdentifierSequence.objects.filter(name=name).update(next_value=F('next_value') + size):
+            try:
+                with transaction.atomic():
+                    IdentifierSequence.objects.create(name=name, next_value=size)
+                return range(0, size)
+            except IntegrityError:
+                IdentifierSequence.objects.filter(name=name).update(next_value=F('next_value') + size)
+        end = IdentifierSequence.objects.filter(name=name).values_list('next_value', flat=True).get()
+    return range(end - size, end)
+
+
+class IdentifierAllocator:
+    """
+    Hands out numbers of one sequence from a block reserved per process,
+    so most IDs cost no query at all.
+    """
+
+    def __init__(self, name, block_size):
+        self.name = name
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._block = iter(())
+        self._pid = None
+
+    def next_number(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # A forked worker must not reuse its parent's block
+                self._block = iter(())
+                self._pid = os.getpid()
+            number = next(self._block, None)
+            if number is not None:
+                return number
+
+            block = reserve_block(self.name, self.block_size)
+            remainder = block[1:]
+            if connection.in_atomic_block:
+                # Rolling back the caller's transaction also gives the block
+                # back to the sequence, so only keep it once that commits
+                transaction.on_commit(lambda: self._keep(remainder))
+            else:
+                self._block = iter(remainder)
+            return block[0]
+
+    def _keep(self, numbers):
+        with self._lock:
+            if self._pid == os.getpid():
+                self._block = itertools.chain(self._block, numbers)
+
+
+allocators = {
+    name: IdentifierAllocator(name, IDENTIFIER_BLOCK_SIZE)
+    for name in IDENTIFIER_PREFIXES
+}
+
+
+def allocate_identifier(name):
+    """A new unique ID for name ('member_id' or 'student_id')"""
+    return format_identifier(name, allocators[name].next_number())
+
+
+def allocate_identifiers(name, count):
+    """`count` new unique IDs from one dedicated block, for bulk inserts"""
+    if count <= 0:
+        return []
+    return [format_identifier(name, number) for number in reserve_block(name, count)]
@@ -0,0 +1,311 @@
+import logging
+import os
+import threading
+from datetime import timedelta
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------
+# Rendition specs
+# ---------------------------
+# 'pad' letterboxes the image onto a white canvas of the exact size (the
+# member card layout), otherwise the image is only bounded by the size.
+PROFILE_PHOTO_RENDITIONS = {
+    'thumbnail': {'size': (150, 210), 'pad': True},
+    'card': {'size': (397, 556), 'pad': True},
+    'full': {'size': (1200, 1680), 'pad': False},
+}
+
+# Fixed-width gallery variants, keyed by width for srcset
+GALLERY_RENDITION_WIDTHS = getattr(settings, 'GALLERY_RENDITION_WIDTHS', (320, 640, 1280))
+GALLERY_RENDITIONS = {
+    str(width): {'size': (width, width * 10), 'skip_larger': True}
+    for width in GALLERY_RENDITION_WIDTHS
+}
+
+JPEG_QUALITY = 85
+WEBP_QUALITY = 80
+
+MAX_ATTEMPTS = getattr(settings, 'IMAGE_JOB_MAX_ATTEMPTS', 3)
+STALE_AFTER = timedelta(minutes=getattr(settings, 'IMAGE_JOB_STALE_MINUTES', 10))
+
+
+def render_variant(img, size, pad=False):
+    variant = img.copy()
+    variant.thumbnail(size, Image.Resampling.LANCZOS)
+    if pad:
+        canvas = Image.new('RGB', size, (255, 255, 255))
+        x = (size[0] - variant.width) // 2
+        y = (size[1] - variant.height) // 2
+        canvas.paste(variant, (x, y))
+        variant = canvas
+    return variant
+
+
+def save_variant(variant, path, format, quality):
+    buffer = BytesIO()
+    variant.save(buffer, format=format, quality=quality)
+    return default_storage.save(path, ContentFile(buffer.getvalue()))
+
+
+def open_source_image(field_file):
+    field_file.open('rb')
+    try:
+        img = Image.open(field_file)
+        img = ImageOps.exif_transpose(img)
+        return img.convert('RGB')
+    finally:
+        field_file.close()
+
+
+def build_renditions(field_file, specs, base_path):
+    """
+    Render every spec as JPEG and WebP under base_path and return the
+    metadata dict stored on the model.
+    """
+    img = open_source_image(field_file)
+    renditions = {
+        'source': field_file.name,
+        'width': img.width,
+        'height': img.height,
+        'variants': {},
+    }
+
+    stem = os.path.splitext(os.path.basename(field_file.name))[0]
+    for name, spec in specs.items():
+        # Once a variant reaches the source width, larger ones would only duplicate it
+        widest = max((v['width'] for v in renditions['variants'].values()), default=0)
+        if spec.get('skip_larger') and widest >= img.width:
+            continue
+        variant = render_variant(img, spec['size'], pad=spec.get('pad', False))
+        renditions['variants'][name] = {
+            'width': variant.width,
+            'height': variant.height,
+            'jpeg': save_variant(variant, f"{base_path}/{stem}-{name}.jpg", 'JPEG', JPEG_QUALITY),
+            'webp': save_variant(variant, f"{base_path}/{stem}-{name}.webp", 'WEBP', WEBP_QUALITY),
+        }
+    return renditions
+
+
+def delete_renditions(renditions):
+    for variant in (renditions or {}).get('variants', {}).values():
+        for key in ('jpeg', 'webp'):
+            path = variant.get(key)
+            if path and default_storage.exists(path):
+                default_storage.delete(path)
+
+
+def discard_renditions(renditions):
+    """Delete the files of superseded renditions once the current transaction commits"""
+    if (renditions or {}).get('variants'):
+        transaction.on_commit(lambda: delete_renditions(renditions))
+
+
+def current_renditions(renditions, field_file):
+    """renditions if they were built from field_file's current image, else none"""
+    if not field_file or (renditions or {}).get('source') != field_file.name:
+        return {}
+    return renditions
+
+
+def rendition_url(renditions, name, format='jpeg'):
+    variant = (renditions or {}).get('variants', {}).get(name)
+    if variant and variant.get(format):
+        return default_storage.url(variant[format])
+    return None
+
+
+def rendition_for_width(renditions, width):
+    """Smallest variant at least `width` wide, or the largest one available"""
+    variants = sorted(
+        (renditions or {}).get('variants', {}).values(),
+        key=lambda variant: variant['width']
+    )
+    for variant in variants:
+        if variant['width'] >= width:
+            return variant
+    return variants[-1] if variants else None
+
+
+def loaded_file_name(instance, field_name):
+    """
+    Name of a file field as loaded from the database, read without
+    triggering a query for deferred fields (None when deferred).
+    """
+    if field_name not in instance.__dict__:
+        return None
+    value = instance.__dict__[field_name]
+    return getattr(value, 'name', value) or ''
+
+
+def is_image_changed(field_file, original_name):
+    if not field_file:
+        return False
+    if not field_file._committed:
+        return True
+    return original_name is not None and field_file.name != original_name
+
+
+# ---------------------------
+# Job handlers
+# ---------------------------
+def process_field_image(job, model, field_name, renditions_field, specs, base_path):
+    """Render one image field of a model instance and store the metadata on it"""
+    obj = model.objects.filter(pk=job.object_id).first()
+    field_file = getattr(obj, field_name, None) if obj else None
+    if not field_file or field_file.name != job.source_name:
+        # Object deleted or image replaced since the job was queued
+        return False
+
+    previous = getattr(obj, renditions_field)
+    setattr(obj, renditions_field, build_renditions(field_file, specs, f"{base_path}/{obj.pk}"))
+    obj.save(update_fields=[renditions_field])
+    delete_renditions(previous)
+    return True
+
+
+def process_profile_photo(job):
+    from .models import Profile
+    return process_field_image(
+        job, Profile, 'photo', 'photo_renditions',
+        PROFILE_PHOTO_RENDITIONS, 'profiles/renditions'
+    )
+
+
+def process_gallery_image(job):
+    from .models import GalleryImage
+    return process_field_image(
+        job, GalleryImage, 'image', 'renditions',
+        GALLERY_RENDITIONS, 'gallery/renditions/images'
+    )
+
+
+def process_album_cover(job):
+    from .models import GalleryAlbum
+    return process_field_image(
+        job, GalleryAlbum, 'cover_image', 'cover_renditions',
+        GALLERY_RENDITIONS, 'gallery/renditions/covers'
+    )
+
+
+JOB_HANDLERS = {
+    'PROFILE_PHOTO': process_profile_photo,
+    'GALLERY_IMAGE': process_gallery_image,
+    'ALBUM_COVER': process_album_cover,
+}
+
+
+# ---------------------------
+# Queue
+# ---------------------------
+def enqueue_image_job(kind, object_id, source_name, start_worker=True):
+    """Queue an image job and nudge the in-process worker after commit"""
+    from .models import ImageJob
+
+    # A newer upload supersedes anything still waiting for the same object
+    ImageJob.objects.filter(kind=kind, object_id=object_id, status='PENDING').delete()
+    job = ImageJob.objects.create(kind=kind, object_id=object_id, source_name=source_name)
+
+    if start_worker and getattr(settings, 'IMAGE_PIPELINE_BACKGROUND_WORKER', True):
+        transaction.on_commit(start_background_worker)
+    return job
+
+
+def claim_job(job):
+    from .models import ImageJob
+
+    return ImageJob.objects.filter(pk=job.pk, status='PENDING').update(
+        status='PROCESSING',
+        attempts=F('attempts') + 1,
+        updated_at=timezone.now(),
+    ) == 1
+
+
+def requeue_stale_jobs():
+    from .models import ImageJob
+
+    return ImageJob.objects.filter(
+        status='PROCESSING',
+        updated_at__lt=timezone.now() - STALE_AFTER
+    ).update(status='PENDING', updated_at=timezone.now())
+
+
+def run_job(job):
+    from .models import ImageJob
+
+    handler = JOB_HANDLERS.get(job.kind)
+    try:
+        if handler is None:
+            raise ValueError(f"No handler for image job kind '{job.kind}'")
+        handler(job)
+    except Exception as e:
+        logger.exception("Image job %s failed", job.pk)
+        job.refresh_from_db(fields=['attempts'])
+        ImageJob.objects.filter(pk=job.pk).update(
+            status='FAILED' if job.attempts >= MAX_ATTEMPTS else 'PENDING',
+            last_error=str(e)[:1000],
+            updated_at=timezone.now(),
+        )
+        return False
+
+    ImageJob.objects.filter(pk=job.pk).update(
+        status='DONE',
+        last_error='',
+        updated_at=timezone.now(),
+    )
+    return True
+
+
+def run_pending_jobs(limit=None):
+    """Claim and process pending jobs, returns the number processed"""
+    from .models import ImageJob
+
+    requeue_stale_jobs()
+    processed = 0
+    while limit is None or processed < limit:
+        batch = list(ImageJob.objects.filter(status='PENDING').order_by('created_at')[:20])
+        if not batch:
+            break
+        for job in batch:
+            if limit is not None and processed >= limit:
+                break
+            if claim_job(job):
+                run_job(job)
+                processed += 1
+    return processed
+
+
+_worker_lock = threading.Lock()
+_worker_thread = None
+
+
+def start_background_worker():
+    """Drain the queue in a daemon thread of the current process, if not already running"""
+    global _worker_thread
+
+    with _worker_lock:
+        if _worker_thread and _worker_thread.is_alive():
+            return
+        _worker_thread = threading.Thread(target=_drain_queue, name='image-pipeline', daemon=True)
+        _worker_thread.start()
+
+
+def _drain_queue():
+    from django.db import connection
+
+    try:
+        run_pending_jobs()
+    except Exception:
+        logger.exception("Image pipeline worker stopped")
+    finally:
+        connection.close()
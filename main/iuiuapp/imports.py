@@ -0,0 +1,374 @@
+import csv
+import io
+import logging
+import re
+import zipfile
+from collections import Counter
+from xml.etree import ElementTree
+
+from django.conf import settings
+from django.contrib.auth.base_user import BaseUserManager
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = getattr(settings, 'MEMBER_IMPORT_CHUNK_SIZE', 500)
+
+# Accepted spellings of each column header -> Member/Profile field
+IMPORT_COLUMNS = {
+    'full_name': ('full_name', 'name', 'names', 'student_name'),
+    'email': ('email', 'email_address', 'e_mail'),
+    'student_id': ('student_id', 'reg_no', 'registration_number', 'registration_no'),
+    'course': ('course', 'programme', 'program', 'department'),
+    'batch': ('batch', 'batch_year', 'intake'),
+    'graduation_year': ('graduation_year', 'year_of_graduation', 'graduated'),
+    'phone': ('phone', 'phone_number', 'contact', 'telephone'),
+    'gender': ('gender', 'sex'),
+    'campus': ('campus',),
+    'current_job': ('current_job', 'job', 'position'),
+    'current_company': ('current_company', 'company', 'employer', 'organization'),
+}
+
+GENDER_VALUES = {
+    'm': 'M', 'male': 'M',
+    'f': 'F', 'female': 'F',
+    'p': 'P', '': 'P', 'prefer not to say': 'P',
+}
+
+MAX_LENGTHS = {
+    'full_name': 150,
+    'email': 254,
+    'student_id': 30,
+    'course': 100,
+    'batch': 10,
+    'phone': 20,
+    'current_job': 200,
+    'current_company': 200,
+}
+
+
+class ImportResult:
+    """Outcome of an import: created count and a per-row error report"""
+
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.rows = 0
+        self.valid = 0
+        self.created = 0
+        self.errors = []
+
+    def add_error(self, line, email, message):
+        self.errors.append((line, email, message))
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def write_error_report(self, output):
+        writer = csv.writer(output)
+        writer.writerow(['Line', 'Email', 'Error'])
+        writer.writerows(self.errors)
+
+
+# ---------------------------
+# Reading
+# ---------------------------
+def header_key(text):
+    return re.sub(r'[^a-z0-9]+', '_', str(text or '').strip().lower()).strip('_')
+
+
+def map_header(header):
+    """Column index for every recognised field; unknown columns are ignored"""
+    aliases = {alias: field for field, names in IMPORT_COLUMNS.items() for alias in names}
+    columns = {}
+    for index, title in enumerate(header):
+        field = aliases.get(header_key(title))
+        if field and field not in columns:
+            columns[field] = index
+    return columns
+
+
+def read_csv(fileobj):
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    try:
+        yield from csv.reader(text)
+    finally:
+        text.detach()
+
+
+XLSX_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+
+def column_index(reference):
+    index = 0
+    for ch in reference:
+        if not ch.isalpha():
+            break
+        index = index * 26 + ord(ch.upper()) - ord('A') + 1
+    return index - 1
+
+
+def read_xlsx(fileobj):
+    """Rows of the first worksheet as lists of strings, parsed incrementally"""
+    with zipfile.ZipFile(fileobj) as book:
+        names = book.namelist()
+        shared = []
+        if 'xl/sharedStrings.xml' in names:
+            for _, element in ElementTree.iterparse(book.open('xl/sharedStrings.xml')):
+                if element.tag == XLSX_NS + 'si':
+                    shared.append(''.join(text.text or '' for text in element.iter(XLSX_NS + 't')))
+                    element.clear()
+
+        sheets = sorted(name for name in names if name.startswith('xl/worksheets/sheet'))
+        if not sheets:
+            return
+        for _, element in ElementTree.iterparse(book.open(sheets[0])):
+            if element.tag != XLSX_NS + 'row':
+                continue
+            values = {}
+            for cell in element.iter(XLSX_NS + 'c'):
+                reference = cell.get('r')
+                index = column_index(reference) if reference else len(values)
+                kind = cell.get('t')
+                if kind == 'inlineStr':
+                    value = ''.join(text.text or '' for text in cell.iter(XLSX_NS + 't'))
+                else:
+                    raw = cell.find(XLSX_NS + 'v')
+                    value = raw.text if raw is not None and raw.text else ''
+                    if kind == 's' and value:
+                        value = shared[int(value)]
+                    elif kind is None and value.endswith('.0'):
+                        # Whole numbers (years, phone numbers) come back as floats
+                        value = value[:-2]
+                values[index] = value
+            yield [values.get(index, '') for index in range(max(values) + 1)] if values else []
+            element.clear()
+
+
+def read_rows(fileobj, filename):
+    if filename.lower().endswith('.xlsx'):
+        return read_xlsx(fileobj)
+    return read_csv(fileobj)
+
+
+# ---------------------------
+# Validation
+# ---------------------------
+class ImportContext:
+    """Lookups shared by every batch of one import"""
+
+    def __init__(self):
+        from .models import Campus
+
+        self.campuses = {name.strip().lower(): pk for pk, name in Campus.objects.values_list('pk', 'name')}
+        self.seen_emails = set()
+
+
+def clean_row(values, columns, context):
+    """Cleaned field dict for one row, or raises ValidationError"""
+    row = {field: str(values[index]).strip() if index < len(values) else '' for field, index in columns.items()}
+    errors = []
+
+    for field, limit in MAX_LENGTHS.items():
+        if len(row.get(field, '')) > limit:
+            errors.append(f"{field} is longer than {limit} characters")
+    if not row.get('full_name'):
+        errors.append("full_name is required")
+    if not row.get('batch'):
+        errors.append("batch is required")
+
+    email = BaseUserManager.normalize_email(row.get('email', ''))
+    try:
+        validate_email(email)
+    except ValidationError:
+        errors.append(f"'{email}' is not a valid email address")
+    row['email'] = email
+
+    year = row.get('graduation_year', '')
+    row['graduation_year'] = None
+    if year:
+        try:
+            row['graduation_year'] = int(year)
+            if not 1950 <= row['graduation_year'] <= 2100:
+                raise ValueError
+        except ValueError:
+            errors.append(f"graduation_year '{year}' is not a valid year")
+
+    gender = GENDER_VALUES.get(row.get('gender', '').lower())
+    if gender is None:
+        errors.append(f"gender '{row['gender']}' must be M, F or P")
+    row['gender'] = gender or 'P'
+
+    campus = row.get('campus', '')
+    row['campus_id'] = None
+    if campus:
+        row['campus_id'] = context.campuses.get(campus.lower())
+        if row['campus_id'] is None:
+            errors.append(f"unknown campus '{campus}'")
+
+    if errors:
+        raise ValidationError(errors)
+    return row
+
+
+def validate_batch(batch, columns, context, result):
+    """
+    Clean a batch of (line, values) and drop rows whose email is already
+    taken, in the file or in the database (one query per batch).
+    """
+    from .models import Member
+
+    cleaned = []
+    for line, values in batch:
+        if not any(str(value).strip() for value in values):
+            continue
+        result.rows += 1
+        try:
+            row = clean_row(values, columns, context)
+        except ValidationError as e:
+            email = values[columns['email']] if 'email' in columns and columns['email'] < len(values) else ''
+            result.add_error(line, email, '; '.join(e.messages))
+            continue
+        key = row['email'].lower()
+        if key in context.seen_emails:
+            result.add_error(line, row['email'], "email appears more than once in the file")
+            continue
+        context.seen_emails.add(key)
+        cleaned.append((line, row))
+
+    existing = {
+        email.lower() for email in
+        Member.objects.filter(email__in=[row['email'] for line, row in cleaned]).values_list('email', flat=True)
+    }
+    valid = []
+    for line, row in cleaned:
+        if row['email'].lower() in existing:
+            result.add_error(line, row['email'], "a member with this email already exists")
+        else:
+            valid.append((line, row))
+    result.valid += len(valid)
+    return valid
+
+
+# ---------------------------
+# Inserting
+# ---------------------------
+MEMBER_FIELDS = ('full_name', 'email', 'course', 'batch', 'graduation_year', 'phone', 'current_job', 'current_company')
+
+
+def build_members(valid):
+    """Unsaved members for validated rows, with IDs from one block per sequence"""
+    from .identifiers import allocate_identifiers
+    from .models import Member
+
+    member_ids = iter(allocate_identifiers('member_id', len(valid)))
+    student_ids = iter(allocate_identifiers('student_id', sum(1 for line, row in valid if not row.get('student_id'))))
+    return [
+        Member(
+            member_id=next(member_ids),
+            student_id=row.get('student_id') or next(student_ids),
+            is_active_member=True,
+            **{field: row.get(field) or ('' if field != 'graduation_year' else None) for field in MEMBER_FIELDS}
+        )
+        for line, row in valid
+    ]
+
+
+def insert_batch(valid, result):
+    """
+    Insert one validated batch with bulk_create in a single transaction,
+    then bring everything the save signals would maintain up to date.
+    If the batch hits a constraint (e.g. a member registered meanwhile)
+    it is retried row by row so only the offending rows fail.
+    """
+    from .models import Member, MemberStatus, Profile
+    from .demographics import adjust_cell, make_cell
+    from .search import index_new_members
+    from .stats import adjust_statistics
+
+    members = build_members(valid)
+    try:
+        with transaction.atomic():
+            Member.objects.bulk_create(members, batch_size=IMPORT_CHUNK_SIZE)
+            # MySQL doesn't return the new primary keys from bulk_create
+            ids = dict(Member.objects.filter(email__in=[m.email for m in members]).values_list('email', 'pk'))
+            for member in members:
+                member.pk = ids[member.email]
+
+            profiles = Profile.objects.bulk_create([
+                Profile(member_id=member.pk, gender=row['gender'], campus_id=row['campus_id'])
+                for member, (line, row) in zip(members, valid)
+            ], batch_size=IMPORT_CHUNK_SIZE)
+            profile_ids = dict(Profile.objects.filter(member_id__in=ids.values()).values_list('member_id', 'pk'))
+            for profile in profiles:
+                profile.pk = profile_ids[profile.member_id]
+
+            MemberStatus.objects.bulk_create([MemberStatus(member_id=member.pk) for member in members])
+            index_new_members(members, {profile.member_id: profile for profile in profiles})
+            adjust_statistics(active_members=len(members), members_without_accounts=len(members))
+            cells = Counter(
+                make_cell(profile.gender, profile.campus_id, member.batch, member.graduation_year, member.course, True)
+                for member, profile in zip(members, profiles)
+            )
+            for cell, count in cells.items():
+                adjust_cell(cell, count)
+    except IntegrityError:
+        logger.warning("Bulk member import batch failed, retrying row by row", exc_info=True)
+        insert_rows(valid, result)
+        return
+    result.created += len(members)
+
+
+def insert_rows(valid, result):
+    """Slow path: regular saves (signals and all), one savepoint per row"""
+    from .models import Profile
+
+    for member, (line, row) in zip(build_members(valid), valid):
+        try:
+            with transaction.atomic():
+                member.save()
+                Profile.objects.create(member=member, gender=row['gender'], campus_id=row['campus_id'])
+        except IntegrityError as e:
+            result.valid -= 1
+            result.add_error(line, row['email'], f"could not be saved: {e}")
+        else:
+            result.created += 1
+
+
+def import_members(fileobj, filename, dry_run=False, chunk_size=None):
+    """
+    Import members (and their profiles) from a CSV or XLSX file.
+
+    The file is read and validated in batches of chunk_size rows, each
+    valid batch is inserted in its own transaction. Invalid rows are
+    skipped and reported in result.errors with their line numbers.
+    """
+    chunk_size = chunk_size or IMPORT_CHUNK_SIZE
+    result = ImportResult(dry_run=dry_run)
+    rows = iter(read_rows(fileobj, filename))
+
+    columns = map_header(next(rows, []))
+    missing = [field for field in ('full_name', 'email', 'batch') if field not in columns]
+    if missing:
+        result.add_error(1, '', f"missing column(s): {', '.join(missing)}")
+        return result
+
+    context = ImportContext()
+    batch = []
+    # Line 1 is the header
+    for line, values in enumerate(rows, start=2):
+        batch.append((line, values))
+        if len(batch) >= chunk_size:
+            process_batch(batch, columns, context, result, dry_run)
+            batch = []
+    if batch:
+        process_batch(batch, columns, context, result, dry_run)
+    return result
+
+
+def process_batch(batch, columns, context, result, dry_run):
+    valid = validate_batch(batch, columns, context, result)
+    if valid and not dry_run:
+        insert_batch(valid, result)
@@ -0,0 +1,30 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from iuiuapp.audit import archive_expired, restore_period, retention_cutoff, AUDIT_LOG_HOT_MONTHS
+
+
+class Command(BaseCommand):
+    help = 'Move audit log months older than the retention window into compressed archives'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-months', type=int, default=AUDIT_LOG_HOT_MONTHS, help='Months kept in the audit log table, including the current one')
+        parser.add_argument('--restore', metavar='YYYY-MM', help='Load an archived month back into the audit log table')
+
+    def handle(self, *args, **options):
+        if options['restore']:
+            try:
+                period = datetime.strptime(options['restore'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError('--restore expects a month as YYYY-MM')
+            restored = restore_period(period)
+            self.stdout.write(self.style.SUCCESS(f'Restored {restored} audit log entries for {period:%Y-%m}.'))
+            return
+
+        if options['keep_months'] < 1:
+            raise CommandError('--keep-months must be at least 1')
+
+        cutoff = retention_cutoff(options['keep_months'])
+        archives = archive_expired(options['keep_months'])
+        for archive in archives:
+            self.stdout.write(f'{archive.file_name}: {archive.row_count} entries')
+        self.stdout.write(self.style.SUCCESS(f'Archived {len(archives)} period(s) before {cutoff:%Y-%m}.'))
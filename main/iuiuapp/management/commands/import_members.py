@@ -0,0 +1,37 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from iuiuapp.imports import IMPORT_CHUNK_SIZE, import_members
+
+
+class Command(BaseCommand):
+    help = 'Import members and their profiles from a CSV or XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or XLSX file with a header row')
+        parser.add_argument('--dry-run', action='store_true', help='Validate every row without saving anything')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE, help='Rows validated and inserted per transaction')
+        parser.add_argument('--errors', help='Write the per-row error report to this CSV file')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'{path} does not exist')
+
+        with open(path, 'rb') as fileobj:
+            result = import_members(fileobj, path, dry_run=options['dry_run'], chunk_size=options['chunk_size'])
+
+        for line, email, message in result.errors[:50]:
+            self.stderr.write(f'line {line} {email}: {message}')
+        if len(result.errors) > 50:
+            self.stderr.write(f'... and {len(result.errors) - 50} more')
+        if options['errors'] and result.errors:
+            with open(options['errors'], 'w', newline='', encoding='utf-8') as output:
+                result.write_error_report(output)
+            self.stdout.write(f"Error report written to {options['errors']}")
+
+        if options['dry_run']:
+            summary = f'{result.valid} of {result.rows} rows are valid (dry run, nothing saved).'
+        else:
+            summary = f'Imported {result.created} of {result.rows} rows, {len(result.errors)} rejected.'
+        self.stdout.write(self.style.SUCCESS(summary) if result.ok else self.style.WARNING(summary))
@@ -0,0 +1,39 @@
+import time
+from django.core.management.base import BaseCommand
+from iuiuapp.images import run_pending_jobs, enqueue_image_job
+from iuiuapp.models import Profile, GalleryImage, GalleryAlbum
+
+
+class Command(BaseCommand):
+    help = 'Process queued image jobs (profile photo and gallery renditions)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help='Maximum number of jobs to process')
+        parser.add_argument('--loop', action='store_true', help='Keep polling the queue instead of exiting when empty')
+        parser.add_argument('--sleep', type=float, default=5.0, help='Seconds between polls with --loop')
+        parser.add_argument('--enqueue-missing', action='store_true', help='Queue photos that have no renditions yet')
+
+    def handle(self, *args, **options):
+        if options['enqueue_missing']:
+            sources = [
+                ('PROFILE_PHOTO', Profile, 'photo', 'photo_renditions'),
+                ('GALLERY_IMAGE', GalleryImage, 'image', 'renditions'),
+                ('ALBUM_COVER', GalleryAlbum, 'cover_image', 'cover_renditions'),
+            ]
+            for kind, model, field_name, renditions_field in sources:
+                queued = 0
+                objects = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+                for obj in objects.only('id', field_name, renditions_field).iterator(chunk_size=500):
+                    name = getattr(obj, field_name).name
+                    if getattr(obj, renditions_field).get('source') != name:
+                        enqueue_image_job(kind, obj.pk, name, start_worker=False)
+                        queued += 1
+                self.stdout.write(f'Queued {queued} {model._meta.verbose_name_plural.lower()}.')
+
+        while True:
+            processed = run_pending_jobs(limit=options['limit'])
+            if processed:
+                self.stdout.write(self.style.SUCCESS(f'Processed {processed} image jobs.'))
+            if not options['loop']:
+                break
+            time.sleep(options['sleep'])
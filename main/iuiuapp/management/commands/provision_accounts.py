@@ -0,0 +1,57 @@
+import csv
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from iuiuapp.models import Member
+from iuiuapp.provisioning import PROVISIONING_CHUNK_SIZE, PROVISIONING_WORKERS, provision_accounts
+
+
+class Command(BaseCommand):
+    help = 'Create user accounts for members without one, with passwords or one-time activation links'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', action='append', help='Only members of this batch (repeatable)')
+        parser.add_argument('--email', action='append', help='Only the member with this email (repeatable)')
+        parser.add_argument('--passwords', help='CSV file of email,password rows to set as initial passwords')
+        parser.add_argument('--generate-passwords', action='store_true', help='Give members without a password in --passwords a random one instead of an activation link')
+        parser.add_argument('--output', required=True, help='Write the new credentials (passwords and activation links) to this CSV file')
+        parser.add_argument('--workers', type=int, default=PROVISIONING_WORKERS, help='Processes hashing passwords')
+        parser.add_argument('--chunk-size', type=int, default=PROVISIONING_CHUNK_SIZE, help='Accounts inserted per transaction')
+        parser.add_argument('--include-inactive', action='store_true', help='Also members not marked active')
+
+    def handle(self, *args, **options):
+        members = Member.objects.all()
+        if not options['include_inactive']:
+            members = members.filter(is_active_member=True)
+        if options['batch']:
+            members = members.filter(batch__in=options['batch'])
+        if options['email']:
+            members = members.filter(email__in=options['email'])
+
+        passwords = {}
+        if options['passwords']:
+            if not os.path.exists(options['passwords']):
+                raise CommandError(f"{options['passwords']} does not exist")
+            with open(options['passwords'], newline='', encoding='utf-8-sig') as fileobj:
+                for row in csv.reader(fileobj):
+                    if len(row) >= 2 and '@' in row[0]:
+                        passwords[row[0].strip()] = row[1]
+
+        def progress(done, total):
+            self.stdout.write(f'{done}/{total} members processed')
+
+        result = provision_accounts(
+            members,
+            passwords=passwords,
+            generate_passwords=options['generate_passwords'],
+            workers=options['workers'],
+            chunk_size=options['chunk_size'],
+            progress=progress,
+        )
+
+        for email, message in result.errors:
+            self.stderr.write(f'{email}: {message}')
+        with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+            result.write_csv(output)
+        summary = f"Created {result.created} of {result.total} accounts, credentials written to {options['output']}."
+        self.stdout.write(self.style.SUCCESS(summary) if not result.errors else self.style.WARNING(summary))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from iuiuapp.search import rebuild_blog_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the blog post full-text search index'
+
+    def handle(self, *args, **options):
+        total = rebuild_blog_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} blog posts.'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from iuiuapp.demographics import rebuild_demographics
+
+
+class Command(BaseCommand):
+    help = 'Recount the demographic rollups (gender, campus, batch, graduation year, course, status) from Profile'
+
+    def handle(self, *args, **options):
+        total = rebuild_demographics()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {total} demographic rollup cells.'))
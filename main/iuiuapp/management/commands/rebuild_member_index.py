@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from iuiuapp.search import rebuild_member_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the member directory search index from members and profiles'
+
+    def handle(self, *args, **options):
+        total = rebuild_member_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} members.'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from iuiuapp.models import MemberStatus
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized member status index (leader / committee / regular)'
+
+    def handle(self, *args, **options):
+        total = MemberStatus.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt member status for {total} members.'))
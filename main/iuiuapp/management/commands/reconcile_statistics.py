@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from iuiuapp.stats import reconcile_statistics
+
+
+class Command(BaseCommand):
+    help = 'Recount the dashboard counters from the source tables and correct any drift'
+
+    def handle(self, *args, **options):
+        counters, drift = reconcile_statistics()
+        for name, value in counters.items():
+            off = f' (was off by {drift[name]:+d})' if name in drift else ''
+            self.stdout.write(f'{name}: {value}{off}')
+        self.stdout.write(self.style.SUCCESS(f'Reconciled {len(counters)} counters, {len(drift)} had drifted.'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from iuiuapp.audit import recover_spooled
+
+
+class Command(BaseCommand):
+    help = 'Insert audit log entries spooled to disk by workers that exited before flushing'
+
+    def handle(self, *args, **options):
+        total = recover_spooled()
+        self.stdout.write(self.style.SUCCESS(f'Recovered {total} audit log entries.'))
@@ -27,19 +27,10 @@ class CustomUserManager(BaseUserManager):
             if hasattr(member, 'user_account'):
                 raise ValueError(f'Member with email {email} already has a user account')
         except Member.DoesNotExist:
-            # Generate unique member ID
-            while True:
-                member_id = generate_member_id()
-                if not Member.objects.filter(member_id=member_id).exists():
-                    break
-            
-            # Generate student ID
-            student_id = generate_student_id()
-            
-            # Create Member first
+            # Create Member first (IDs come from the sequences, always unique)
             member = Member.objects.create(
-                member_id=member_id,
-                student_id=student_id,
+                member_id=generate_member_id(),
+                student_id=generate_student_id(),
                 full_name=full_name,
                 email=email,
                 is_active_member=True
@@ -86,19 +77,10 @@ class CustomUserManager(BaseUserManager):
         # Import here to avoid circular import
         from .models import Member, generate_member_id, generate_student_id
         
-        # Generate admin member ID
-        while True:
-            member_id = f"ADMIN_{generate_member_id()}"
-            if not Member.objects.filter(member_id=member_id).exists():
-                break
-        
-        # Generate admin student ID
-        student_id = f"ADMIN_{generate_student_id()}"
-        
         # Create Member with admin prefix
         member = Member.objects.create(
-            member_id=member_id,
-            student_id=student_id,
+            member_id=f"ADMIN_{generate_member_id()}",
+            student_id=f"ADMIN_{generate_student_id()}",
             full_name=full_name,
             email=email,
             batch="ADMIN",
@@ -0,0 +1,62 @@
+# Generated by Django 6.0.2 on 2026-10-17 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_member_status(apps, schema_editor):
+    Member = apps.get_model('iuiuapp', 'Member')
+    AssociationLeadership = apps.get_model('iuiuapp', 'AssociationLeadership')
+    CommitteeMembership = apps.get_model('iuiuapp', 'CommitteeMembership')
+    MemberStatus = apps.get_model('iuiuapp', 'MemberStatus')
+
+    leader_ids = set(AssociationLeadership.objects.filter(
+        is_active=True
+    ).values_list('member_id', flat=True))
+    committee_ids = set(CommitteeMembership.objects.filter(
+        is_active=True
+    ).values_list('user__member_id', flat=True))
+
+    entries = []
+    for member_id in Member.objects.values_list('id', flat=True):
+        is_leader = member_id in leader_ids
+        is_committee_member = member_id in committee_ids
+        if is_leader:
+            status = 'LEADER'
+        elif is_committee_member:
+            status = 'COMMITTEE'
+        else:
+            status = 'REGULAR'
+        entries.append(MemberStatus(
+            member_id=member_id,
+            status=status,
+            is_leader=is_leader,
+            is_committee_member=is_committee_member,
+        ))
+    MemberStatus.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('iuiuapp', '0006_alter_galleryvideo_video'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberStatus',
+            fields=[
+                ('member', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='status_index', serialize=False, to='iuiuapp.member', verbose_name='Member')),
+                ('status', models.CharField(choices=[('LEADER', 'Association Leader'), ('COMMITTEE', 'Committee Member'), ('REGULAR', 'Regular Member')], default='REGULAR', max_length=20, verbose_name='Member Status')),
+                ('is_leader', models.BooleanField(default=False, verbose_name='Association Leader')),
+                ('is_committee_member', models.BooleanField(default=False, verbose_name='Committee Member')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Member Status',
+                'verbose_name_plural': 'Member Statuses',
+                'indexes': [models.Index(fields=['status'], name='iuiuapp_mem_status_edd0cd_idx')],
+            },
+        ),
+        migrations.RunPython(populate_member_status, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-17 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('iuiuapp', '0008_profile_photo_renditions_imagejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='galleryalbum',
+            name='cover_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Cover Renditions'),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Renditions'),
+        ),
+        migrations.AlterField(
+            model_name='imagejob',
+            name='kind',
+            field=models.CharField(choices=[('PROFILE_PHOTO', 'Profile Photo'), ('GALLERY_IMAGE', 'Gallery Image'), ('ALBUM_COVER', 'Album Cover')], max_length=30, verbose_name='Job Type'),
+        ),
+    ]
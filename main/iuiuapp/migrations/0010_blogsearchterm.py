@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-17 13:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('iuiuapp', '0009_gallery_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, verbose_name='Term')),
+                ('weight', models.PositiveIntegerField(default=1, verbose_name='Weight')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='iuiuapp.blogpost', verbose_name='Blog Post')),
+            ],
+            options={
+                'verbose_name': 'Blog Search Term',
+                'verbose_name_plural': 'Blog Search Terms',
+                'indexes': [models.Index(fields=['term', 'post'], name='iuiuapp_blo_term_7141a1_idx')],
+                'unique_together': {('term', 'post')},
+            },
+        ),
+    ]
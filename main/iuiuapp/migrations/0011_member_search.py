@@ -0,0 +1,71 @@
+# Generated by Django 6.0.2 on 2026-10-17 09:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('iuiuapp', '0010_blogsearchterm'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberSearchDocument',
+            fields=[
+                ('member', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='iuiuapp.member', verbose_name='Member')),
+                ('profile_id', models.BigIntegerField(blank=True, null=True, verbose_name='Profile ID')),
+                ('full_name', models.CharField(max_length=150, verbose_name='Full Name')),
+                ('course', models.CharField(blank=True, max_length=100, verbose_name='Normalized Course')),
+                ('course_key', models.CharField(blank=True, max_length=100, verbose_name='Course Key')),
+                ('batch', models.CharField(blank=True, max_length=10, verbose_name='Batch Year')),
+                ('graduation_year', models.PositiveIntegerField(blank=True, null=True, verbose_name='Graduation Year')),
+                ('is_public', models.BooleanField(default=False, verbose_name='Public Profile')),
+                ('is_active_member', models.BooleanField(default=True, verbose_name='Active Member')),
+                ('campus', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='iuiuapp.campus', verbose_name='Campus')),
+            ],
+            options={
+                'verbose_name': 'Member Search Document',
+                'verbose_name_plural': 'Member Search Documents',
+                'ordering': ['full_name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MemberSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, verbose_name='Term')),
+                ('field', models.CharField(choices=[('NAME', 'Name'), ('ID', 'Identifier'), ('WORK', 'Company/Job'), ('COURSE', 'Course')], max_length=10, verbose_name='Field')),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='iuiuapp.membersearchdocument', verbose_name='Document')),
+            ],
+            options={
+                'verbose_name': 'Member Search Term',
+                'verbose_name_plural': 'Member Search Terms',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='membersearchdocument',
+            index=models.Index(fields=['is_public', 'full_name'], name='iuiuapp_mem_is_publ_d682cc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membersearchdocument',
+            index=models.Index(fields=['batch'], name='iuiuapp_mem_batch_7ca644_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membersearchdocument',
+            index=models.Index(fields=['graduation_year'], name='iuiuapp_mem_graduat_c00c0c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membersearchdocument',
+            index=models.Index(fields=['course_key'], name='iuiuapp_mem_course__1d381c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membersearchterm',
+            index=models.Index(fields=['term', 'field'], name='iuiuapp_mem_term_78bdab_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='membersearchterm',
+            unique_together={('term', 'document', 'field')},
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 6.0.2 on 2026-10-17 12:20
+
+from django.db import migrations, models
+from django.db.models.functions import TruncMonth
+
+
+def populate_period(apps, schema_editor):
+    AuditLog = apps.get_model('iuiuapp', 'AuditLog')
+    AuditLog.objects.filter(period__isnull=True).update(
+        period=TruncMonth('timestamp', output_field=models.DateField())
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('iuiuapp', '0012_auditlog_event_timestamp'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditLogArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(verbose_name='Period')),
+                ('file_name', models.CharField(max_length=255, unique=True, verbose_name='Archive File')),
+                ('row_count', models.PositiveIntegerField(default=0, verbose_name='Rows')),
+                ('size_bytes', models.PositiveBigIntegerField(default=0, verbose_name='Size (bytes)')),
+                ('first_timestamp', models.DateTimeField(blank=True, null=True, verbose_name='First Entry')),
+                ('last_timestamp', models.DateTimeField(blank=True, null=True, verbose_name='Last Entry')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Audit Log Archive',
+                'verbose_name_plural': 'Audit Log Archives',
+                'ordering': ['-period', '-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='period',
+            field=models.DateField(editable=False, null=True, verbose_name='Period'),
+        ),
+        migrations.RunPython(populate_period, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='period',
+            field=models.DateField(editable=False, verbose_name='Period'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['period', 'timestamp'], name='iuiuapp_aud_period_f47629_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlogarchive',
+            index=models.Index(fields=['period'], name='iuiuapp_aud_period_739f31_idx'),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 6.0.2 on 2026-10-17 13:10
+
+import hashlib
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Copies of the helpers in iuiuapp.clients as of this migration
+MAX_USER_AGENT_LENGTH = 2000
+
+BROWSER_PATTERNS = [
+    ('Edge', re.compile(r'Edg(e|A|iOS)?/')),
+    ('Opera', re.compile(r'OPR/|Opera')),
+    ('Samsung Internet', re.compile(r'SamsungBrowser/')),
+    ('Firefox', re.compile(r'Firefox/|FxiOS/')),
+    ('Chrome', re.compile(r'Chrome/|CriOS/')),
+    ('Safari', re.compile(r'Safari/')),
+    ('Internet Explorer', re.compile(r'MSIE |Trident/')),
+]
+OS_PATTERNS = [
+    ('Android', re.compile(r'Android')),
+    ('iOS', re.compile(r'iPhone|iPad|iPod')),
+    ('Windows', re.compile(r'Windows')),
+    ('macOS', re.compile(r'Mac OS X|Macintosh')),
+    ('Linux', re.compile(r'Linux|X11')),
+]
+BOT_RE = re.compile(r'bot|crawl|spider|slurp|curl|wget|python-requests|httpclient', re.I)
+MOBILE_RE = re.compile(r'Mobile|Android|iPhone|iPod')
+TABLET_RE = re.compile(r'iPad|Tablet')
+
+
+def parse_user_agent(user_agent):
+    if not user_agent:
+        return 'Unknown', 'Unknown', 'UNKNOWN'
+    if BOT_RE.search(user_agent):
+        return 'Bot', 'Unknown', 'BOT'
+
+    browser = next((name for name, pattern in BROWSER_PATTERNS if pattern.search(user_agent)), 'Other')
+    os_family = next((name for name, pattern in OS_PATTERNS if pattern.search(user_agent)), 'Other')
+    if TABLET_RE.search(user_agent):
+        device = 'TABLET'
+    elif MOBILE_RE.search(user_agent):
+        device = 'MOBILE'
+    else:
+        device = 'DESKTOP'
+    return browser, os_family, device
+
+
+def user_agent_hash(user_agent):
+    return hashlib.sha1(user_agent.encode('utf-8', 'replace')).hexdigest()
+
+
+def intern_existing_user_agents(apps, schema_editor):
+    AuditLog = apps.get_model('iuiuapp', 'AuditLog')
+    ClientAgent = apps.get_model('iuiuapp', 'ClientAgent')
+
+    user_agents = AuditLog.objects.exclude(user_agent='').values_list('user_agent', flat=True).distinct()
+    for user_agent in list(user_agents):
+        truncated = user_agent[:MAX_USER_AGENT_LENGTH]
+        browser, os_family, device = parse_user_agent(truncated)
+        agent, created = ClientAgent.objects.get_or_create(
+            hash=user_agent_hash(truncated),
+            defaults={'user_agent': truncated, 'browser': browser, 'os': os_family, 'device': device},
+        )
+        AuditLog.objects.filter(user_agent=user_agent).update(agent=agent, user_agent='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('iuiuapp', '0013_auditlog_period_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientAgent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash', models.CharField(max_length=40, unique=True, verbose_name='SHA-1 of User Agent')),
+                ('user_agent', models.TextField(verbose_name='User Agent')),
+                ('browser', models.CharField(max_length=50, verbose_name='Browser')),
+                ('os', models.CharField(max_length=50, verbose_name='Operating System')),
+                ('device', models.CharField(choices=[('DESKTOP', 'Desktop'), ('MOBILE', 'Mobile'), ('TABLET', 'Tablet'), ('BOT', 'Bot'), ('UNKNOWN', 'Unknown')], max_length=10, verbose_name='Device')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Client Agent',
+                'verbose_name_plural': 'Client Agents',
+                'indexes': [models.Index(fields=['browser', 'os'], name='iuiuapp_cli_browser_f59c4d_idx'), models.Index(fields=['device'], name='iuiuapp_cli_device_f7bf20_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='agent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='audit_logs', to='iuiuapp.clientagent', verbose_name='Client'),
+        ),
+        migrations.RunPython(intern_existing_user_agents, migrations.RunPython.noop),
+    ]
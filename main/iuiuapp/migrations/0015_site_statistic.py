@@ -0,0 +1,27 @@
+# Generated by Django 6.0.2 on 2026-10-17 15:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('iuiuapp', '0014_client_agent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteStatistic',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False, verbose_name='Counter')),
+                ('value', models.BigIntegerField(default=0, verbose_name='Value')),
+                ('reconciled_at', models.DateTimeField(blank=True, null=True, verbose_name='Last Reconciled')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Site Statistic',
+                'verbose_name_plural': 'Site Statistics',
+                'ordering': ['name'],
+            },
+        ),
+    ]
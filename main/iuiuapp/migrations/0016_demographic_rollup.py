@@ -0,0 +1,34 @@
+# Generated by Django 6.0.2 on 2026-10-17 15:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('iuiuapp', '0015_site_statistic'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DemographicRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(editable=False, max_length=40, unique=True)),
+                ('gender', models.CharField(blank=True, choices=[('M', 'Male'), ('F', 'Female'), ('P', 'Prefer not to say')], max_length=1, verbose_name='Gender')),
+                ('batch', models.CharField(blank=True, max_length=10, verbose_name='Batch Year')),
+                ('graduation_year', models.PositiveIntegerField(blank=True, null=True, verbose_name='Graduation Year')),
+                ('course', models.CharField(blank=True, max_length=100, verbose_name='Course')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Active Member')),
+                ('count', models.IntegerField(default=0, verbose_name='Profiles')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('campus', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='iuiuapp.campus', verbose_name='Campus')),
+            ],
+            options={
+                'verbose_name': 'Demographic Rollup',
+                'verbose_name_plural': 'Demographic Rollups',
+                'indexes': [models.Index(fields=['gender'], name='iuiuapp_dem_gender_c440f4_idx'), models.Index(fields=['batch'], name='iuiuapp_dem_batch_dddf9c_idx'), models.Index(fields=['graduation_year'], name='iuiuapp_dem_graduat_b86937_idx'), models.Index(fields=['course'], name='iuiuapp_dem_course_c25c6a_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-17 15:10
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('iuiuapp', '0017_identifier_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='email_key',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Lower('email'), output_field=models.CharField(max_length=254), verbose_name='Normalized Email'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['email_key'], name='iuiuapp_use_email_k_2ff837_idx'),
+        ),
+    ]
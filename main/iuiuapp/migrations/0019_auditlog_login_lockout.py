@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-17 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('iuiuapp', '0018_user_email_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='action',
+            field=models.CharField(choices=[('LOGIN', 'Login'), ('LOGOUT', 'Logout'), ('REGISTER', 'Registration'), ('PROFILE_UPDATE', 'Profile Update'), ('PASSWORD_CHANGE', 'Password Change'), ('ROLE_CHANGE', 'Role Change'), ('LEADERSHIP_ASSIGN', 'Leadership Assignment'), ('LEADERSHIP_REVOKE', 'Leadership Revocation'), ('COMMITTEE_JOIN', 'Committee Join'), ('COMMITTEE_LEAVE', 'Committee Leave'), ('MEMBER_CREATE', 'Member Created'), ('USER_CREATE', 'User Account Created'), ('LOGIN_LOCKOUT', 'Login Lockout')], max_length=50, verbose_name='Action'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 6.0.2 on 2026-10-17 16:20
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+# Copies of the tokenizer in iuiuapp.search as of this migration
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+MAX_TERM_LENGTH = 64
+
+
+def member_tokens(text):
+    normalized = unicodedata.normalize('NFKD', text or '')
+    folded = ''.join(ch for ch in normalized if not unicodedata.combining(ch)).lower()
+    return [token[:MAX_TERM_LENGTH] for token in TOKEN_RE.findall(folded)]
+
+
+def split_private_terms(apps, schema_editor):
+    """Index student IDs and email addresses apart from the public identifiers"""
+    Member = apps.get_model('iuiuapp', 'Member')
+    MemberSearchDocument = apps.get_model('iuiuapp', 'MemberSearchDocument')
+    MemberSearchTerm = apps.get_model('iuiuapp', 'MemberSearchTerm')
+
+    indexed = MemberSearchDocument.objects.values_list('member_id', flat=True)
+    members = Member.objects.filter(pk__in=indexed).only('id', 'member_id', 'student_id', 'email', 'batch')
+    terms = []
+    for member in members.iterator(chunk_size=500):
+        fields = {
+            'ID': [member.member_id, member.batch],
+            'PRIVATE': [member.student_id or '', member.email.split('@')[0]],
+        }
+        for field, texts in fields.items():
+            for token in {token for text in texts for token in member_tokens(text)}:
+                terms.append(MemberSearchTerm(term=token, document_id=member.pk, field=field))
+
+    MemberSearchTerm.objects.filter(field='ID').delete()
+    MemberSearchTerm.objects.bulk_create(terms, batch_size=2000)
+
+
+def merge_private_terms(apps, schema_editor):
+    MemberSearchTerm = apps.get_model('iuiuapp', 'MemberSearchTerm')
+
+    public = set(MemberSearchTerm.objects.filter(field='ID').values_list('term', 'document_id'))
+    private = MemberSearchTerm.objects.filter(field='PRIVATE')
+    MemberSearchTerm.objects.bulk_create([
+        MemberSearchTerm(term=term, document_id=document_id, field='ID')
+        for term, document_id in private.values_list('term', 'document_id')
+        if (term, document_id) not in public
+    ], batch_size=2000)
+    private.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('iuiuapp', '0019_auditlog_login_lockout'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='membersearchterm',
+            name='field',
+            field=models.CharField(choices=[('NAME', 'Name'), ('ID', 'Identifier'), ('PRIVATE', 'Student ID/Email'), ('WORK', 'Company/Job'), ('COURSE', 'Course')], max_length=10, verbose_name='Field'),
+        ),
+        migrations.RunPython(split_private_terms, merge_private_terms),
+    ]
@@ -1,22 +1,25 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django_ckeditor_5.fields import CKEditor5Field
 from .managers import CustomUserManager
-import random
-import string
-from PIL import Image
+from .images import (
+    loaded_file_name, is_image_changed, enqueue_image_job, discard_renditions, current_renditions,
+    rendition_url,
+)
+from .identifiers import allocate_identifier
+from .slugs import unique_slug
 
 
 def generate_member_id():
-    rand = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-    return f"MEM-{rand}"
+    """Unique member ID from the member_id sequence (no uniqueness check needed)"""
+    return allocate_identifier('member_id')
 
 
 def generate_student_id():
-    rand = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-    return f"IUAA-{rand}"
+    return allocate_identifier('student_id')
 
 
 class Member(models.Model):
@@ -57,11 +60,7 @@ class Member(models.Model):
     
     def save(self, *args, **kwargs):
         if not self.member_id:
-            while True:
-                generated_id = generate_member_id()
-                if not Member.objects.filter(member_id=generated_id).exists():
-                    self.member_id = generated_id
-                    break
+            self.member_id = generate_member_id()
         
         if not self.student_id:
             self.student_id = generate_student_id()
@@ -124,6 +123,14 @@ class Role(models.Model):
     def save(self, *args, **kwargs):
         self.clean()
         super().save(*args, **kwargs)
+    
+    @classmethod
+    def get_default(cls):
+        """Role given to new accounts: the default one, or 'Alumni'"""
+        default_role = cls.objects.filter(is_default=True).first()
+        if default_role:
+            return default_role
+        return cls.objects.get_or_create(name='Alumni')[0]
 
 
 class Campus(models.Model):
@@ -227,6 +234,14 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name="Login Email"
     )
     
+    # Lowercased email, computed by the database; logins look users up by it
+    email_key = models.GeneratedField(
+        expression=Lower('email'),
+        output_field=models.CharField(max_length=254),
+        db_persist=True,
+        verbose_name="Normalized Email"
+    )
+    
     full_name = models.CharField(
         max_length=150,
         verbose_name="Full Name"
@@ -281,6 +296,7 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name_plural = "Users"
         indexes = [
             models.Index(fields=['email']),
+            models.Index(fields=['email_key']),
             models.Index(fields=['member']),
         ]
     
@@ -299,14 +315,17 @@ class User(AbstractBaseUser, PermissionsMixin):
     def get_short_name(self):
         return self.full_name.split()[0] if ' ' in self.full_name else self.full_name
     
+    @property
+    def access(self):
+        """Roles and active committees, loaded once per request (or session)"""
+        from .access import get_access_snapshot
+        return get_access_snapshot(self)
+    
     def has_role(self, role_name):
-        return self.roles.filter(name=role_name).exists()
+        return self.access.has_role(role_name)
     
     def get_default_role(self):
-        default_role = self.roles.filter(is_default=True).first()
-        if not default_role:
-            default_role = self.roles.first()
-        return default_role
+        return self.access.default_role
     
     @property
     def student_id(self):
@@ -319,7 +338,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     
     @property
     def active_committees(self):
-        return self.committee_memberships.filter(is_active=True).select_related('committee')
+        return self.access.memberships
     
     @property
     def is_student(self):
@@ -467,6 +486,120 @@ class CommitteeMembership(models.Model):
         super().save(*args, **kwargs)
 
 
+class MemberStatus(models.Model):
+    """Denormalized leader/committee/regular status, maintained by signals"""
+    STATUS_CHOICES = [
+        ('LEADER', 'Association Leader'),
+        ('COMMITTEE', 'Committee Member'),
+        ('REGULAR', 'Regular Member'),
+    ]
+
+    member = models.OneToOneField(Member, on_delete=models.CASCADE, primary_key=True, related_name='status_index', verbose_name="Member")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='REGULAR', verbose_name="Member Status")
+    is_leader = models.BooleanField(default=False, verbose_name="Association Leader")
+    is_committee_member = models.BooleanField(default=False, verbose_name="Committee Member")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Member Status"
+        verbose_name_plural = "Member Statuses"
+        indexes = [
+            models.Index(fields=['status']),
+        ]
+
+    def __str__(self):
+        return f"{self.member_id} - {self.status}"
+
+    @staticmethod
+    def status_for(is_leader, is_committee_member):
+        if is_leader:
+            return 'LEADER'
+        if is_committee_member:
+            return 'COMMITTEE'
+        return 'REGULAR'
+
+    @classmethod
+    def refresh(cls, member_id):
+        """Recompute the status row for one member from the source tables"""
+        if not Member.objects.filter(pk=member_id).exists():
+            return None
+        
+        is_leader = AssociationLeadership.objects.filter(
+            member_id=member_id,
+            is_active=True
+        ).exists()
+        is_committee_member = CommitteeMembership.objects.filter(
+            user__member_id=member_id,
+            is_active=True
+        ).exists()
+
+        entry, created = cls.objects.update_or_create(
+            member_id=member_id,
+            defaults={
+                'status': cls.status_for(is_leader, is_committee_member),
+                'is_leader': is_leader,
+                'is_committee_member': is_committee_member,
+            }
+        )
+        return entry
+
+    @classmethod
+    def rebuild(cls):
+        """Rebuild the whole index, e.g. after bulk updates that bypass signals"""
+        leader_ids = set(AssociationLeadership.objects.filter(
+            is_active=True
+        ).values_list('member_id', flat=True))
+        committee_ids = set(CommitteeMembership.objects.filter(
+            is_active=True
+        ).values_list('user__member_id', flat=True))
+
+        entries = []
+        for member_id in Member.objects.values_list('id', flat=True).iterator():
+            is_leader = member_id in leader_ids
+            is_committee_member = member_id in committee_ids
+            entries.append(cls(
+                member_id=member_id,
+                status=cls.status_for(is_leader, is_committee_member),
+                is_leader=is_leader,
+                is_committee_member=is_committee_member,
+            ))
+
+        from django.db import transaction
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(entries, batch_size=1000)
+        return len(entries)
+
+
+class IdentifierSequence(models.Model):
+    """Next number of an ID sequence; processes reserve blocks from it"""
+    name = models.CharField(max_length=50, primary_key=True, verbose_name="Sequence")
+    next_value = models.BigIntegerField(default=0, verbose_name="Next Value")
+
+    class Meta:
+        verbose_name = "Identifier Sequence"
+        verbose_name_plural = "Identifier Sequences"
+
+    def __str__(self):
+        return f"{self.name}: {self.next_value}"
+
+
+class SiteStatistic(models.Model):
+    """Dashboard counter, kept current by signals and reconciled periodically"""
+    name = models.CharField(max_length=50, primary_key=True, verbose_name="Counter")
+    value = models.BigIntegerField(default=0, verbose_name="Value")
+    reconciled_at = models.DateTimeField(null=True, blank=True, verbose_name="Last Reconciled")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Site Statistic"
+        verbose_name_plural = "Site Statistics"
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name} = {self.value}"
+
+
 class Profile(models.Model):
     GENDER_CHOICES = [
         ('M', 'Male'),
@@ -479,6 +612,7 @@ class Profile(models.Model):
     campus = models.ForeignKey( Campus, on_delete=models.SET_NULL, null=True, blank=True, related_name='profiles',verbose_name="Campus")
     bio = models.TextField(blank=True, verbose_name="Biography")
     photo = models.ImageField(upload_to='profiles/', blank=True, null=True,verbose_name="Profile Photo")
+    photo_renditions = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Photo Renditions")
     is_public = models.BooleanField( default=True, verbose_name="Public Profile")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -534,39 +668,200 @@ class Profile(models.Model):
             }
         return None
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._original_photo_name = loaded_file_name(self, 'photo')
+    
+    @property
+    def photo_thumbnail_url(self):
+        return self.get_photo_url('thumbnail')
+    
+    @property
+    def photo_card_url(self):
+        return self.get_photo_url('card')
+    
+    @property
+    def photo_card_webp_url(self):
+        return rendition_url(current_renditions(self.photo_renditions, self.photo), 'card', 'webp')
+    
+    @property
+    def photo_full_url(self):
+        return self.get_photo_url('full')
+    
+    def get_photo_url(self, rendition='card', format='jpeg'):
+        """URL of a processed rendition, falling back to the original upload"""
+        if not self.photo:
+            return None
+        renditions = current_renditions(self.photo_renditions, self.photo)
+        return rendition_url(renditions, rendition, format) or self.photo.url
+    
     def save(self, *args, **kwargs):
         is_new = self.pk is None
         
-        # Resize photo if it exists
-        if self.photo:
-            img = Image.open(self.photo)
-            # Resize to 397x556, maintaining aspect ratio
-            img.thumbnail((397, 556), Image.Resampling.LANCZOS)
-            # Create a new image with the exact size, centered
-            new_img = Image.new('RGB', (397, 556), (255, 255, 255))
-            # Calculate position to center the image
-            x = (397 - img.width) // 2
-            y = (556 - img.height) // 2
-            new_img.paste(img, (x, y))
-            # Save the resized image back
-            from io import BytesIO
-            from django.core.files.base import ContentFile
-            buffer = BytesIO()
-            new_img.save(buffer, format='JPEG', quality=85)
-            buffer.seek(0)
-            self.photo.save(self.photo.name, ContentFile(buffer.read()), save=False)
+        # Photos are processed off-request by the image pipeline, only when they change
+        photo_changed = is_image_changed(self.photo, self._original_photo_name)
+        if photo_changed or (self._original_photo_name and not self.photo):
+            # Renditions of the previous photo; the original is shown until the new ones exist
+            discard_renditions(self.photo_renditions)
+            self.photo_renditions = {}
         
         super().save(*args, **kwargs)
         
         if is_new and self.member.is_user:
             user = self.member.user_account
             if not user.roles.exists():
-                default_role = Role.objects.filter(is_default=True).first()
-                if default_role:
-                    user.roles.add(default_role)
-                else:
-                    alumni_role, created = Role.objects.get_or_create(name='Alumni')
-                    user.roles.add(alumni_role)
+                user.roles.add(Role.get_default())
+        
+        if photo_changed:
+            enqueue_image_job('PROFILE_PHOTO', self.pk, self.photo.name)
+        self._original_photo_name = self.photo.name if self.photo else ''
+
+
+class DemographicRollup(models.Model):
+    """Profile count for one combination of demographic dimensions, maintained by signals"""
+    key = models.CharField(max_length=40, unique=True, editable=False)
+    gender = models.CharField(max_length=1, choices=Profile.GENDER_CHOICES, blank=True, verbose_name="Gender")
+    # No constraint: a deleted campus is cleaned up by the next rebuild
+    campus = models.ForeignKey(Campus, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name='+', verbose_name="Campus")
+    batch = models.CharField(max_length=10, blank=True, verbose_name="Batch Year")
+    graduation_year = models.PositiveIntegerField(null=True, blank=True, verbose_name="Graduation Year")
+    course = models.CharField(max_length=100, blank=True, verbose_name="Course")
+    is_active = models.BooleanField(default=True, verbose_name="Active Member")
+    count = models.IntegerField(default=0, verbose_name="Profiles")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Demographic Rollup"
+        verbose_name_plural = "Demographic Rollups"
+        indexes = [
+            models.Index(fields=['gender']),
+            models.Index(fields=['batch']),
+            models.Index(fields=['graduation_year']),
+            models.Index(fields=['course']),
+        ]
+
+    def __str__(self):
+        return f"{self.gender}/{self.campus_id}/{self.batch}/{self.graduation_year}/{self.course}: {self.count}"
+
+
+class ImageJob(models.Model):
+    """Database-backed queue of image processing work, drained by the image pipeline"""
+    KIND_CHOICES = [
+        ('PROFILE_PHOTO', 'Profile Photo'),
+        ('GALLERY_IMAGE', 'Gallery Image'),
+        ('ALBUM_COVER', 'Album Cover'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('PROCESSING', 'Processing'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+    
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES, verbose_name="Job Type")
+    object_id = models.PositiveBigIntegerField(verbose_name="Object ID")
+    source_name = models.CharField(max_length=255, verbose_name="Source File")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING', verbose_name="Status")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Attempts")
+    last_error = models.TextField(blank=True, verbose_name="Last Error")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = "Image Job"
+        verbose_name_plural = "Image Jobs"
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['kind', 'object_id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} #{self.object_id} ({self.status})"
+
+
+class MemberSearchDocument(models.Model):
+    """Denormalized per-member row used for directory search filters and facets"""
+    member = models.OneToOneField(Member, on_delete=models.CASCADE, primary_key=True, related_name='search_document', verbose_name="Member")
+    profile_id = models.BigIntegerField(null=True, blank=True, verbose_name="Profile ID")
+    full_name = models.CharField(max_length=150, verbose_name="Full Name")
+    course = models.CharField(max_length=100, blank=True, verbose_name="Normalized Course")
+    course_key = models.CharField(max_length=100, blank=True, verbose_name="Course Key")
+    batch = models.CharField(max_length=10, blank=True, verbose_name="Batch Year")
+    graduation_year = models.PositiveIntegerField(null=True, blank=True, verbose_name="Graduation Year")
+    campus = models.ForeignKey(Campus, on_delete=models.SET_NULL, null=True, blank=True, related_name='+', verbose_name="Campus")
+    is_public = models.BooleanField(default=False, verbose_name="Public Profile")
+    is_active_member = models.BooleanField(default=True, verbose_name="Active Member")
+    
+    class Meta:
+        ordering = ['full_name']
+        verbose_name = "Member Search Document"
+        verbose_name_plural = "Member Search Documents"
+        indexes = [
+            models.Index(fields=['is_public', 'full_name']),
+            models.Index(fields=['batch']),
+            models.Index(fields=['graduation_year']),
+            models.Index(fields=['course_key']),
+        ]
+    
+    def __str__(self):
+        return self.full_name
+
+
+class MemberSearchTerm(models.Model):
+    """Inverted index of member name, identifier, contact, course and work tokens"""
+    FIELD_CHOICES = [
+        ('NAME', 'Name'),
+        ('ID', 'Identifier'),
+        ('PRIVATE', 'Student ID/Email'),
+        ('WORK', 'Company/Job'),
+        ('COURSE', 'Course'),
+    ]
+    
+    term = models.CharField(max_length=64, verbose_name="Term")
+    document = models.ForeignKey(MemberSearchDocument, on_delete=models.CASCADE, related_name='terms', verbose_name="Document")
+    field = models.CharField(max_length=10, choices=FIELD_CHOICES, verbose_name="Field")
+    
+    class Meta:
+        verbose_name = "Member Search Term"
+        verbose_name_plural = "Member Search Terms"
+        unique_together = ['term', 'document', 'field']
+        indexes = [
+            models.Index(fields=['term', 'field']),
+        ]
+    
+    def __str__(self):
+        return f"{self.term} ({self.field}) -> {self.document_id}"
+
+
+class ClientAgent(models.Model):
+    """Interned User-Agent string referenced by audit rows, with its parsed families"""
+    DEVICE_CHOICES = [
+        ('DESKTOP', 'Desktop'),
+        ('MOBILE', 'Mobile'),
+        ('TABLET', 'Tablet'),
+        ('BOT', 'Bot'),
+        ('UNKNOWN', 'Unknown'),
+    ]
+    
+    hash = models.CharField(max_length=40, unique=True, verbose_name="SHA-1 of User Agent")
+    user_agent = models.TextField(verbose_name="User Agent")
+    browser = models.CharField(max_length=50, verbose_name="Browser")
+    os = models.CharField(max_length=50, verbose_name="Operating System")
+    device = models.CharField(max_length=10, choices=DEVICE_CHOICES, verbose_name="Device")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = "Client Agent"
+        verbose_name_plural = "Client Agents"
+        indexes = [
+            models.Index(fields=['browser', 'os']),
+            models.Index(fields=['device']),
+        ]
+    
+    def __str__(self):
+        return f"{self.browser} on {self.os} ({self.get_device_display()})"
 
 
 class AuditLog(models.Model):
@@ -583,6 +878,7 @@ class AuditLog(models.Model):
         ('COMMITTEE_LEAVE', 'Committee Leave'),
         ('MEMBER_CREATE', 'Member Created'),
         ('USER_CREATE', 'User Account Created'),
+        ('LOGIN_LOCKOUT', 'Login Lockout'),
     ]
     
     user = models.ForeignKey( User,on_delete=models.SET_NULL, null=True, related_name='audit_logs', verbose_name="User")
@@ -590,8 +886,14 @@ class AuditLog(models.Model):
     action = models.CharField( max_length=50, choices=ACTION_CHOICES, verbose_name="Action")
     details = models.JSONField(default=dict, verbose_name="Action Details")
     ip_address = models.GenericIPAddressField( null=True, blank=True, verbose_name="IP Address")
+    # Superseded by agent: left empty since user agents are interned, and
+    # migration 0014 moved the strings of existing rows to client agents
     user_agent = models.TextField(blank=True, verbose_name="User Agent")
-    timestamp = models.DateTimeField(auto_now_add=True, verbose_name="Timestamp")
+    agent = models.ForeignKey(ClientAgent, on_delete=models.PROTECT, null=True, blank=True, related_name='audit_logs', verbose_name="Client")
+    # Set when the event happens, not when the buffered row is written
+    timestamp = models.DateTimeField(default=timezone.now, editable=False, verbose_name="Timestamp")
+    # Month of the timestamp; rows are listed and archived one period at a time
+    period = models.DateField(editable=False, verbose_name="Period")
     
     class Meta:
         ordering = ['-timestamp']
@@ -601,14 +903,50 @@ class AuditLog(models.Model):
             models.Index(fields=['user', 'action']),
             models.Index(fields=['member', 'action']),
             models.Index(fields=['timestamp']),
+            models.Index(fields=['period', 'timestamp']),
         ]
     
+    @staticmethod
+    def period_for(timestamp):
+        return timestamp.date().replace(day=1)
+    
+    @property
+    def user_agent_string(self):
+        return self.agent.user_agent if self.agent_id else self.user_agent
+    
+    def save(self, *args, **kwargs):
+        if not self.period:
+            self.period = self.period_for(self.timestamp)
+        super().save(*args, **kwargs)
+    
     def __str__(self):
         user_id = self.user.member_id if self.user else 'No User'
         member_id = self.member.member_id if self.member else 'No Member'
         return f"{user_id}/{member_id} - {self.action} - {self.timestamp}"
 
 
+class AuditLogArchive(models.Model):
+    """A month of audit log rows moved out of the hot table into a gzipped JSON-lines file"""
+    period = models.DateField(verbose_name="Period")
+    file_name = models.CharField(max_length=255, unique=True, verbose_name="Archive File")
+    row_count = models.PositiveIntegerField(default=0, verbose_name="Rows")
+    size_bytes = models.PositiveBigIntegerField(default=0, verbose_name="Size (bytes)")
+    first_timestamp = models.DateTimeField(null=True, blank=True, verbose_name="First Entry")
+    last_timestamp = models.DateTimeField(null=True, blank=True, verbose_name="Last Entry")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-period', '-created_at']
+        verbose_name = "Audit Log Archive"
+        verbose_name_plural = "Audit Log Archives"
+        indexes = [
+            models.Index(fields=['period']),
+        ]
+    
+    def __str__(self):
+        return f"{self.period:%Y-%m} ({self.row_count} rows)"
+
+
 class Event(models.Model):
     EVENT_TYPES = [
         ('MEETUP', 'Meetup'),
@@ -684,14 +1022,7 @@ class Event(models.Model):
     
     def save(self, *args, **kwargs):
         if not self.slug:
-            from django.utils.text import slugify
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while Event.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+            self.slug = unique_slug(self, self.title)
         super().save(*args, **kwargs)
 
 
@@ -748,6 +1079,7 @@ class GalleryAlbum(models.Model):
     event = models.ForeignKey(Event, on_delete=models.SET_NULL,  null=True, blank=True, related_name='albums',verbose_name="Related Event")
     album_date = models.DateField(default=timezone.now, verbose_name="Album Date")
     cover_image = models.ImageField(upload_to='gallery/covers/',blank=True,null=True,verbose_name="Cover Image")
+    cover_renditions = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Cover Renditions")
     is_active = models.BooleanField(default=True,verbose_name="Active Album")
     is_featured = models.BooleanField(default=False,verbose_name="Featured Album")
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='created_albums',verbose_name="Created By")
@@ -765,34 +1097,47 @@ class GalleryAlbum(models.Model):
             models.Index(fields=['is_featured']),
         ]
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._original_cover_name = loaded_file_name(self, 'cover_image')
+    
     def __str__(self):
         return self.title
     
     def total_images(self):
+        # Listings annotate image_count to avoid a COUNT per album
+        if hasattr(self, 'image_count'):
+            return self.image_count
         return self.images.count()
     total_images.short_description = "Total Images"
     
     def total_videos(self):
+        if hasattr(self, 'video_count'):
+            return self.video_count
         return self.videos.count()
     total_videos.short_description = "Total videos"
     
     def save(self, *args, **kwargs):
         if not self.slug:
-            from django.utils.text import slugify
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while GalleryAlbum.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+            self.slug = unique_slug(self, self.title)
+        
+        cover_changed = is_image_changed(self.cover_image, self._original_cover_name)
+        if cover_changed or not self.cover_image:
+            discard_renditions(self.cover_renditions)
+            self.cover_renditions = {}
+        
         super().save(*args, **kwargs)
+        
+        if cover_changed:
+            enqueue_image_job('ALBUM_COVER', self.pk, self.cover_image.name)
+        self._original_cover_name = self.cover_image.name if self.cover_image else ''
 
 
 class GalleryImage(models.Model):
     album = models.ForeignKey(GalleryAlbum, on_delete=models.CASCADE, related_name='images', verbose_name="Album")
     title = models.CharField(max_length=200, blank=True, verbose_name="Image Title")
     image = models.ImageField(upload_to='gallery/images/', verbose_name="Image File")
+    renditions = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Renditions")
     caption = models.TextField(blank=True, verbose_name="Caption")
     taken_date = models.DateField(null=True, blank=True, verbose_name="Date Taken")
     is_featured = models.BooleanField(default=False, verbose_name="Featured Image")
@@ -808,9 +1153,25 @@ class GalleryImage(models.Model):
             models.Index(fields=['album', 'order']),
         ]
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._original_image_name = loaded_file_name(self, 'image')
+    
     def __str__(self):
         return self.title or f"Image in {self.album.title}"    
     
+    def save(self, *args, **kwargs):
+        image_changed = is_image_changed(self.image, self._original_image_name)
+        if image_changed:
+            discard_renditions(self.renditions)
+            self.renditions = {}
+        
+        super().save(*args, **kwargs)
+        
+        if image_changed:
+            enqueue_image_job('GALLERY_IMAGE', self.pk, self.image.name)
+        self._original_image_name = self.image.name if self.image else ''
+    
 
 class GalleryVideo(models.Model):
     album = models.ForeignKey(GalleryAlbum, on_delete=models.CASCADE, related_name='videos', verbose_name="Album")
@@ -884,8 +1245,7 @@ class BlogCategory(models.Model):
     
     def save(self, *args, **kwargs):
         if not self.slug:
-            from django.utils.text import slugify
-            self.slug = slugify(self.name)
+            self.slug = unique_slug(self, self.name)
         super().save(*args, **kwargs)
 
 
@@ -927,14 +1287,7 @@ class BlogPost(models.Model):
     
     def save(self, *args, **kwargs):
         if not self.slug:
-            from django.utils.text import slugify
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while BlogPost.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+            self.slug = unique_slug(self, self.title)
         
         if self.status == 'PUBLISHED' and not self.published_date:
             self.published_date = timezone.now()
@@ -943,4 +1296,22 @@ class BlogPost(models.Model):
     
     @property
     def is_published(self):
-        return self.status == 'PUBLISHED' and self.published_date
\ No newline at end of file
+        return self.status == 'PUBLISHED' and self.published_date
+
+
+class BlogSearchTerm(models.Model):
+    """Inverted index of blog post tokens, maintained on save by the search module"""
+    term = models.CharField(max_length=64, verbose_name="Term")
+    post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='search_terms', verbose_name="Blog Post")
+    weight = models.PositiveIntegerField(default=1, verbose_name="Weight")
+    
+    class Meta:
+        verbose_name = "Blog Search Term"
+        verbose_name_plural = "Blog Search Terms"
+        unique_together = ['term', 'post']
+        indexes = [
+            models.Index(fields=['term', 'post']),
+        ]
+    
+    def __str__(self):
+        return f"{self.term} -> {self.post_id} ({self.weight})"
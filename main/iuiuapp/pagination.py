@@ -0,0 +1,319 @@
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+CURSOR_SALT = 'iuiuapp.pagination.cursor'
+COUNT_CACHE_TIMEOUT = getattr(settings, 'PAGINATION_COUNT_CACHE_TIMEOUT', 300)
+
+# Above this many rows ApproximateCountPaginator stops counting exactly
+APPROXIMATE_COUNT_THRESHOLD = getattr(settings, 'APPROXIMATE_COUNT_THRESHOLD', 10000)
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def count_cache_key(queryset):
+    sql = str(queryset.order_by().query)
+    return 'pagination:count:' + hashlib.md5(sql.encode()).hexdigest()
+
+
+def encode_cursor(direction, values):
+    return signing.dumps([direction, values], salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(token):
+    try:
+        direction, values = signing.loads(token, salt=CURSOR_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        raise InvalidCursor(token)
+    if direction not in ('next', 'prev'):
+        raise InvalidCursor(token)
+    return direction, values
+
+
+class CursorPage:
+    """
+    One page of a cursor-paginated listing. Quacks enough like a Django
+    Page (iteration, has_next/has_previous, has_other_pages) for templates.
+    """
+
+    def __init__(self, object_list, paginator, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def count(self):
+        return self.paginator.count
+
+
+class CursorPaginator:
+    """
+    Keyset pagination over a queryset ordered by `ordering`, which must end
+    in a unique column (e.g. ('member__full_name', 'id')). Each page is a
+    single indexed range query, so deep pages cost the same as the first.
+
+    Plain lists (already in memory) are paginated by position with the same
+    cursor interface.
+
+    `count` is an approximate total: it is computed once per distinct query
+    and cached for PAGINATION_COUNT_CACHE_TIMEOUT seconds.
+    """
+
+    def __init__(self, object_list, per_page, ordering=('id',)):
+        self.object_list = object_list
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+
+    @property
+    def is_queryset(self):
+        return hasattr(self.object_list, 'query')
+
+    @property
+    def count(self):
+        if not hasattr(self, '_count'):
+            if self.is_queryset:
+                self._count = cache.get_or_set(count_cache_key(self.object_list), self.object_list.count, COUNT_CACHE_TIMEOUT)
+            else:
+                self._count = len(self.object_list)
+        return self._count
+
+    def get_page(self, cursor=None):
+        """Page for a cursor token, falling back to the first page for bad tokens"""
+        direction, values = 'next', None
+        if cursor:
+            try:
+                direction, values = decode_cursor(cursor)
+            except InvalidCursor:
+                pass
+
+        if self.is_queryset:
+            return self._queryset_page(direction, values)
+        return self._list_page(direction, values)
+
+    # ---------------------------
+    # Lists
+    # ---------------------------
+    def _list_page(self, direction, offset):
+        offset = offset if isinstance(offset, int) and offset > 0 else 0
+        if direction == 'prev':
+            offset = max(offset - self.per_page, 0)
+        end = offset + self.per_page
+
+        return CursorPage(
+            self.object_list[offset:end],
+            self,
+            next_cursor=encode_cursor('next', end) if end < len(self.object_list) else None,
+            previous_cursor=encode_cursor('prev', offset) if offset > 0 else None,
+        )
+
+    # ---------------------------
+    # Querysets
+    # ---------------------------
+    def _queryset_page(self, direction, values):
+        queryset = self.object_list
+        fields = [(name.lstrip('-'), name.startswith('-')) for name in self.ordering]
+
+        if values is not None:
+            try:
+                values = self._to_python(fields, values)
+            except (ValidationError, ValueError, TypeError):
+                values = None
+                direction = 'next'
+
+        backwards = direction == 'prev' and values is not None
+        if values is not None:
+            queryset = queryset.filter(self._seek(fields, values, backwards))
+
+        if backwards:
+            queryset = queryset.order_by(*[name if descending else f'-{name}' for name, descending in fields])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+
+        if not rows:
+            return CursorPage(rows, self)
+
+        # Going forward there is a previous page whenever we started from a
+        # cursor, going backward there is always a next page
+        has_next = has_more if not backwards else True
+        has_previous = has_more if backwards else values is not None
+
+        return CursorPage(
+            rows,
+            self,
+            next_cursor=encode_cursor('next', self._key(fields, rows[-1])) if has_next else None,
+            previous_cursor=encode_cursor('prev', self._key(fields, rows[0])) if has_previous else None,
+        )
+
+    def _seek(self, fields, values, backwards):
+        """(a, b) > (x, y) spelled out as a > x OR (a = x AND b > y), per column direction"""
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(fields, values):
+            lookup = 'lt' if descending != backwards else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def _key(self, fields, obj):
+        key = []
+        for name, descending in fields:
+            value = obj
+            for part in name.split(LOOKUP_SEP):
+                value = getattr(value, part)
+            key.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return key
+
+    def _to_python(self, fields, values):
+        if not isinstance(values, list) or len(values) != len(fields):
+            raise ValueError(values)
+        return [self._model_field(name).to_python(value) for (name, _), value in zip(fields, values)]
+
+    def _model_field(self, name):
+        model = self.object_list.model
+        parts = name.split(LOOKUP_SEP)
+        for part in parts[:-1]:
+            model = model._meta.get_field(part).related_model
+        if parts[-1] == 'id':
+            return model._meta.pk
+        return model._meta.get_field(parts[-1])
+
+
+# ---------------------------
+# Approximate counts
+# ---------------------------
+def table_row_estimate(model, using='default'):
+    """Row count of model's table from the database statistics, None where there are none"""
+    connection = connections[using]
+    if connection.vendor == 'mysql':
+        sql = "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+    elif connection.vendor == 'postgresql':
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass"
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [model._meta.db_table])
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+
+
+def planner_row_estimate(queryset):
+    """Rows the query planner expects queryset to return (EXPLAIN), None where unsupported"""
+    connection = connections[queryset.db]
+    if connection.vendor not in ('mysql', 'postgresql'):
+        return None
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            cursor.execute('EXPLAIN FORMAT=JSON ' + sql, params)
+            block = json.loads(cursor.fetchone()[0])['query_block']
+            # The first (driving) table of a join decides the row count
+            table = block['table'] if 'table' in block else block['nested_loop'][0]['table']
+            return int(table['rows_examined_per_scan'] * float(table.get('filtered', 100)) / 100)
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimate_count(queryset):
+    """
+    Cheap estimate of queryset.count(): table statistics when unfiltered,
+    the planner's estimate otherwise. None when the database offers neither.
+    """
+    try:
+        if not queryset.query.where and not queryset.query.distinct:
+            key = f'pagination:estimate:{queryset.model._meta.label_lower}'
+            return cache.get_or_set(key, lambda: table_row_estimate(queryset.model, queryset.db), COUNT_CACHE_TIMEOUT)
+        return planner_row_estimate(queryset)
+    except (DatabaseError, KeyError, IndexError, TypeError, ValueError):
+        logger.warning("Could not estimate the row count of %s", queryset.model._meta.label, exc_info=True)
+        return None
+
+
+def approximate_count(queryset, threshold=None, exact=False):
+    """
+    (count, is_approximate) for queryset. Up to `threshold` rows the count
+    is exact and reads at most threshold + 1 rows; above it, an estimate.
+    Where no estimate is available, or with exact=True, the exact count is
+    computed and cached for PAGINATION_COUNT_CACHE_TIMEOUT seconds, and
+    later calls for the same query reuse it.
+    """
+    threshold = APPROXIMATE_COUNT_THRESHOLD if threshold is None else threshold
+    try:
+        key = count_cache_key(queryset)
+    except EmptyResultSet:
+        return 0, False
+    count = cache.get(key)
+    if count is not None:
+        return count, False
+
+    if not exact:
+        capped = queryset.order_by()[:threshold + 1].count()
+        if capped <= threshold:
+            return capped, False
+        estimate = estimate_count(queryset)
+        if estimate is not None:
+            return max(estimate, capped), True
+
+    count = queryset.count()
+    cache.set(key, count, COUNT_CACHE_TIMEOUT)
+    return count, False
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Paginator for large tables: count comes from approximate_count, so
+    paging through millions of rows never runs an exact COUNT(*) unless
+    asked to (exact=True). is_approximate tells whether it is an estimate.
+    """
+
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True, exact=False):
+        super().__init__(object_list, per_page, orphans=orphans, allow_empty_first_page=allow_empty_first_page)
+        self.exact = exact
+        self.is_approximate = False
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, 'query'):
+            return len(self.object_list)
+        count, self.is_approximate = approximate_count(self.object_list, exact=self.exact)
+        return count
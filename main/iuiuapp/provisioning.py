@@ -0,0 +1,224 @@
+import csv
+import logging
+import multiprocessing
+import os
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+logger = logging.getLogger(__name__)
+
+PROVISIONING_CHUNK_SIZE = getattr(settings, 'PROVISIONING_CHUNK_SIZE', 500)
+# CPUs this process may run on (shared hosts often allow fewer than cpu_count)
+PROVISIONING_WORKERS = getattr(settings, 'PROVISIONING_WORKERS', len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1)
+
+# Base of the activation links written for accounts without a password
+SITE_URL = getattr(settings, 'SITE_URL', 'https://iuiuaa.org')
+
+# Fewer passwords than this are hashed in-process, a pool would cost more to start
+PARALLEL_HASHING_MINIMUM = 8
+
+
+class ProvisioningResult:
+    """Accounts created by a provisioning run, and the members skipped"""
+
+    def __init__(self):
+        self.total = 0
+        # (member, user, password or None, activation url or None)
+        self.accounts = []
+        self.errors = []
+
+    def add_error(self, member, message):
+        self.errors.append((member.email, message))
+
+    @property
+    def created(self):
+        return len(self.accounts)
+
+    def write_csv(self, output):
+        """Credentials to hand out: the password, or the one-time activation link"""
+        writer = csv.writer(output)
+        writer.writerow(['Member ID', 'Full Name', 'Email', 'Password', 'Activation Link'])
+        for member, user, password, activation_url in self.accounts:
+            writer.writerow([member.member_id, user.full_name, user.email, password or '', activation_url or ''])
+
+
+# ---------------------------
+# Hashing
+# ---------------------------
+def hash_chunk(passwords):
+    from django.contrib.auth.hashers import make_password
+    return [make_password(password) for password in passwords]
+
+
+class PasswordHasherPool:
+    """
+    make_password over a process pool, so a cohort's hashes use every core
+    instead of one. The pool is started on first use and kept for the run.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or PROVISIONING_WORKERS
+        self._pool = None
+
+    def hash(self, passwords):
+        if self.workers <= 1 or len(passwords) < PARALLEL_HASHING_MINIMUM:
+            return hash_chunk(passwords)
+        if self._pool is None:
+            # Forked workers inherit the configured settings and only run
+            # the hasher, they never touch the parent's DB connection
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        size = -(-len(passwords) // self.workers)
+        chunks = [passwords[start:start + size] for start in range(0, len(passwords), size)]
+        return [encoded for chunk in self._pool.map(hash_chunk, chunks) for encoded in chunk]
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def generate_password():
+    return secrets.token_urlsafe(9)
+
+
+def activation_url(user, base_url=None):
+    """One-time link to set the first password; it stops working once a password is set"""
+    from django.contrib.auth.tokens import default_token_generator
+    from django.urls import reverse
+    from django.utils.encoding import force_bytes
+    from django.utils.http import urlsafe_base64_encode
+
+    path = reverse('account_activate', args=[
+        urlsafe_base64_encode(force_bytes(user.pk)),
+        default_token_generator.make_token(user),
+    ])
+    return (base_url or SITE_URL).rstrip('/') + path
+
+
+# ---------------------------
+# Inserting
+# ---------------------------
+def build_users(members, passwords, hasher):
+    """Unsaved users for members; passwords maps lowercased emails to raw passwords"""
+    from django.contrib.auth.hashers import make_password
+    from .models import User
+
+    raw = [passwords.get(member.email.lower()) for member in members]
+    to_hash = [password for password in raw if password]
+    encoded = iter(hasher.hash(to_hash)) if to_hash else iter(())
+    users = [
+        User(
+            member=member,
+            email=member.email,
+            full_name=member.full_name,
+            # Accounts without a password are activated through a link
+            password=next(encoded) if password else make_password(None),
+        )
+        for member, password in zip(members, raw)
+    ]
+    return users, raw
+
+
+def insert_batch(members, passwords, hasher, role, result, base_url):
+    """
+    Create the accounts of one batch with bulk_create in one transaction,
+    then bring the counters the save signals maintain up to date. If the
+    batch hits a constraint it is retried row by row.
+    """
+    from .backends import forget_missing_logins
+    from .models import User
+    from .stats import adjust_statistics
+
+    users, raw = build_users(members, passwords, hasher)
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            # MySQL doesn't return the new primary keys from bulk_create
+            ids = dict(User.objects.filter(member__in=members).values_list('member_id', 'pk'))
+            for user in users:
+                user.pk = ids[user.member_id]
+            User.roles.through.objects.bulk_create([
+                User.roles.through(user_id=user.pk, role_id=role.pk) for user in users
+            ])
+            active_members = sum(1 for member in members if member.is_active_member)
+            adjust_statistics(active_users=len(users), members_without_accounts=-active_members)
+    except IntegrityError:
+        logger.warning("Bulk account provisioning batch failed, retrying row by row", exc_info=True)
+        users, raw = insert_rows(users, raw, role, result)
+
+    forget_missing_logins(*(user.email for user in users))
+    for user, password in zip(users, raw):
+        result.accounts.append((user.member, user, password, None if password else activation_url(user, base_url)))
+
+
+def insert_rows(users, raw, role, result):
+    """Slow path: regular saves (signals and all), one savepoint per account"""
+    saved = []
+    for user, password in zip(users, raw):
+        # Undo what the rolled back bulk_create set on the instance
+        user.pk = None
+        user._state.adding = True
+        try:
+            with transaction.atomic():
+                user.save()
+                user.roles.add(role)
+        except IntegrityError as e:
+            result.add_error(user.member, f"could not be saved: {e}")
+        else:
+            saved.append((user, password))
+    return [user for user, password in saved], [password for user, password in saved]
+
+
+def provision_accounts(members, passwords=None, generate_passwords=False, workers=None,
+                       chunk_size=None, base_url=None, progress=None):
+    """
+    Create user accounts for members (a queryset) that have none.
+
+    Passwords come from `passwords` ({email: password}) or are generated
+    with generate_passwords=True, and are hashed across a process pool.
+    Accounts without one get an unusable password and a one-time
+    activation link. Every account gets the default role. progress, if
+    given, is called with (done, total) after each batch.
+    """
+    from .models import Role, User
+
+    chunk_size = chunk_size or PROVISIONING_CHUNK_SIZE
+    passwords = {email.lower(): password for email, password in (passwords or {}).items()}
+    result = ProvisioningResult()
+
+    members = list(members.filter(user_account__isnull=True).order_by('pk'))
+    result.total = len(members)
+    taken = {
+        email.lower() for email in
+        User.objects.filter(email__in=[member.email for member in members]).values_list('email', flat=True)
+    }
+    eligible = []
+    for member in members:
+        if member.email.lower() in taken:
+            result.add_error(member, "another account already uses this email")
+            continue
+        if generate_passwords and member.email.lower() not in passwords:
+            passwords[member.email.lower()] = generate_password()
+        eligible.append(member)
+
+    role = Role.get_default()
+    done = len(members) - len(eligible)
+    with PasswordHasherPool(workers) as hasher:
+        for start in range(0, len(eligible), chunk_size):
+            batch = eligible[start:start + chunk_size]
+            insert_batch(batch, passwords, hasher, role, result, base_url)
+            done += len(batch)
+            if progress:
+                progress(done, result.total)
+    return result
@@ -0,0 +1,411 @@
+import math
+import re
+import unicodedata
+from collections import Counter
+from html import unescape
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, IntegerField, Max, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Length
+from django.utils.html import strip_tags
+
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset("""
+    a an and are as at be but by for from has have in is it its of on or
+    that the this to was were will with we our you your i he she they them
+""".split())
+
+MAX_TERM_LENGTH = 64
+
+# Title hits rank above excerpt hits, which rank above body hits
+BLOG_FIELD_WEIGHTS = {
+    'title': 5,
+    'excerpt': 3,
+    'content': 1,
+}
+
+
+def html_to_text(html):
+    """Plain text of a CKEditor HTML body"""
+    return unescape(strip_tags(html or '')).replace('\xa0', ' ')
+
+
+def tokenize(text):
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in TOKEN_RE.findall((text or '').lower())
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+def blog_post_terms(post):
+    """Weighted term counts for a post across title, excerpt and content"""
+    terms = Counter()
+    texts = {
+        'title': post.title,
+        'excerpt': post.excerpt,
+        'content': html_to_text(post.content),
+    }
+    for field, weight in BLOG_FIELD_WEIGHTS.items():
+        for token in tokenize(texts[field]):
+            terms[token] += weight
+    return terms
+
+
+# Number of posts for IDF; dropped whenever a post is indexed or deleted
+BLOG_POST_TOTAL_KEY = 'search:blog:total'
+
+
+def blog_post_total():
+    from .models import BlogPost
+
+    total = cache.get(BLOG_POST_TOTAL_KEY)
+    if total is None:
+        total = BlogPost.objects.count()
+        cache.set(BLOG_POST_TOTAL_KEY, total, None)
+    return total
+
+
+def forget_blog_post_total():
+    cache.delete(BLOG_POST_TOTAL_KEY)
+
+
+def index_blog_post(post):
+    from .models import BlogSearchTerm
+
+    terms = blog_post_terms(post)
+    with transaction.atomic():
+        BlogSearchTerm.objects.filter(post=post).delete()
+        BlogSearchTerm.objects.bulk_create(
+            [BlogSearchTerm(term=term, post=post, weight=weight) for term, weight in terms.items()],
+            batch_size=1000,
+        )
+    forget_blog_post_total()
+    return len(terms)
+
+
+def rebuild_blog_index():
+    from .models import BlogPost
+
+    total = 0
+    for post in BlogPost.objects.only('id', 'title', 'excerpt', 'content').iterator(chunk_size=200):
+        index_blog_post(post)
+        total += 1
+    return total
+
+
+def search_blog_posts(query, category=None, published_only=True):
+    """
+    Rank posts containing every query term by weighted TF-IDF.
+
+    Returns a values queryset of {'post': id, 'score': float} rows, best
+    match first, suitable for Paginator.
+    """
+    from .models import BlogSearchTerm
+
+    tokens = list(dict.fromkeys(tokenize(query)))
+    if not tokens:
+        return BlogSearchTerm.objects.none()
+
+    total_posts = blog_post_total() or 1
+    document_frequency = dict(
+        BlogSearchTerm.objects.filter(term__in=tokens)
+        .values('term')
+        .annotate(df=Count('post'))
+        .values_list('term', 'df')
+    )
+    if len(document_frequency) < len(tokens):
+        # A term that appears nowhere cannot be matched by every post
+        return BlogSearchTerm.objects.none()
+
+    score = Sum(Case(
+        *[
+            When(term=term, then=F('weight') * Value(math.log(1 + total_posts / df)))
+            for term, df in document_frequency.items()
+        ],
+        output_field=FloatField(),
+    ))
+
+    results = BlogSearchTerm.objects.filter(term__in=tokens)
+    if published_only:
+        results = results.filter(post__status='PUBLISHED')
+    if category:
+        results = results.filter(post__category__slug=category)
+
+    return (
+        results.values('post')
+        .annotate(score=score, matched=Count('term'))
+        .filter(matched=len(tokens))
+        .order_by('-score', '-post__published_date')
+    )
+
+
+# ---------------------------
+# Member directory search
+# ---------------------------
+# Score per matched term: how well it matched times which field it is in
+MEMBER_FIELD_WEIGHTS = {
+    'NAME': 3,
+    'ID': 3,
+    'PRIVATE': 3,
+    'WORK': 2,
+    'COURSE': 1,
+}
+# Terms only admin searches may match (student IDs, email addresses)
+PRIVATE_MEMBER_FIELDS = ('PRIVATE',)
+MEMBER_MATCH_QUALITY = {
+    'exact': 3,
+    'prefix': 2,
+    'fuzzy': 1,
+}
+
+DEGREE_WORDS = frozenset("""
+    bachelor bachelors master masters diploma certificate cert degree hons honours
+    bsc ba bed bcom bba msc ma med mba phd dip of in
+""".split())
+
+
+def fold(text):
+    """Lowercase and strip accents so 'Aïcha' matches 'aicha'"""
+    normalized = unicodedata.normalize('NFKD', text or '')
+    return ''.join(ch for ch in normalized if not unicodedata.combining(ch)).lower()
+
+
+def member_tokens(text):
+    return [token[:MAX_TERM_LENGTH] for token in TOKEN_RE.findall(fold(text))]
+
+
+def normalize_course(course):
+    """'B.Sc. Computer Science' and 'Bachelor of Computer Science' -> 'Computer Science'"""
+    words = member_tokens(fold(course).replace('.', ''))
+    while words and words[0] in DEGREE_WORDS:
+        words.pop(0)
+    return ' '.join(words).title()[:100]
+
+
+def member_document_terms(member):
+    fields = {
+        'NAME': [member.full_name],
+        'ID': [member.member_id, member.batch],
+        'PRIVATE': [member.student_id or '', member.email.split('@')[0]],
+        'WORK': [member.current_company, member.current_job],
+        'COURSE': [normalize_course(member.course)],
+    }
+    terms = set()
+    for field, texts in fields.items():
+        for text in texts:
+            for token in member_tokens(text):
+                terms.add((token, field))
+    return terms
+
+
+def member_document_fields(member, profile):
+    course = normalize_course(member.course)
+    return {
+        'profile_id': profile.id if profile else None,
+        'full_name': member.full_name,
+        'course': course,
+        'course_key': course.lower(),
+        'batch': member.batch or '',
+        'graduation_year': member.graduation_year,
+        'campus_id': profile.campus_id if profile else None,
+        'is_public': bool(profile and profile.is_public),
+        'is_active_member': member.is_active_member,
+    }
+
+
+def index_member(member):
+    """(Re)build the search document and terms for one member"""
+    from .models import MemberSearchDocument, MemberSearchTerm, Profile
+
+    profile = Profile.objects.filter(member=member).only('id', 'campus_id', 'is_public').first()
+
+    with transaction.atomic():
+        document, created = MemberSearchDocument.objects.update_or_create(
+            member=member,
+            defaults=member_document_fields(member, profile)
+        )
+        MemberSearchTerm.objects.filter(document=document).delete()
+        MemberSearchTerm.objects.bulk_create([
+            MemberSearchTerm(term=term, document=document, field=field)
+            for term, field in member_document_terms(member)
+        ])
+    return document
+
+
+def index_new_members(members, profiles=None):
+    """
+    Bulk-create documents and terms for members that have no search
+    document yet (imports skip the per-row save signals)
+    """
+    from .models import MemberSearchDocument, MemberSearchTerm
+
+    profiles = profiles or {}
+    documents, terms = [], []
+    for member in members:
+        documents.append(MemberSearchDocument(member_id=member.pk, **member_document_fields(member, profiles.get(member.pk))))
+        terms.extend(
+            MemberSearchTerm(term=term, document_id=member.pk, field=field)
+            for term, field in member_document_terms(member)
+        )
+    MemberSearchDocument.objects.bulk_create(documents, batch_size=500)
+    MemberSearchTerm.objects.bulk_create(terms, batch_size=2000)
+    return len(documents)
+
+
+def rebuild_member_index():
+    from .models import Member
+
+    total = 0
+    for member in Member.objects.iterator(chunk_size=500):
+        index_member(member)
+        total += 1
+    return total
+
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance, giving up early once every path exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+# Leading characters a fuzzy match must share with the query token
+FUZZY_PREFIX_LENGTH = 2
+
+
+def fuzzy_terms(token):
+    """
+    Indexed terms within a small edit distance of token. Typos are only
+    tolerated after the first FUZZY_PREFIX_LENGTH characters, so the
+    candidates are a narrow index range rather than a whole letter.
+    """
+    from .models import MemberSearchTerm
+
+    if len(token) < 4:
+        return []
+    limit = 1 if len(token) <= 6 else 2
+    candidates = (
+        MemberSearchTerm.objects
+        .filter(term__startswith=token[:FUZZY_PREFIX_LENGTH], field__in=['NAME', 'WORK', 'COURSE'])
+        .annotate(term_length=Length('term'))
+        .filter(term_length__range=(len(token) - limit, len(token) + limit))
+        .values_list('term', flat=True)
+        .distinct()
+    )
+    return [term for term in candidates if term != token and edit_distance(token, term, limit) <= limit]
+
+
+def token_score(token, fuzzy):
+    """Case expression scoring how one query token matched a term row"""
+    conditions = [('exact', Q(term=token)), ('prefix', Q(term__startswith=token))]
+    if fuzzy:
+        matches = fuzzy_terms(token)
+        if matches:
+            conditions.append(('fuzzy', Q(term__in=matches)))
+
+    whens = []
+    for quality, condition in conditions:
+        for field, weight in MEMBER_FIELD_WEIGHTS.items():
+            whens.append(When(condition & Q(field=field), then=Value(MEMBER_MATCH_QUALITY[quality] * weight)))
+    match_any = Q()
+    for quality, condition in conditions:
+        match_any |= condition
+    return Case(*whens, default=Value(0), output_field=IntegerField()), match_any
+
+
+def filter_member_documents(documents, batch=None, campus=None, graduation_year=None, course=None):
+    if batch:
+        documents = documents.filter(batch=batch)
+    if campus:
+        documents = documents.filter(campus_id=campus)
+    if graduation_year:
+        documents = documents.filter(graduation_year=graduation_year)
+    if course:
+        documents = documents.filter(course_key=course.lower())
+    return documents
+
+
+def search_members(query='', public_only=True, fuzzy=True, **filters):
+    """
+    Search the member index with prefix and typo-tolerant matching.
+
+    Every query token must match some term of a member. Returns a queryset
+    of MemberSearchDocument ordered by relevance (name order when there is
+    no query); facet filters are batch, campus, graduation_year and course.
+    With public_only, only public active members are listed and student
+    IDs and email addresses are not searched.
+    """
+    from .models import MemberSearchDocument, MemberSearchTerm
+
+    documents = MemberSearchDocument.objects.all()
+    if public_only:
+        documents = documents.filter(is_public=True, is_active_member=True)
+    documents = filter_member_documents(documents, **filters)
+
+    tokens = list(dict.fromkeys(member_tokens(query)))[:6]
+    if not tokens:
+        return documents.order_by('full_name')
+
+    annotations = {}
+    match_any = Q()
+    for position, token in enumerate(tokens):
+        score, condition = token_score(token, fuzzy)
+        annotations[f'token_{position}'] = Max(score)
+        match_any |= condition
+
+    terms = MemberSearchTerm.objects.all()
+    if public_only:
+        terms = terms.exclude(field__in=PRIVATE_MEMBER_FIELDS)
+    # Documents with a term for every token, found from the term index
+    # so only matching documents are looked at, never the whole table
+    matching = (
+        terms
+        .filter(match_any)
+        .values('document')
+        .annotate(**annotations)
+        .filter(**{f'token_{position}__gt': 0 for position in range(len(tokens))})
+    )
+    score = matching.filter(document=OuterRef('pk')).annotate(score=sum(F(name) for name in annotations))
+    return (
+        documents.filter(pk__in=matching.values('document'))
+        .annotate(score=Subquery(score.values('score')[:1]))
+        .order_by('-score', 'full_name')
+    )
+
+
+def member_facets(documents):
+    """Facet counts (batch, campus, graduation year, course) for a set of documents"""
+    def counts(field, label=None):
+        rows = (
+            documents.order_by()
+            .values(*filter(None, [field, label]))
+            .annotate(count=Count('pk'))
+            .order_by('-count')
+        )
+        return [
+            {'value': row[field], 'label': row[label] if label else row[field], 'count': row['count']}
+            for row in rows if row[field] not in (None, '')
+        ]
+
+    return {
+        'batch': counts('batch'),
+        'campus': counts('campus_id', 'campus__name'),
+        'graduation_year': counts('graduation_year'),
+        'course': counts('course_key', 'course'),
+    }
@@ -0,0 +1,362 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save, pre_delete, m2m_changed
+from django.dispatch import receiver
+from .models import (
+    Member, User, Profile, AssociationLeadership, CommitteeMembership,
+    LeadershipPosition, MemberStatus, BlogPost, Event, Role, Committee, Campus,
+    GalleryAlbum, GalleryImage,
+)
+from .caching import bump_leadership_generation
+from .events import invalidate_event_facets
+from .access import bump_access_generation, reset_access_snapshot
+from .backends import forget_missing_logins
+from .stats import adjust_statistics
+from .images import discard_renditions
+from .demographics import current_cell, move_profile, rebuild_demographics
+from .search import forget_blog_post_total, index_blog_post, index_member
+
+
+def schedule_status_refresh(*member_ids):
+    """Refresh the member status index once the current transaction commits"""
+    for member_id in set(member_ids):
+        if member_id:
+            transaction.on_commit(lambda member_id=member_id: MemberStatus.refresh(member_id))
+
+
+def committee_member_id(user_id):
+    return User.objects.filter(pk=user_id).values_list('member_id', flat=True).first()
+
+
+# ---------------------------
+# Member status index
+# ---------------------------
+@receiver(post_save, sender=Member)
+def create_member_status(sender, instance, created, **kwargs):
+    if created:
+        MemberStatus.objects.get_or_create(member=instance)
+
+
+@receiver(pre_save, sender=AssociationLeadership)
+def remember_previous_leader(sender, instance, **kwargs):
+    # A leadership row can be reassigned to another member from the admin
+    instance._previous_member_id = None
+    instance._previous_active = None
+    if instance.pk:
+        previous = AssociationLeadership.objects.filter(
+            pk=instance.pk
+        ).values_list('member_id', 'is_active').first()
+        if previous:
+            instance._previous_member_id, instance._previous_active = previous
+
+
+@receiver(post_save, sender=AssociationLeadership)
+@receiver(post_delete, sender=AssociationLeadership)
+def refresh_leader_status(sender, instance, **kwargs):
+    schedule_status_refresh(instance.member_id, getattr(instance, '_previous_member_id', None))
+
+
+@receiver(pre_save, sender=CommitteeMembership)
+def remember_previous_committee_user(sender, instance, **kwargs):
+    instance._previous_user_id = None
+    if instance.pk:
+        instance._previous_user_id = CommitteeMembership.objects.filter(
+            pk=instance.pk
+        ).values_list('user_id', flat=True).first()
+
+
+@receiver(post_save, sender=CommitteeMembership)
+@receiver(post_delete, sender=CommitteeMembership)
+def refresh_committee_status(sender, instance, **kwargs):
+    user_ids = {instance.user_id, getattr(instance, '_previous_user_id', None)}
+    schedule_status_refresh(*[committee_member_id(user_id) for user_id in user_ids if user_id])
+
+
+# ---------------------------
+# Leadership page cache
+# ---------------------------
+def schedule_leadership_bump():
+    # Bumping after commit keeps a concurrent request from caching the
+    # pre-commit state under the new generation
+    transaction.on_commit(bump_leadership_generation)
+
+
+def is_listed_leader(member_id):
+    return MemberStatus.objects.filter(
+        member_id=member_id,
+        status__in=['LEADER', 'COMMITTEE']
+    ).exists()
+
+
+@receiver(post_save, sender=AssociationLeadership)
+@receiver(post_delete, sender=AssociationLeadership)
+@receiver(post_save, sender=CommitteeMembership)
+@receiver(post_delete, sender=CommitteeMembership)
+@receiver(post_save, sender=LeadershipPosition)
+@receiver(post_delete, sender=LeadershipPosition)
+def invalidate_leadership_pages(sender, instance, **kwargs):
+    schedule_leadership_bump()
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_leader_profile(sender, instance, **kwargs):
+    if is_listed_leader(instance.member_id):
+        schedule_leadership_bump()
+
+
+@receiver(post_save, sender=Member)
+def invalidate_leader_member(sender, instance, created, **kwargs):
+    # Names and member IDs of leaders are rendered on the leadership pages
+    if not created and is_listed_leader(instance.pk):
+        schedule_leadership_bump()
+
+
+# ---------------------------
+# Blog search index
+# ---------------------------
+@receiver(post_save, sender=BlogPost)
+def reindex_blog_post(sender, instance, update_fields=None, **kwargs):
+    # View count flushes and status-only updates leave the text untouched
+    if update_fields and not {'title', 'excerpt', 'content'} & set(update_fields):
+        return
+    transaction.on_commit(lambda: index_blog_post(instance))
+
+
+@receiver(post_delete, sender=BlogPost)
+def uncount_blog_post(sender, instance, **kwargs):
+    transaction.on_commit(forget_blog_post_total)
+
+
+# ---------------------------
+# Member search index
+# ---------------------------
+@receiver(post_save, sender=Member)
+def reindex_member(sender, instance, **kwargs):
+    transaction.on_commit(lambda: index_member(instance))
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def reindex_member_profile(sender, instance, update_fields=None, **kwargs):
+    # Rendition updates from the image pipeline don't change the document
+    if update_fields and not {'is_public', 'campus'} & set(update_fields):
+        return
+    member_id = instance.member_id
+    transaction.on_commit(lambda: index_member_by_id(member_id))
+
+
+def index_member_by_id(member_id):
+    member = Member.objects.filter(pk=member_id).first()
+    if member:
+        index_member(member)
+
+
+# ---------------------------
+# Event listing facets
+# ---------------------------
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_listing(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_event_facets)
+
+
+# ---------------------------
+# Role and committee snapshots
+# ---------------------------
+@receiver(m2m_changed, sender=User.roles.through)
+def invalidate_user_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        # role.users.add(...) and friends; a clear() has no pk_set
+        if pk_set is None:
+            transaction.on_commit(bump_access_generation)
+        for user_id in pk_set or ():
+            transaction.on_commit(lambda user_id=user_id: bump_access_generation(user_id))
+    else:
+        reset_access_snapshot(instance)
+        transaction.on_commit(lambda: bump_access_generation(instance.pk))
+
+
+@receiver(post_save, sender=CommitteeMembership)
+@receiver(post_delete, sender=CommitteeMembership)
+def invalidate_committee_access(sender, instance, **kwargs):
+    user_ids = {instance.user_id, getattr(instance, '_previous_user_id', None)}
+    for user_id in user_ids:
+        if user_id:
+            transaction.on_commit(lambda user_id=user_id: bump_access_generation(user_id))
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+@receiver(post_save, sender=Committee)
+@receiver(post_delete, sender=Committee)
+def invalidate_all_access(sender, instance, **kwargs):
+    # Names and flags are stored in every snapshot
+    transaction.on_commit(bump_access_generation)
+
+
+# ---------------------------
+# Dashboard counters
+# ---------------------------
+def member_is_active(member_id):
+    return Member.objects.filter(pk=member_id, is_active_member=True).exists()
+
+
+@receiver(pre_save, sender=Member)
+def remember_previous_member_state(sender, instance, **kwargs):
+    instance._previous_active = None
+    if instance.pk:
+        instance._previous_active = Member.objects.filter(
+            pk=instance.pk
+        ).values_list('is_active_member', flat=True).first()
+
+
+@receiver(post_save, sender=Member)
+def count_member(sender, instance, created, **kwargs):
+    if created or instance._previous_active is None:
+        # The account is always created after the member
+        delta = 1 if instance.is_active_member else 0
+        adjust_statistics(active_members=delta, members_without_accounts=delta)
+        return
+    if instance._previous_active == instance.is_active_member:
+        return
+    delta = 1 if instance.is_active_member else -1
+    has_account = User.objects.filter(member_id=instance.pk).exists()
+    adjust_statistics(active_members=delta, members_without_accounts=0 if has_account else delta)
+
+
+@receiver(post_delete, sender=Member)
+def uncount_member(sender, instance, **kwargs):
+    # A linked account is deleted (and counted back) by the cascade first
+    if instance.is_active_member:
+        adjust_statistics(active_members=-1, members_without_accounts=-1)
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_user_state(sender, instance, update_fields=None, **kwargs):
+    instance._previous_state = None
+    if update_fields and not {'is_active', 'member'} & set(update_fields):
+        return
+    if instance.pk:
+        instance._previous_state = User.objects.filter(
+            pk=instance.pk
+        ).values_list('is_active', 'member_id').first()
+
+
+@receiver(post_save, sender=User)
+def count_user(sender, instance, created, update_fields=None, **kwargs):
+    # Logins only touch last_login
+    if update_fields and not {'is_active', 'member'} & set(update_fields):
+        return
+    previous_active, previous_member_id = instance._previous_state or (False, None)
+    without_accounts = 0
+    if previous_member_id != instance.member_id:
+        if previous_member_id and member_is_active(previous_member_id):
+            without_accounts += 1
+        if member_is_active(instance.member_id):
+            without_accounts -= 1
+    adjust_statistics(
+        active_users=int(instance.is_active) - int(previous_active),
+        members_without_accounts=without_accounts,
+    )
+
+
+@receiver(post_delete, sender=User)
+def uncount_user(sender, instance, **kwargs):
+    adjust_statistics(
+        active_users=-1 if instance.is_active else 0,
+        members_without_accounts=1 if member_is_active(instance.member_id) else 0,
+    )
+
+
+@receiver(post_save, sender=AssociationLeadership)
+def count_leadership(sender, instance, created, **kwargs):
+    previous_active = False if created else bool(getattr(instance, '_previous_active', False))
+    adjust_statistics(active_leaders=int(instance.is_active) - int(previous_active))
+
+
+@receiver(post_delete, sender=AssociationLeadership)
+def uncount_leadership(sender, instance, **kwargs):
+    adjust_statistics(active_leaders=-1 if instance.is_active else 0)
+
+
+# ---------------------------
+# Demographic rollups
+# ---------------------------
+DEMOGRAPHIC_PROFILE_FIELDS = {'gender', 'campus', 'member'}
+
+
+@receiver(pre_save, sender=Profile)
+def remember_profile_cell(sender, instance, update_fields=None, **kwargs):
+    instance._previous_cell = None
+    if update_fields and not DEMOGRAPHIC_PROFILE_FIELDS & set(update_fields):
+        instance._skip_rollup = True
+        return
+    instance._skip_rollup = False
+    if instance.pk:
+        instance._previous_cell = current_cell(pk=instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+def count_profile(sender, instance, **kwargs):
+    # Photo rendition updates don't move the profile
+    if instance._skip_rollup:
+        return
+    move_profile(instance._previous_cell, current_cell(pk=instance.pk))
+
+
+@receiver(pre_delete, sender=Profile)
+def remember_deleted_profile_cell(sender, instance, **kwargs):
+    # Runs before a member cascade deletes anything
+    instance._previous_cell = current_cell(pk=instance.pk)
+
+
+@receiver(post_delete, sender=Profile)
+def uncount_profile(sender, instance, **kwargs):
+    move_profile(instance._previous_cell, None)
+
+
+@receiver(pre_save, sender=Member)
+def remember_member_cell(sender, instance, **kwargs):
+    instance._previous_cell = current_cell(member_id=instance.pk) if instance.pk else None
+
+
+@receiver(post_save, sender=Member)
+def count_member_profile(sender, instance, created, **kwargs):
+    # A new member has no profile yet; the profile's own save counts it
+    if not created:
+        move_profile(instance._previous_cell, current_cell(member_id=instance.pk))
+
+
+@receiver(post_delete, sender=Campus)
+def recount_campus_profiles(sender, instance, **kwargs):
+    # Profiles are moved to "no campus" by SET_NULL, which sends no signals
+    transaction.on_commit(rebuild_demographics)
+
+
+# ---------------------------
+# Image renditions
+# ---------------------------
+RENDITION_FIELDS = {
+    Profile: 'photo_renditions',
+    GalleryImage: 'renditions',
+    GalleryAlbum: 'cover_renditions',
+}
+
+
+@receiver(post_delete, sender=Profile)
+@receiver(post_delete, sender=GalleryImage)
+@receiver(post_delete, sender=GalleryAlbum)
+def delete_image_renditions(sender, instance, **kwargs):
+    discard_renditions(getattr(instance, RENDITION_FIELDS[sender]))
+
+
+# ---------------------------
+# Login
+# ---------------------------
+@receiver(post_save, sender=User)
+def forget_missing_login(sender, instance, created, update_fields=None, **kwargs):
+    # The email may be remembered as having no account
+    if created or not update_fields or 'email' in update_fields:
+        forget_missing_logins(instance.email)
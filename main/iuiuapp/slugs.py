@@ -0,0 +1,40 @@
+import re
+
+from django.db.models import Q
+from django.utils.text import slugify
+
+
+def unique_slug(instance, value, field_name='slug'):
+    """
+    Free slug for `value` on instance's model: the slugified value, or
+    value-1, value-2, ... when taken. The slug and every value-... slug
+    are fetched with a single query and the suffix is picked in memory.
+    """
+    model = type(instance)
+    max_length = model._meta.get_field(field_name).max_length
+    base = (slugify(value) or model._meta.model_name)[:max_length].strip('-')
+
+    while True:
+        # The base and base-..., not every slug sharing its first letters
+        # (annual-meetups for annual-meetup, or most of the table for 'a')
+        taken = set(
+            model._default_manager
+            .filter(Q(**{field_name: base}) | Q(**{f'{field_name}__startswith': base + '-'}))
+            .exclude(pk=instance.pk)
+            .values_list(field_name, flat=True)
+        )
+        if base not in taken:
+            return base
+
+        suffix_re = re.compile(rf'^{re.escape(base)}-(\d+)$')
+        used = {int(match.group(1)) for match in map(suffix_re.match, taken) if match}
+        # Lowest free suffix, like the old one-query-per-attempt loop picked
+        suffix = 1
+        while suffix in used:
+            suffix += 1
+
+        slug = f'{base}-{suffix}'
+        if len(slug) <= max_length:
+            return slug
+        # Too long with the suffix: shorten the base and look again
+        base = base[:max_length - len(f'-{suffix}')].strip('-')
@@ -0,0 +1,95 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+STATS_CACHE_KEY = 'stats:counters'
+STATS_CACHE_TIMEOUT = getattr(settings, 'STATS_CACHE_TIMEOUT', 60 * 60)
+
+COUNTER_NAMES = ('active_members', 'active_users', 'active_leaders', 'members_without_accounts')
+
+
+def counter_querysets():
+    """What each dashboard counter counts; reconciliation runs these"""
+    from .models import AssociationLeadership, Member, User
+
+    return {
+        'active_members': Member.objects.filter(is_active_member=True),
+        'active_users': User.objects.filter(is_active=True),
+        'active_leaders': AssociationLeadership.objects.filter(is_active=True),
+        'members_without_accounts': Member.objects.filter(is_active_member=True, user_account__isnull=True),
+    }
+
+
+def get_statistics():
+    """
+    Current counters as a dict. Served from the cache, then from the
+    SiteStatistic table (one small query); counters that were never
+    reconciled are computed on the spot.
+    """
+    stats = cache.get(STATS_CACHE_KEY)
+    if stats is not None:
+        return stats
+
+    from .models import SiteStatistic
+
+    stats = dict(SiteStatistic.objects.values_list('name', 'value'))
+    if any(name not in stats for name in COUNTER_NAMES):
+        stats = reconcile_statistics()[0]
+    cache.set(STATS_CACHE_KEY, stats, STATS_CACHE_TIMEOUT)
+    return stats
+
+
+def invalidate_statistics():
+    cache.delete(STATS_CACHE_KEY)
+
+
+def adjust_statistics(**deltas):
+    """
+    Apply counter deltas (e.g. active_members=1) in the current transaction,
+    so they commit or roll back with the change that caused them.
+    """
+    from .models import SiteStatistic
+
+    changed = False
+    for name, delta in deltas.items():
+        if delta:
+            SiteStatistic.objects.filter(name=name).update(value=F('value') + delta)
+            changed = True
+    if changed:
+        transaction.on_commit(invalidate_statistics)
+
+
+def reconcile_statistics():
+    """
+    Recount every counter from the source tables and store the result.
+    Returns (counters, drift) where drift maps names to stored - actual
+    for counters that were off. Updates that bypass signals, such as
+    queryset.update() and bulk_create(), are corrected here.
+    """
+    from .models import SiteStatistic
+
+    now = timezone.now()
+    drift = {}
+    with transaction.atomic():
+        # Lock the counter rows first so signal deltas committed while we
+        # count are neither lost nor applied twice
+        stored = dict(SiteStatistic.objects.select_for_update().values_list('name', 'value'))
+        counters = {name: queryset.count() for name, queryset in counter_querysets().items()}
+        for name, value in counters.items():
+            if name in stored and stored[name] != value:
+                drift[name] = stored[name] - value
+            SiteStatistic.objects.update_or_create(
+                name=name,
+                defaults={'value': value, 'reconciled_at': now},
+            )
+        transaction.on_commit(invalidate_statistics)
+
+    if drift:
+        logger.warning("Dashboard counters drifted: %s", drift)
+    return counters, drift
@@ -0,0 +1,51 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html
+from ..images import rendition_for_width
+
+register = template.Library()
+
+
+def variant_urls(renditions, format):
+    variants = sorted(
+        (renditions or {}).get('variants', {}).values(),
+        key=lambda variant: variant['width']
+    )
+    return [
+        (default_storage.url(variant[format]), variant['width'])
+        for variant in variants if variant.get(format)
+    ]
+
+
+@register.simple_tag
+def srcset(renditions, format='jpeg'):
+    """`srcset` value listing every stored variant, e.g. "a-320.jpg 320w, a-640.jpg 640w" """
+    return ', '.join(f"{url} {width}w" for url, width in variant_urls(renditions, format))
+
+
+@register.simple_tag
+def rendition_url(renditions, width, fallback=None, format='jpeg'):
+    """URL of the variant best suited to `width` pixels, or the original file while unprocessed"""
+    variant = rendition_for_width(renditions, int(width))
+    if variant and variant.get(format):
+        return default_storage.url(variant[format])
+    return fallback.url if fallback else ''
+
+
+@register.simple_tag
+def responsive_image(field_file, renditions, sizes='100vw', alt='', css_class=''):
+    """<picture> with a WebP source and a JPEG srcset, falling back to the original upload"""
+    if not field_file:
+        return ''
+    jpeg_srcset = srcset(renditions, 'jpeg')
+    if not jpeg_srcset:
+        return format_html('<img src="{}" alt="{}" class="{}" loading="lazy">', field_file.url, alt, css_class)
+
+    fallback = rendition_url(renditions, 640, field_file)
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" loading="lazy">'
+        '</picture>',
+        srcset(renditions, 'webp'), sizes, fallback, jpeg_srcset, sizes, alt, css_class
+    )
@@ -1,3 +1,127 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib import admin
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .admin import MemberAdmin
+from .changelists import QueryBudgetExceeded
+from .models import (
+    AssociationLeadership, AuditLog, AuditLogArchive, BlogCategory, BlogPost, Campus, ClientAgent,
+    Committee, CommitteeMembership, Event, EventRegistration, GalleryAlbum, GalleryImage,
+    GalleryVideo, ImageJob, JobAdvertisement, LeadershipPosition, Member, Profile, Role, User,
+)
+
+ROWS = 100
+
+
+@override_settings(ADMIN_QUERY_BUDGET_STRICT=True)
+class ChangelistQueryBudgetTests(TestCase):
+    """
+    Every admin changelist must stay within its query budget with a full
+    page of rows, so a column that queries per row fails here.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser(email='admin@example.com', password='admin', full_name='Admin')
+
+        campuses = [Campus.objects.create(name=f'Campus {i}') for i in range(5)]
+        roles = [Role.objects.create(name=f'Role {i}') for i in range(5)]
+        committees = [Committee.objects.create(name=f'Committee {i}', slug=f'committee-{i}') for i in range(5)]
+        positions = [
+            LeadershipPosition.objects.create(code=code, order=order)
+            for order, (code, label) in enumerate(LeadershipPosition.POSITION_CHOICES)
+        ]
+
+        members, users = [], []
+        for i in range(ROWS):
+            member = Member.objects.create(full_name=f'Member {i}', email=f'member{i}@example.com', batch=str(2000 + i % 20))
+            Profile.objects.create(member=member, campus=campuses[i % len(campuses)], gender='MF'[i % 2], is_public=True)
+            # Unusable passwords: hashing a hundred real ones would dominate the test
+            user = User.objects.create(member=member, email=member.email, full_name=member.full_name, password=make_password(None))
+            user.roles.add(roles[i % len(roles)])
+            CommitteeMembership.objects.create(user=user, committee=committees[i % len(committees)])
+            members.append(member)
+            users.append(user)
+
+        for i, member in enumerate(members):
+            # One active holder per position, everyone else a past holder
+            AssociationLeadership.objects.create(
+                member=member,
+                position=positions[i % len(positions)],
+                is_active=i < len(positions),
+                start_date=date(2020, 1, 1) + timedelta(days=i),
+            )
+
+        agents = [
+            ClientAgent.objects.create(hash=f'{i:040d}', user_agent=f'Agent {i}', browser='Firefox', os='Linux', device='DESKTOP')
+            for i in range(ROWS)
+        ]
+        now = timezone.now()
+        AuditLog.objects.bulk_create([
+            AuditLog(
+                user=users[i], member=members[i], action='LOGIN', agent=agents[i],
+                timestamp=now - timedelta(minutes=i), period=AuditLog.period_for(now - timedelta(minutes=i)),
+            )
+            for i in range(ROWS)
+        ])
+        AuditLogArchive.objects.bulk_create([
+            AuditLogArchive(period=date(2000 + i // 12, i % 12 + 1, 1), file_name=f'audit-{i}.jsonl.gz')
+            for i in range(ROWS)
+        ])
+
+        events = [
+            Event.objects.create(title=f'Event {i}', description='Reunion', event_date=now + timedelta(days=i), location='Mbale')
+            for i in range(ROWS)
+        ]
+        EventRegistration.objects.bulk_create([
+            EventRegistration(event=events[i % 10], member=member) for i, member in enumerate(members)
+        ])
+
+        albums = [GalleryAlbum.objects.create(title=f'Album {i}') for i in range(ROWS)]
+        for i in range(ROWS):
+            GalleryImage.objects.create(album=albums[i % 10], image=f'gallery/images/{i}.jpg')
+            GalleryVideo.objects.create(album=albums[i % 10], video=f'gallery/videos/{i}.mp4')
+        ImageJob.objects.bulk_create([
+            ImageJob(kind='GALLERY_IMAGE', object_id=i + 1, source_name=f'gallery/images/{i}.jpg', status='DONE')
+            for i in range(ROWS)
+        ])
+
+        JobAdvertisement.objects.bulk_create([
+            JobAdvertisement(
+                title=f'Job {i}', company_name=f'Company {i}', short_description='Apply',
+                application_url=f'https://example.com/jobs/{i}',
+            )
+            for i in range(ROWS)
+        ])
+
+        categories = [BlogCategory.objects.create(name=f'Category {i}') for i in range(ROWS)]
+        for i in range(ROWS):
+            BlogPost.objects.create(
+                title=f'Post {i}', content='<p>News</p>', author=users[i],
+                category=categories[i % 10], status='PUBLISHED',
+            )
+
+    def setUp(self):
+        self.client.force_login(self.admin_user)
+
+    def changelist_urls(self):
+        for model in admin.site._registry:
+            if model._meta.app_label == 'iuiuapp':
+                yield model, reverse(f'admin:iuiuapp_{model._meta.model_name}_changelist')
+
+    def test_changelists_stay_within_query_budget(self):
+        for model, url in self.changelist_urls():
+            with self.subTest(model=model._meta.label):
+                # Raises QueryBudgetExceeded when over budget
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+    def test_budget_overrun_fails(self):
+        with mock.patch.object(MemberAdmin, 'changelist_query_budget', 1):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(reverse('admin:iuiuapp_member_changelist'))
@@ -0,0 +1,196 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .backends import normalize_login_email
+
+# Failures are counted over a sliding window of this many seconds
+LOGIN_THROTTLE_WINDOW = getattr(settings, 'LOGIN_THROTTLE_WINDOW', 15 * 60)
+# Failures within the window that lock an email, or an IP address, out
+LOGIN_THROTTLE_EMAIL_LIMIT = getattr(settings, 'LOGIN_THROTTLE_EMAIL_LIMIT', 10)
+LOGIN_THROTTLE_IP_LIMIT = getattr(settings, 'LOGIN_THROTTLE_IP_LIMIT', 50)
+# Failures allowed without any delay; each further one doubles the delay
+LOGIN_THROTTLE_FREE_ATTEMPTS = getattr(settings, 'LOGIN_THROTTLE_FREE_ATTEMPTS', 3)
+LOGIN_THROTTLE_DELAY = getattr(settings, 'LOGIN_THROTTLE_DELAY', 1)
+LOGIN_THROTTLE_MAX_DELAY = getattr(settings, 'LOGIN_THROTTLE_MAX_DELAY', 60)
+# First lockout; every further lockout within a day lasts twice as long
+LOGIN_THROTTLE_LOCKOUT = getattr(settings, 'LOGIN_THROTTLE_LOCKOUT', 15 * 60)
+LOGIN_THROTTLE_MAX_LOCKOUT = 24 * 60 * 60
+
+# Cache alias shared by all workers (e.g. a file-based cache), or None to
+# keep the counters in each process
+LOGIN_THROTTLE_CACHE = getattr(settings, 'LOGIN_THROTTLE_CACHE', None)
+
+
+# ---------------------------
+# Stores
+# ---------------------------
+class LocalStore:
+    """Counters in this process only, with expiry; nothing touches the database or disk"""
+    max_entries = 10000
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key, now):
+        value, expires = self._data.get(key, (None, 0))
+        if expires <= now:
+            self._data.pop(key, None)
+            return None
+        return value
+
+    def get(self, key):
+        with self._lock:
+            return self._get(key, time.time())
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            now = time.time()
+            if len(self._data) >= self.max_entries:
+                self._prune(now)
+            self._data[key] = (value, now + timeout)
+
+    def incr(self, key, timeout):
+        """Add one to a counter, which expires `timeout` seconds after it was created"""
+        with self._lock:
+            now = time.time()
+            value = self._get(key, now)
+            if value is None:
+                if len(self._data) >= self.max_entries:
+                    self._prune(now)
+                self._data[key] = (1, now + timeout)
+                return 1
+            self._data[key] = (value + 1, self._data[key][1])
+            return value + 1
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def _prune(self, now):
+        self._data = {key: entry for key, entry in self._data.items() if entry[1] > now}
+        if len(self._data) >= self.max_entries:
+            # Under a flood of distinct keys, forget everything rather than grow
+            self._data.clear()
+
+
+class CacheStore:
+    """Counters in a Django cache, shared by every worker using it"""
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value, timeout):
+        self.cache.set(key, value, timeout)
+
+    def incr(self, key, timeout):
+        self.cache.add(key, 0, timeout)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr()
+            self.cache.set(key, 1, timeout)
+            return 1
+
+    def delete_many(self, keys):
+        self.cache.delete_many(keys)
+
+
+_local_store = LocalStore()
+
+
+def get_store():
+    if LOGIN_THROTTLE_CACHE:
+        return CacheStore(LOGIN_THROTTLE_CACHE)
+    return _local_store
+
+
+# ---------------------------
+# Counting
+# ---------------------------
+def throttle_keys(request, email):
+    """(scope, identifier, limit, key prefix) for the email and the client address"""
+    targets = [('email', normalize_login_email(email), LOGIN_THROTTLE_EMAIL_LIMIT)]
+    if request is not None:
+        targets.append(('ip', request.META.get('REMOTE_ADDR') or '', LOGIN_THROTTLE_IP_LIMIT))
+    return [
+        (scope, identifier, limit, f'login:{scope}:' + hashlib.md5(identifier.encode()).hexdigest())
+        for scope, identifier, limit in targets
+        if identifier
+    ]
+
+
+def sliding_count(store, prefix, now, add=False):
+    """
+    Failures over the last LOGIN_THROTTLE_WINDOW seconds, from two fixed
+    window counters: the current one plus the previous one weighted by how
+    much of it still overlaps the sliding window.
+    """
+    index = int(now // LOGIN_THROTTLE_WINDOW)
+    key = f'{prefix}:{index}'
+    if add:
+        current = store.incr(key, 2 * LOGIN_THROTTLE_WINDOW)
+    else:
+        current = store.get(key) or 0
+    previous = store.get(f'{prefix}:{index - 1}') or 0
+    overlap = 1 - (now % LOGIN_THROTTLE_WINDOW) / LOGIN_THROTTLE_WINDOW
+    return int(current + previous * overlap)
+
+
+def login_retry_after(request, email):
+    """Seconds before another login attempt for email from this client is accepted, 0 if now"""
+    store = get_store()
+    now = time.time()
+    wait = 0
+    for scope, identifier, limit, prefix in throttle_keys(request, email):
+        wait = max(wait, (store.get(f'{prefix}:until') or 0) - now)
+    return math.ceil(wait) if wait > 0 else 0
+
+
+def record_login_failure(request, email):
+    """
+    Count a failed login against the email and the client address. Past
+    LOGIN_THROTTLE_FREE_ATTEMPTS each failure delays the next attempt,
+    at the limit the email or address is locked out and one summary row
+    is written to the audit log.
+    """
+    from .audit import log_event
+
+    store = get_store()
+    now = time.time()
+    for scope, identifier, limit, prefix in throttle_keys(request, email):
+        failures = sliding_count(store, prefix, now, add=True)
+        if failures >= limit:
+            lockouts = store.incr(f'{prefix}:lockouts', LOGIN_THROTTLE_MAX_LOCKOUT)
+            duration = min(LOGIN_THROTTLE_LOCKOUT * 2 ** min(lockouts - 1, 16), LOGIN_THROTTLE_MAX_LOCKOUT)
+            store.set(f'{prefix}:until', now + duration, duration)
+            log_event('LOGIN_LOCKOUT', details={
+                'scope': scope,
+                'identifier': identifier,
+                'failures': failures,
+                'window_seconds': LOGIN_THROTTLE_WINDOW,
+                'locked_seconds': duration,
+                'lockouts_today': lockouts,
+            }, request=request)
+        elif failures > LOGIN_THROTTLE_FREE_ATTEMPTS:
+            exponent = min(failures - LOGIN_THROTTLE_FREE_ATTEMPTS - 1, 16)
+            delay = min(LOGIN_THROTTLE_DELAY * 2 ** exponent, LOGIN_THROTTLE_MAX_DELAY)
+            store.set(f'{prefix}:until', now + delay, delay)
+
+
+def record_login_success(request, email):
+    """Clear the email's failures; the address keeps its count, or logging into
+    an attacker's own account would reset it"""
+    store = get_store()
+    index = int(time.time() // LOGIN_THROTTLE_WINDOW)
+    for scope, identifier, limit, prefix in throttle_keys(None, email):
+        store.delete_many([f'{prefix}:until', f'{prefix}:{index}', f'{prefix}:{index - 1}'])
@@ -1,12 +1,16 @@
 from atexit import register
 from os import name
-from django.urls import path
+from django.contrib.auth import views as auth_views
+from django.urls import path, reverse_lazy
 from . import views
 
 urlpatterns = [
     path('register/', views.register, name='register'),
     path('login/', views.LoginView.as_view(), name='login'),
     path('logout/', views.LogoutView.as_view(), name='logout'),
+    # Provisioned accounts set their first password through a one-time link
+    path('activate/done/', auth_views.PasswordResetCompleteView.as_view(), name='account_activated'),
+    path('activate/<uidb64>/<token>/', auth_views.PasswordResetConfirmView.as_view(success_url=reverse_lazy('account_activated')), name='account_activate'),
 
     path('', views.index, name='home'),
     path('about/', views.about, name='about'),
@@ -19,6 +23,7 @@ urlpatterns = [
     path('directory/', views.event, name = 'directory'),
     path('career/', views.career, name='career'),
     path('blog/', views.blog_list, name='blog_list'),
+    path('blog/search/', views.blog_search, name='blog_search'),
     path('blog/<slug:slug>/', views.blogsingle, name='blog_single'),
     # path('blog-single-nosidebar/', views.blogsingle_nosidebar, name='blog-single-nosidebar'),
     # path('blog-left/', views.blogsingle_leftsidebar, name='blog-single-leftsidebar'),
@@ -29,6 +34,7 @@ urlpatterns = [
     # path('committee/', views.committee, name='committee'),
 
     path('members/', views.regular_members_view, name='members'),
+    path('members/search/', views.member_search, name='member_search'),
 
 
     # path('members/', views.MemberListView.as_view(), name='members_list'),    
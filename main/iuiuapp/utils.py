@@ -1,7 +1,6 @@
 # accounts/utils.py
 import random
 import string
-from django.db.models import Count
 from .models import Profile
 from django.utils import timezone
 from .models import *
@@ -81,28 +80,9 @@ def demote_leader(user, position_code=None):
 
 
 def get_gender_statistics():
-    """Get statistics about gender distribution"""
-    stats = Profile.objects.values('gender').annotate(
-        count=Count('gender')
-    ).order_by('-count')
-    
-    # Convert to more readable format
-    total = sum(item['count'] for item in stats)
-    result = {
-        'total': total,
-        'breakdown': []
-    }
-    
-    gender_map = dict(Profile.GENDER_CHOICES)
-    for item in stats:
-        result['breakdown'].append({
-            'gender_code': item['gender'],
-            'gender_name': gender_map.get(item['gender'], 'Unknown'),
-            'count': item['count'],
-            'percentage': round((item['count'] / total * 100), 2) if total > 0 else 0
-        })
-    
-    return result
+    """Get statistics about gender distribution (from the demographic rollups)"""
+    from .demographics import gender_statistics
+    return gender_statistics()
 
 # Example usage in a view:
 # def gender_dashboard(request):
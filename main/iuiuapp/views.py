@@ -8,11 +8,20 @@ from django.views import View
 from .models import *
 from django.utils import timezone
 from django.core.paginator import *
-from django.db.models import Q
+from django.db.models import Q, Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from django.views.generic import DetailView
 from django.views.generic.list import ListView
 from django.db import transaction
 from .forms import *
+from .caching import cache_leadership_page, get_or_build_leadership_data
+from .counters import blog_views, record_blog_view
+from .search import search_blog_posts, search_members, member_facets
+from .pagination import CursorPaginator
+from .events import event_listing
+from .audit import log_event
+from .stats import get_statistics
+from .throttling import login_retry_after
 from django.http import JsonResponse
 
 
@@ -37,16 +46,15 @@ def register(request):
                     profile.member = member
                     profile.save()
                     
-                    AuditLog.objects.create(
+                    log_event(
+                        'MEMBER_CREATE',
                         member=member,
-                        action='MEMBER_CREATE',
                         details={
                             'email': member.email,
                             'full_name': member.full_name,
                             'batch': member.batch,
                         },
-                        ip_address=request.META.get('REMOTE_ADDR'),
-                        user_agent=request.META.get('HTTP_USER_AGENT', '')
+                        request=request,
                     )
                 
                 messages.success(request, 'Registration successful! You are now a member.')
@@ -84,6 +92,14 @@ class LoginView(View):
             messages.error(request, 'Please provide both email and password.')
             return render(request, 'login.html')
         
+        retry_after = login_retry_after(request, email)
+        if retry_after:
+            wait = f'{retry_after} seconds' if retry_after < 120 else f'{-(-retry_after // 60)} minutes'
+            messages.error(request, f'Too many failed login attempts. Please try again in {wait}.')
+            response = render(request, 'login.html', status=429)
+            response['Retry-After'] = str(retry_after)
+            return response
+        
         user = authenticate(request, email=email, password=password)
         
         if user is not None:
@@ -96,16 +112,15 @@ class LoginView(View):
                     request.session.set_expiry(0)
                 
                 if hasattr(user, 'member'):
-                    AuditLog.objects.create(
+                    log_event(
+                        'LOGIN',
                         user=user,
                         member=user.member,
-                        action='LOGIN',
                         details={
                             'source': 'manual_login',
                             'method': 'email_password',
                         },
-                        ip_address=request.META.get('REMOTE_ADDR'),
-                        user_agent=request.META.get('HTTP_USER_AGENT', '')
+                        request=request,
                     )
                 
                 messages.success(request, f'Welcome back, {user.full_name}!')
@@ -122,13 +137,12 @@ class LoginView(View):
 class LogoutView(View):
     def get(self, request):
         if request.user.is_authenticated and hasattr(request.user, 'member'):
-            AuditLog.objects.create(
+            log_event(
+                'LOGOUT',
                 user=request.user,
                 member=request.user.member,
-                action='LOGOUT',
                 details={'source': 'manual_logout'},
-                ip_address=request.META.get('REMOTE_ADDR'),
-                user_agent=request.META.get('HTTP_USER_AGENT', '')
+                request=request,
             )
         
         logout(request)
@@ -171,11 +185,8 @@ class ProfileDetailView(DetailView):
         return context
 
 
-def association_heads_view(request):
-    """
-    View for displaying ONLY association heads (leaders)
-    Excludes regular members and committee members
-    """
+def active_leaders_with_profiles():
+    """Active association leaders with their public profiles, in position order"""
     # FIXED: Changed from 'user__member__profile' to 'member' and 'member__profile'
     active_leadership = AssociationLeadership.objects.filter(
         is_active=True
@@ -193,12 +204,26 @@ def association_heads_view(request):
         
         leaders_with_profiles.append({
             'leader': leader,
-            'profile': profile
+            'profile': profile,
+            'full_name': leader.member.full_name,
+            'position': leader.position.display_title,
+            'photo': profile.photo if profile else None,
+            'bio': profile.bio if profile else None,
         })
     
-    paginator = Paginator(leaders_with_profiles, 8)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    return leaders_with_profiles
+
+
+@cache_leadership_page
+def association_heads_view(request):
+    """
+    View for displaying ONLY association heads (leaders)
+    Excludes regular members and committee members
+    """
+    leaders_with_profiles = get_or_build_leadership_data('leaders', active_leaders_with_profiles)
+    
+    paginator = CursorPaginator(leaders_with_profiles, 8)
+    page_obj = paginator.get_page(request.GET.get('cursor'))
     
     context = {
         'page_obj': page_obj,
@@ -222,13 +247,36 @@ def blog_list(request):
     return render(request, 'blog.html', context)
 
 
+def blog_search(request):
+    query = request.GET.get('q', '').strip()
+    category = request.GET.get('category', '')
+    
+    results = search_blog_posts(query, category=category or None)
+    paginator = Paginator(results, 10)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    
+    # Fetch the posts for this page only, keeping the ranking order
+    post_ids = [row['post'] for row in page_obj]
+    posts_by_id = BlogPost.objects.select_related('author__member', 'category').in_bulk(post_ids)
+    posts = [posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id]
+    
+    context = {
+        'posts': posts,
+        'page_obj': page_obj,
+        'categories': BlogCategory.objects.filter(is_active=True),
+        'search_query': query,
+        'search_category': category,
+    }
+    return render(request, 'blog.html', context)
+
+
 def blogsingle(request, slug):
     # Get single blog post by slug
     post = get_object_or_404(BlogPost, slug=slug, status='PUBLISHED')
     
-    # Increment view count
-    post.views_count += 1
-    post.save(update_fields=['views_count'])
+    # Buffered view count, flushed to the database in the background
+    record_blog_view(request, post)
+    post.views_count += blog_views.pending(post.pk)
     
     # Get categories for sidebar
     categories = BlogCategory.objects.filter(is_active=True)
@@ -240,7 +288,8 @@ def blogsingle(request, slug):
     return render(request, 'single-blog.html', context)
 
 
-def committee_heads_view(request):
+def active_committee_heads():
+    """Chairs, coordinators and leads of active committees, one entry per user"""
     # FIXED: Changed from 'user__member__profile' to 'user' and 'user__member__profile'
     committee_heads = CommitteeMembership.objects.filter(
         Q(role__icontains='chair') | 
@@ -264,13 +313,20 @@ def committee_heads_view(request):
     
     # FIXED: Get members from user.member
     head_members = [head.user.member for head in unique_committee_heads if hasattr(head.user, 'member')]
-    profiles = Profile.objects.filter(
+    profiles = list(Profile.objects.filter(
         member__in=head_members,
         is_public=True
-    ).select_related('member', 'campus')
+    ).select_related('member', 'campus'))
+    
+    return unique_committee_heads, profiles
+
+
+@cache_leadership_page
+def committee_heads_view(request):
+    committee_heads, profiles = get_or_build_leadership_data('committee_heads', active_committee_heads)
     
     context = {
-        'committee_heads': unique_committee_heads,
+        'committee_heads': committee_heads,
         'profiles': profiles,
         'page_title': 'Committee Leadership',
     }
@@ -279,44 +335,20 @@ def committee_heads_view(request):
 
 
 def regular_members_view(request):
-    # FIXED: Get association leader member IDs directly from AssociationLeadership
-    association_leader_member_ids = AssociationLeadership.objects.filter(
-        is_active=True
-    ).values_list('member_id', flat=True)  # Changed from 'user_id' to 'member_id'
-    
-    # FIXED: Get committee member user IDs, then get their member IDs
-    active_committee_user_ids = CommitteeMembership.objects.filter(
-        is_active=True
-    ).values_list('user_id', flat=True).distinct()
-    
-    # Get member IDs from committee members
-    committee_member_ids = []
-    for user_id in active_committee_user_ids:
-        try:
-            user = User.objects.get(id=user_id)
-            if hasattr(user, 'member'):
-                committee_member_ids.append(user.member.id)
-        except User.DoesNotExist:
-            pass
-    
-    # Combine excluded member IDs
-    excluded_member_ids = set(list(association_leader_member_ids) + committee_member_ids)
-    
-    # Get public profiles excluding leaders and committee members
+    # Leaders and committee members are resolved through the member status index
     profiles_list = Profile.objects.filter(
         is_public=True
     ).exclude(
-        member_id__in=excluded_member_ids
-    ).select_related('member', 'campus').order_by('member__full_name')
+        member__status_index__status__in=['LEADER', 'COMMITTEE']
+    ).select_related('member', 'campus')
     
-    paginator = Paginator(profiles_list, 8)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    paginator = CursorPaginator(profiles_list, 8, ordering=('member__full_name', 'id'))
+    page_obj = paginator.get_page(request.GET.get('cursor'))
     
     context = {
         'page_obj': page_obj,
         'page_title': 'Our Members',
-        'total_members': profiles_list.count(),
+        'total_members': paginator.count,
     }
     
     return render(request, 'members.html', context)
@@ -325,7 +357,7 @@ def regular_members_view(request):
 def all_members_directory_view(request):
     profiles_list = Profile.objects.filter(
         is_public=True
-    ).select_related('member', 'campus').order_by('member__full_name')
+    ).select_related('member', 'member__status_index', 'campus')
     
     batch_filter = request.GET.get('batch')
     campus_filter = request.GET.get('campus')
@@ -335,29 +367,14 @@ def all_members_directory_view(request):
     if campus_filter:
         profiles_list = profiles_list.filter(campus_id=campus_filter)
     
-    # Pre-fetch leader and committee status for efficiency
-    leader_member_ids = set(AssociationLeadership.objects.filter(
-        is_active=True
-    ).values_list('member_id', flat=True))
-    
-    committee_member_ids = set()
-    for user_id in CommitteeMembership.objects.filter(
-        is_active=True
-    ).values_list('user_id', flat=True).distinct():
-        try:
-            user = User.objects.get(id=user_id)
-            if hasattr(user, 'member'):
-                committee_member_ids.add(user.member.id)
-        except User.DoesNotExist:
-            pass
-    
-    for profile in profiles_list:
-        profile.is_leader = profile.member.id in leader_member_ids
-        profile.is_committee_member = profile.member.id in committee_member_ids
+    paginator = CursorPaginator(profiles_list, 12, ordering=('member__full_name', 'id'))
+    page_obj = paginator.get_page(request.GET.get('cursor'))
     
-    paginator = Paginator(profiles_list, 12)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Badges come from the member status index joined in select_related
+    for profile in page_obj:
+        status = getattr(profile.member, 'status_index', None)
+        profile.is_leader = status.is_leader if status else False
+        profile.is_committee_member = status.is_committee_member if status else False
     
     batches = Member.objects.values_list('batch', flat=True).distinct().order_by('-batch')
     campuses = Campus.objects.filter(is_active=True)
@@ -372,6 +389,54 @@ def all_members_directory_view(request):
     return render(request, 'members_committee.html', context)
 
 
+def member_search(request):
+    """JSON type-ahead over the member search index (public profiles only)"""
+    query = request.GET.get('q', '').strip()
+    filters = {
+        'batch': request.GET.get('batch'),
+        'campus': request.GET.get('campus'),
+        'graduation_year': request.GET.get('graduation_year'),
+        'course': request.GET.get('course'),
+    }
+    if filters['campus'] and not filters['campus'].isdigit():
+        filters['campus'] = None
+    if filters['graduation_year'] and not filters['graduation_year'].isdigit():
+        filters['graduation_year'] = None
+    
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 50)
+    except ValueError:
+        limit = 10
+    
+    documents = search_members(query, **filters)
+    matches = list(documents.select_related('campus')[:limit])
+    
+    # Thumbnails need the profile photo renditions
+    profiles = Profile.objects.only('id', 'photo', 'photo_renditions').in_bulk(
+        [document.profile_id for document in matches if document.profile_id]
+    )
+    
+    results = []
+    for document in matches:
+        profile = profiles.get(document.profile_id)
+        results.append({
+            'id': document.profile_id,
+            'full_name': document.full_name,
+            'course': document.course,
+            'batch': document.batch,
+            'graduation_year': document.graduation_year,
+            'campus': document.campus.name if document.campus else None,
+            'photo': profile.photo_thumbnail_url if profile else None,
+            'url': reverse('profile_detail', args=[document.profile_id]) if document.profile_id else None,
+        })
+    
+    data = {'query': query, 'results': results}
+    if request.GET.get('facets'):
+        data['total'] = documents.count()
+        data['facets'] = member_facets(documents)
+    return JsonResponse(data)
+
+
 def index(request):
     jobs = JobAdvertisement.objects.filter(is_active=True).order_by('-display_order', '-posted_date')[:6]
     
@@ -395,143 +460,42 @@ def index(request):
     return render(request, 'index.html', context)
 
 
+@cache_leadership_page
 def about(request):
-    active_leadership = AssociationLeadership.objects.filter(
-        is_active=True
-    ).select_related(
-        'member',
-        'member__profile',
-        'position'
-    ).order_by('position__order')
-    
-    # Create a list of tuples with leader and profile
-    leaders_with_profiles = []
-    for leader in active_leadership:
-        # Get the profile for this leader's member
-        profile = leader.member.profile if hasattr(leader.member, 'profile') and leader.member.profile.is_public else None
-        
-        leaders_with_profiles.append({
-            'leader': leader,
-            'profile': profile,
-            'full_name': leader.member.full_name,
-            'position': leader.position.display_title,
-            'photo': leader.member.profile.photo if profile else None,
-            'bio': leader.member.profile.bio if profile else None,
-        })
-    
     context = {
-        'leaders_with_profiles': leaders_with_profiles,
+        'leaders_with_profiles': get_or_build_leadership_data('leaders', active_leaders_with_profiles),
         'page_title': 'Association Leadership',
     }
     return render(request, 'about.html', context)
 
 
 def event(request):
-    # -----------------------------
-    # GET FILTER PARAMS & ACTIVE TAB
-    # -----------------------------
-    year = request.GET.get('year')
-    place = request.GET.get('place')
-    event_type = request.GET.get('type')
-    status = request.GET.get('status')
     active_tab = request.GET.get('tab', 'active')
+    if active_tab not in ('active', 'inactive'):
+        active_tab = 'active'
     
-    # -----------------------------
-    # BASE QUERYSETS FOR BOTH TABS
-    # -----------------------------
-    # Get all events first
-    all_events = Event.objects.all()
-    
-    # Apply filters function
-    def apply_filters(queryset):
-        qs = queryset
-        
-        # YEAR FILTER
-        if year and year != 'Year':
-            try:
-                qs = qs.filter(event_date__year=int(year))
-            except ValueError:
-                pass
-        
-        # PLACE FILTER
-        if place and place != 'Place':
-            qs = qs.filter(location__icontains=place)
-        
-        # EVENT TYPE FILTER
-        if event_type and event_type != 'Type':
-            event_type_map = {
-                'Meetup': 'MEETUP',
-                'Seminar': 'SEMINAR',
-                'Get Together': 'GET_TOGETHER',
-                'Workshop': 'WORKSHOP',
-                'Conference': 'CONFERENCE',
-                'Other': 'OTHER',
-            }
-            db_event_type = event_type_map.get(event_type)
-            if db_event_type:
-                qs = qs.filter(event_type=db_event_type)
-        
-        # STATUS FILTER (only if not "All")
-        if status and status != 'Status' and status != 'All':
-            if status == 'Active':
-                qs = qs.filter(is_active=True)
-            elif status == 'Inactive':
-                qs = qs.filter(is_active=False)
-        
-        return qs.order_by('-event_date')
-    
-    # Get filtered active and inactive events
-    active_events_qs = apply_filters(all_events.filter(is_active=True))
-    inactive_events_qs = apply_filters(all_events.filter(is_active=False))
+    # Both tabs are rendered (tab switching is front-end only), but only
+    # their current pages are queried; counts and filter options come from
+    # the cached facets
+    listing = event_listing(request.GET, active_tab)
+    facets = listing['facets']
+    filters = listing['filters']
     
-    # Determine which tab is active and paginate accordingly
-    if active_tab == 'active':
-        # Paginate active events
-        paginator = Paginator(active_events_qs, 3)
-    else:
-        # Paginate inactive events  
-        paginator = Paginator(inactive_events_qs, 3)
-    
-    page_number = request.GET.get('page', 1)
-    
-    try:
-        page_obj = paginator.page(page_number)
-    except PageNotAnInteger:
-        page_obj = paginator.page(1)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
-    
-    # -----------------------------
-    # FILTER DATA
-    # -----------------------------
-    all_years = Event.objects.dates('event_date', 'year', order='DESC')
-    years_list = [y.year for y in all_years]
-    
-    locations = (
-        Event.objects
-        .exclude(location__isnull=True)
-        .exclude(location__exact='')
-        .values_list('location', flat=True)
-        .distinct()
-    )
-    
-    # -----------------------------
-    # CONTEXT
-    # -----------------------------
     context = {
-        'events': page_obj,
-        'active_events': active_events_qs,
-        'inactive_events': inactive_events_qs,
+        'events': listing['pages'][active_tab],
+        'active_page': listing['pages']['active'],
+        'inactive_page': listing['pages']['inactive'],
         'active_tab': active_tab,
-        'active_count': Event.objects.filter(is_active=True).count(),
-        'inactive_count': Event.objects.filter(is_active=False).count(),
-        'years': years_list,
-        'locations': locations,
+        'active_count': facets['status']['active'],
+        'inactive_count': facets['status']['inactive'],
+        'years': [year for year, count in facets['years']],
+        'locations': [location for location, count in facets['locations']],
+        'facets': facets,
         'now': timezone.now(),
-        'status_filter': status if status and status != 'Status' else None,
-        'year_filter': year if year and year != 'Year' else None,
-        'place_filter': place if place and place != 'Place' else None,
-        'type_filter': event_type if event_type and event_type != 'Type' else None,
+        'status_filter': filters['status'],
+        'year_filter': filters['year'],
+        'place_filter': filters['place'],
+        'type_filter': filters['type'],
     }
     
     return render(request, 'event.html', context)
@@ -555,10 +519,37 @@ def contact(request):
     return render(request, 'contact.html')
 
 
+GALLERY_PREVIEW_IMAGES = 6
+GALLERY_PREVIEW_VIDEOS = 2
+
+
 def gallery(request):
     category = request.GET.get('category', 'All')
     
-    albums = GalleryAlbum.objects.filter(is_active=True).prefetch_related('images')
+    # Only the first few images/videos of each album are shown, so prefetch a
+    # bounded top-N per album (window function) and annotate the totals
+    image_counts = GalleryImage.objects.filter(
+        album=OuterRef('pk')
+    ).order_by().values('album').annotate(total=Count('pk')).values('total')
+    video_counts = GalleryVideo.objects.filter(
+        album=OuterRef('pk')
+    ).order_by().values('album').annotate(total=Count('pk')).values('total')
+    
+    albums = GalleryAlbum.objects.filter(is_active=True).annotate(
+        image_count=Coalesce(Subquery(image_counts), 0),
+        video_count=Coalesce(Subquery(video_counts), 0),
+    ).prefetch_related(
+        Prefetch(
+            'images',
+            queryset=GalleryImage.objects.order_by('order', '-created_at')[:GALLERY_PREVIEW_IMAGES],
+            to_attr='preview_images'
+        ),
+        Prefetch(
+            'videos',
+            queryset=GalleryVideo.objects.order_by('order', '-created_at')[:GALLERY_PREVIEW_VIDEOS],
+            to_attr='preview_videos'
+        ),
+    )
     
     if category != 'All':
         category_map = {
@@ -570,11 +561,8 @@ def gallery(request):
         if db_event_type:
             albums = albums.filter(event__event_type=db_event_type)
     
-    albums = albums.order_by('-album_date')
-    
-    paginator = Paginator(albums, 6) 
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    paginator = CursorPaginator(albums, 6, ordering=('-album_date', '-id'))
+    page_obj = paginator.get_page(request.GET.get('cursor'))
     
     context = {
         'albums': page_obj,
@@ -640,9 +628,10 @@ def dashboard(request):
         context['is_leader'] = member.is_association_leader
         context['current_leadership'] = member.current_leadership_assignment
         context['active_committees'] = request.user.active_committees  # Committees are on user
-        context['total_members'] = Member.objects.filter(is_active_member=True).count()
-        context['total_users'] = User.objects.filter(is_active=True).count()
-        context['total_leaders'] = AssociationLeadership.objects.filter(is_active=True).count()
+        stats = get_statistics()
+        context['total_members'] = stats['active_members']
+        context['total_users'] = stats['active_users']
+        context['total_leaders'] = stats['active_leaders']
     return render(request, 'dashboard.html', context)
 
 
@@ -674,13 +663,12 @@ def profile_update(request):
                         request.user.email = member.email
                         request.user.save()
                     
-                    AuditLog.objects.create(
+                    log_event(
+                        'PROFILE_UPDATE',
                         user=request.user,
                         member=member,
-                        action='PROFILE_UPDATE',
                         details={'fields_updated': list(request.POST.keys())},
-                        ip_address=request.META.get('REMOTE_ADDR'),
-                        user_agent=request.META.get('HTTP_USER_AGENT', '')
+                        request=request,
                     )
                 
                 messages.success(request, 'Profile updated successfully!')
@@ -732,13 +720,12 @@ def admin_create_user_account(request, member_id):
                     user.set_password(password)
                     user.save()
                     
-                    AuditLog.objects.create(
+                    log_event(
+                        'USER_CREATE',
                         user=request.user,
                         member=member,
-                        action='USER_CREATE',
                         details={'source': 'admin', 'admin_user': request.user.email},
-                        ip_address=request.META.get('REMOTE_ADDR'),
-                        user_agent=request.META.get('HTTP_USER_AGENT', '')
+                        request=request,
                     )
                 
                 messages.success(request, f'Login account created for {member.full_name}.')
@@ -751,24 +738,29 @@ def admin_create_user_account(request, member_id):
     return render(request, 'admin_create_user_account.html', context)
 
 
+ADMIN_DASHBOARD_LIST_SIZE = 50
+
+
 @user_passes_test(lambda u: u.is_staff)
 def admin_dashboard(request):
+    # Only the newest ones are listed, the totals come from the counters
     members_without_accounts = Member.objects.filter(
         is_active_member=True
     ).exclude(
         user_account__isnull=False
-    ).order_by('-created_at')
+    ).order_by('-created_at')[:ADMIN_DASHBOARD_LIST_SIZE]
     
     recent_members = Member.objects.filter(
         is_active_member=True
     ).order_by('-created_at')[:10]
     
+    stats = get_statistics()
     context = {
         'members_without_accounts': members_without_accounts,
         'recent_members': recent_members,
-        'total_members': Member.objects.filter(is_active_member=True).count(),
-        'total_users': User.objects.filter(is_active=True).count(),
-        'total_without_accounts': members_without_accounts.count(),
+        'total_members': stats['active_members'],
+        'total_users': stats['active_users'],
+        'total_without_accounts': stats['members_without_accounts'],
     }
     return render(request, 'admin_dashboard.html', context)
 